@@ -3,24 +3,18 @@ Badan (บาดาล) - Geological Dashboard
 Main application file with Fields Analysis page.
 """
 from typing import Optional
+import os
 import streamlit as st
 from streamlit_option_menu import option_menu
 import math
 
-from geodash.data import load_dashboard_data, filter_wells
-from geodash.data.rain_service import get_rain_service
-from geodash.ui import build_map_with_controls
+from geodash.data import get_published_data, filter_wells, filter_state
+from geodash.data.density import get_success_heat_points
+from geodash.data.data_loaders.water_stations_loader import get_station_repository
 
-# Import page renderers
-from geodash.pages import (
-    render_water_survival,
-    render_discovery,
-    render_ai_assistant,
-    render_fields_analysis,
-)
-from geodash.pages.general_dashboard import render_general_dashboard
-from geodash.pages.water_station import render_water_station_page
-from geodash.data.data_loaders.water_stations_loader import WaterStationsLoader
+# Page and UI modules are lazy: attribute access imports the module (and its
+# folium/altair/plotly/chromadb dependencies) on first navigation to a page
+from geodash import pages, ui
 
 
 def calculate_distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
@@ -103,26 +97,25 @@ def main() -> None:
     with st.sidebar:
         selected = option_menu(
             menu_title="Badan (บาดาล)",
-            options=["General Dashboard", "Rain Data Analysis", "Water Survival Analysis", "Underground Water Discovery", "Fields Analysis", "AI Assistant"],
+            options=list(pages.PAGE_REGISTRY),
             icons=['house', 'droplet', 'building', 'search', 'grid-3x3', 'robot'],
             menu_icon="globe",
             default_index=0,
+            key="page_nav",
         )
         
         st.markdown("---")
         
-        # Load data
-        if 'data' not in st.session_state:
-            st.session_state.data = load_dashboard_data(max_distance_to_farm_m=None)
+        # Load data (shared snapshot; swapped in when source files change on disk)
+        data_version, published_data = get_published_data(max_distance_to_farm_m=None)
+        if st.session_state.get('data_version') != data_version:
+            st.session_state.data = published_data
+            st.session_state.data_version = data_version
         
         data = st.session_state.data
         
-        # Load water station data
-        if 'water_stations_data' not in st.session_state:
-            water_stations_loader = WaterStationsLoader()
-            st.session_state.water_stations_data = water_stations_loader.load_data()
-        
-        water_stations_data = st.session_state.water_stations_data
+        # Water station data (process-wide repository, not copied per session)
+        water_stations_data = get_station_repository().data
         
         # Show filters only for relevant pages (not Fields Analysis)
         if selected != "Fields Analysis":
@@ -130,12 +123,13 @@ def main() -> None:
             st.sidebar.header("Data Filters")
             
             # Search filter
-            search_q = st.sidebar.text_input("Search Well/Polygon ID")
+            search_q = st.sidebar.text_input("Search Well/Polygon ID", key="filter_search")
             
             # Region filter
             region = st.sidebar.selectbox(
                 "Region", 
-                options=["All"] + sorted(data["wells_df"]["region"].unique().tolist())
+                options=["All"] + sorted(data["wells_df"]["region"].unique().tolist()),
+                key="filter_region"
             )
             
             # Depth filter
@@ -145,7 +139,8 @@ def main() -> None:
                 min_value=min_depth, 
                 max_value=max_depth, 
                 value=(min_depth, max_depth), 
-                step=5
+                step=5,
+                key="filter_depth"
             )
             
             # Distance to Farm Filter
@@ -165,7 +160,8 @@ def main() -> None:
                     max_value=max_distance_km, 
                     value=default_distance_km, 
                     step=0.5,
-                    help="Filter wells by maximum distance to nearest farm"
+                    help="Filter wells by maximum distance to nearest farm",
+                    key="filter_distance_km"
                 )
                 
                 distance_range = int(distance_range_km * 1000)
@@ -180,7 +176,7 @@ def main() -> None:
             if selected == "Water Survival Analysis":
                 st.sidebar.header("Farm Analysis")
                 available_regions = ["All"] + sorted(data["farm_time_series"]["region"].unique().tolist()) if not data["farm_time_series"].empty else ["All"]
-                selected_farm_region = st.sidebar.selectbox("Select Farm/Region", options=available_regions)
+                selected_farm_region = st.sidebar.selectbox("Select Farm/Region", options=available_regions, key="filter_farm_region")
                 selected_farm_region = None if selected_farm_region == "All" else selected_farm_region
             else:
                 selected_farm_region = None
@@ -206,12 +202,16 @@ def main() -> None:
             🗓️ 2025
         </div>
         """, unsafe_allow_html=True)
+        
+        # Performance panel (GEODASH_DEBUG=1 or ?debug=1); shows spans up to the previous rerun
+        if os.environ.get("GEODASH_DEBUG") == "1" or st.query_params.get("debug") == "1":
+            ui.debug_panel()
     
     # === FIELDS ANALYSIS PAGE (CUSTOM LAYOUT) ===
     if selected == "Fields Analysis":
         # Custom layout - no sidebar columns, full width
         st.title("🏞️ Fields Analysis")
-        render_fields_analysis(data)
+        pages.render_fields_analysis(data)
         return  # Exit early, don't use standard layout
     
     # === STANDARD LAYOUT FOR OTHER PAGES ===
@@ -222,7 +222,9 @@ def main() -> None:
     col_map, col_dash = st.columns([2, 1])
     
     # Filter wells
-    filtered_wells = filter_wells(data["wells_df"], filters)
+    # Cached per (data version, filters), so reruns never hash the wells table
+    wells_state = filter_state(filters, data_version)
+    filtered_wells = filter_wells(data["wells_df"], filters, data_version)
     
     # State variables
     selected_well_id: Optional[str] = None
@@ -244,14 +246,15 @@ def main() -> None:
             "AI Assistant": {"show_polygons": True, "show_farms": False, "show_wells": False, "show_water_stations": False, "show_heatmap": False},
         }
         
-        map_state = build_map_with_controls(
+        map_state = ui.build_map_with_controls(
             data["polygons"],
             data["farm_polygons"],
             filtered_wells,
-            data["heat_points"],
+            get_success_heat_points(filtered_wells, wells_state),
             current_filters=default_layers.get(selected, {}),
             field_data_df=data.get("field_data_df"),
-            water_stations_df=water_stations_data.get('stations_df')
+            water_stations_df=water_stations_data.get('stations_df'),
+            wells_state=wells_state,
         )
     
     # Dashboard content
@@ -301,6 +304,8 @@ def main() -> None:
                         if should_query_rain:
                             # Get rain data for new coordinates
                             st.info(f"🌧️ Getting rain data for coordinates ({lat}, {lng})")
+                            from geodash.data.rain_service import get_rain_service
+                            
                             rain_service = get_rain_service()
                             
                             if rain_service.client:
@@ -335,25 +340,25 @@ def main() -> None:
         
         # Render page-specific content
         if selected == "General Dashboard":
-            render_general_dashboard(
+            pages.render_general_dashboard(
                 data, filtered_wells, map_state, selected_row,
                 selected_farm_region, selected_farm_coordinates
             )
         
         elif selected == "Rain Data Analysis":
-            render_water_survival(
+            pages.render_water_survival(
                 data, filtered_wells, map_state, selected_row,
                 selected_farm_region, selected_farm_coordinates, rain_data, rain_stats
             )
         
         elif selected == "Water Survival Analysis":
-            render_water_station_page()
+            pages.render_water_station_page()
         
         elif selected == "Underground Water Discovery":
-            render_discovery(data, filtered_wells, map_state, selected_row)
+            pages.render_discovery(data, filtered_wells, map_state, selected_row)
         
         elif selected == "AI Assistant":
-            render_ai_assistant(data)
+            pages.render_ai_assistant(data)
 
 
 if __name__ == "__main__":
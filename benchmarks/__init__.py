@@ -0,0 +1,5 @@
+"""
+Benchmark suite for the geological dashboard.
+Cases live in ``bench_*.py`` modules (not collected by pytest) and run with
+``python -m benchmarks``. See ``benchmarks/runner.py`` for options.
+"""
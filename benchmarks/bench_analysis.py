@@ -0,0 +1,26 @@
+"""
+Benchmarks for potential well generation and water demand gap analysis.
+"""
+from .runner import benchmark
+from .synthetic import make_fields, make_wells
+
+
+@benchmark(sizes=[100, 1_000, 10_000, 50_000], quick_sizes=[100], repeat=3)
+def bench_generate_potential_wells(n_fields):
+    """generate_potential_wells around synthetic fields with 10k existing wells."""
+    from geodash.data.mockup import generate_potential_wells
+
+    fields = make_fields(n_fields)
+    wells_df = make_wells(10_000)
+    return lambda: generate_potential_wells(fields, wells_df, num_suggestions=max(25, n_fields))
+
+
+@benchmark(sizes=[100, 1_000, 10_000, 50_000], quick_sizes=[100, 1_000], repeat=3)
+def bench_calculate_water_demand_gap(n_fields):
+    """calculate_water_demand_gap for synthetic fields, 10k wells and one candidate per field."""
+    from geodash.data.mockup import calculate_water_demand_gap, generate_potential_wells
+
+    fields = make_fields(n_fields)
+    wells_df = make_wells(10_000)
+    potential_wells_df = generate_potential_wells(fields[:100] if n_fields > 100 else fields, wells_df, num_suggestions=100)
+    return lambda: calculate_water_demand_gap(fields, wells_df, potential_wells_df)
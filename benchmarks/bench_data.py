@@ -0,0 +1,59 @@
+"""
+Benchmarks for data loading and filtering.
+"""
+import atexit
+import shutil
+import tempfile
+
+from .runner import benchmark
+from .synthetic import make_field_data, make_fields, make_wells
+
+
+@benchmark(sizes=["bundled", "fallback"], quick_sizes=["bundled", "fallback"], repeat=3)
+def bench_load_dashboard_data(variant):
+    """Full load_dashboard_data on the bundled data files, or in fallback (mock) mode."""
+    from geodash.data import load_dashboard_data
+
+    data_dir = "geodash/data" if variant == "bundled" else tempfile.mkdtemp(prefix="geodash_empty_")
+    return lambda: load_dashboard_data(data_dir)
+
+
+@benchmark(sizes=[1_000, 10_000, 100_000, 1_000_000], quick_sizes=[1_000, 100_000])
+def bench_filter_wells(n_wells):
+    """filter_wells without its cache (region, depth, search and distance filters)."""
+    from geodash.data.filters import filter_wells
+
+    wells_df = make_wells(n_wells)
+    filters = {"search_q": "1", "region": "หนองไผ่", "depth_range": (60, 180), "distance_range": 10_000}
+    uncached = filter_wells.__wrapped__
+    return lambda: uncached(wells_df, filters)
+
+
+@benchmark(sizes=[1_000, 10_000, 100_000, 1_000_000], quick_sizes=[1_000, 10_000], repeat=3)
+def bench_heatmap_loader(n_wells):
+    """HeatmapLoader.load point generation for a wells table."""
+    from geodash.data.data_loaders import HeatmapLoader
+
+    wells_df = make_wells(n_wells)
+    loader = HeatmapLoader()
+    return lambda: loader.load(wells_df)
+
+
+@benchmark(sizes=[10_000, 100_000, 1_000_000], quick_sizes=[100_000], repeat=3)
+def bench_shared_attach(n_wells):
+    """Attach a published snapshot (n wells, n/20 fields) from shared memory in a worker."""
+    from geodash.data import shared_store
+
+    fields = make_fields(max(n_wells // 20, 1))
+    directory = tempfile.mkdtemp(prefix="geodash_shm_", dir=shared_store.DEFAULT_ROOT.parent)
+    atexit.register(shutil.rmtree, directory, True)
+    version = shared_store.publish_snapshot(
+        {"wells_df": make_wells(n_wells), "polygons": fields, "field_data_df": make_field_data(fields)},
+        directory,
+    )
+
+    def attach():
+        shared_store._attached.clear()  # Attach as a freshly started worker would
+        return shared_store.attach_snapshot(directory, version)
+
+    return attach
@@ -0,0 +1,71 @@
+"""
+Import-time budget for the app entry point.
+Pages and their heavy dependencies are imported lazily; this check (and
+tests/test_import_budget.py, which reuses it) fails when ``import app`` gets
+slower than the budget or eagerly pulls them in again.
+"""
+from typing import Iterable, List, Set, Tuple
+import json
+import re
+import subprocess
+import sys
+
+from .runner import REPO_ROOT, BudgetExceeded, benchmark
+
+# Cumulative import time allowed for "import app" (seconds, -X importtime)
+IMPORT_BUDGET_S = 2.0
+
+# Modules that must only be imported when a page needs them. Streamlit itself
+# imports plotly.graph_objects when plotly is installed, so for plotly only
+# plotly.express (used by the water station page) is checked.
+DEFERRED_MODULES = ["folium", "altair", "geopandas", "pyogrio", "plotly.express", "chromadb", "openmeteo_requests"]
+
+_IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)")
+
+
+def import_app_profile() -> Tuple[float, Set[str]]:
+    """
+    Import app.py in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        Tuple of (total cumulative seconds, set of ``sys.modules`` names)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import json, sys, app; print(json.dumps(sorted(sys.modules)))"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match and match.group(2) == "app":
+            total_us = int(match.group(1))  # Cumulative time including everything app imports
+    return total_us / 1e6, set(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+
+def eager_imports(modules: Iterable[str]) -> List[str]:
+    """
+    Deferred modules (or any of their submodules) among imported module names.
+
+    Returns:
+        Sorted offending entries of DEFERRED_MODULES
+    """
+    modules = set(modules)
+    return sorted(
+        deferred for deferred in DEFERRED_MODULES
+        if any(name == deferred or name.startswith(f"{deferred}.") for name in modules)
+    )
+
+
+@benchmark(sizes=["app"], repeat=3)
+def bench_import_app(_variant):
+    """Cold 'import app' time and deferred heavy modules (fails over budget)."""
+    def check():
+        total_s, modules = import_app_profile()
+        eager = eager_imports(modules)
+        if eager:
+            raise BudgetExceeded(f"'import app' eagerly imports {', '.join(eager)}")
+        if total_s > IMPORT_BUDGET_S:
+            raise BudgetExceeded(f"'import app' took {total_s:.2f}s (budget {IMPORT_BUDGET_S:.1f}s)")
+        return total_s
+
+    return check
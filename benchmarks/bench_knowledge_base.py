@@ -0,0 +1,31 @@
+"""
+Benchmarks for the RAG knowledge base search.
+"""
+import tempfile
+from pathlib import Path
+
+from .runner import SkipBenchmark, benchmark
+
+
+@benchmark(sizes=[100, 1_000], quick_sizes=[100], repeat=5)
+def bench_knowledge_base_search(n_documents):
+    """KnowledgeBaseManager.search over n small indexed documents (needs chromadb)."""
+    from geodash.services import knowledge_base_rag
+
+    if not knowledge_base_rag.CHROMA_AVAILABLE:
+        raise SkipBenchmark("chromadb not installed")
+
+    kb_dir = Path(tempfile.mkdtemp(prefix="geodash_kb_"))
+    manager = knowledge_base_rag.KnowledgeBaseManager(str(kb_dir))
+    if manager.collection is None:
+        raise SkipBenchmark("vector database could not be initialized")
+
+    for i in range(n_documents):
+        document = kb_dir / f"doc_{i}.txt"
+        document.write_text(
+            f"Groundwater well {i} in region {i % 6} reached {40 + i % 180} m depth. "
+            f"Aquifer yield was {(i % 15) + 2} m3/h and the well {'survived' if i % 3 else 'failed'}."
+        )
+        manager.add_document(document, category="benchmark")
+
+    return lambda: manager.search("How deep should a well be drilled for a good yield?", n_results=5)
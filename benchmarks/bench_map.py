@@ -0,0 +1,75 @@
+"""
+Benchmarks for folium map construction and HTML generation.
+"""
+from .runner import benchmark
+from .synthetic import make_field_data, make_fields, make_potential_wells, make_stations, make_wells
+
+ALL_LAYERS = {
+    "show_polygons": True,
+    "show_farms": True,
+    "show_wells": True,
+    "show_water_stations": True,
+    "show_heatmap": True,
+    "show_potential": False,
+}
+
+
+def _render_html(fields, wells_df, stations_df, field_data_df=None, potential_wells_df=None):
+    from geodash.data.polygon_store import PolygonStore
+    from geodash.ui.map_panel import build_folium_map
+
+    heat_points = wells_df[["lat", "lon"]].assign(weight=0.5).to_numpy().tolist()
+
+    def render():
+        fmap = build_folium_map(
+            fields,
+            PolygonStore.empty(),
+            wells_df,
+            heat_points,
+            {**ALL_LAYERS, "show_potential": potential_wells_df is not None},
+            field_data_df=field_data_df,
+            water_stations_df=stations_df,
+            potential_wells_df=potential_wells_df,
+        )
+        return fmap.get_root().render()
+
+    return render
+
+
+@benchmark(sizes=[100, 1_000, 10_000, 50_000], quick_sizes=[100, 1_000], repeat=3)
+def bench_map_html_fields(n_fields):
+    """Map HTML with n field polygons colored from field data (100 wells, 100 stations)."""
+    fields = make_fields(n_fields)
+    return _render_html(fields, make_wells(100), make_stations(100), make_field_data(fields))
+
+
+@benchmark(sizes=[1_000, 10_000, 100_000], quick_sizes=[1_000], repeat=3)
+def bench_map_html_wells(n_wells):
+    """Map HTML with n well markers and heatmap points (100 fields, 100 stations)."""
+    return _render_html(make_fields(100), make_wells(n_wells), make_stations(100))
+
+
+@benchmark(sizes=[100, 1_000, 10_000], quick_sizes=[1_000], repeat=3)
+def bench_map_html_stations(n_stations):
+    """Map HTML with n water station markers (100 fields, 100 wells)."""
+    return _render_html(make_fields(100), make_wells(100), make_stations(n_stations))
+
+
+@benchmark(sizes=[1_000, 10_000, 50_000], quick_sizes=[1_000], repeat=3)
+def bench_map_html_potential(n_sites):
+    """Map HTML with n potential drilling sites (100 fields, 100 wells, 100 stations)."""
+    return _render_html(make_fields(100), make_wells(100), make_stations(100), potential_wells_df=make_potential_wells(n_sites))
+
+
+@benchmark(sizes=[1_000, 10_000], quick_sizes=[1_000], repeat=1)
+def bench_vector_tiles_build(n_fields):
+    """Build field vector tiles (MBTiles, zooms 8-16) of n field polygons with field data."""
+    import tempfile
+    from pathlib import Path
+
+    from geodash.data.vector_tiles import build_mbtiles
+
+    fields = make_fields(n_fields)
+    field_data_df = make_field_data(fields)
+    output = Path(tempfile.mkdtemp()) / "fields.mbtiles"
+    return lambda: build_mbtiles(output, fields, field_data_df=field_data_df)
@@ -0,0 +1,24 @@
+"""
+Per-page rerun latency through the headless AppTest harness.
+Each case runs one scripted page scenario (see page_harness.SCENARIOS) and
+fails when any rerun raises.
+"""
+from .page_harness import SCENARIOS, run_scenario
+from .runner import BudgetExceeded, benchmark
+
+
+def _scenario_runner(name: str):
+    def run():
+        records = run_scenario(SCENARIOS[name])
+        failures = [f"{r['step']}: {r['exceptions'][0]}" for r in records if r["exceptions"]]
+        if failures:
+            raise BudgetExceeded(f"{name} raised during rerun ({'; '.join(failures)})")
+        return records
+
+    return run
+
+
+@benchmark(sizes=sorted(SCENARIOS), quick_sizes=sorted(SCENARIOS), repeat=1)
+def bench_page_scenario(scenario):
+    """Full scripted scenario (initial load + interactions) for one page."""
+    return _scenario_runner(scenario)
@@ -0,0 +1,380 @@
+"""
+Load-test mode: many simulated dashboard sessions in one process.
+Starts N AppTest sessions against app.py (as one Streamlit server would host
+them), walks each through a typical navigation path and reports per-session
+memory, total RSS, p50/p95 rerun latency and cache hit rates. Open-Meteo and
+OpenRouter are replaced by offline stubs, so no network access is needed.
+
+Usage:
+    python -m benchmarks.load_test                         # 8 sessions
+    python -m benchmarks.load_test --sessions 30 --concurrency 10
+    python -m benchmarks.load_test --output load.json --max-p95 20
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List, Optional
+from unittest import mock
+import argparse
+import json
+import logging
+import pickle
+import sys
+import time
+import warnings
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from .page_harness import APP_FILE, RERUN_TIMEOUT_S, SCENARIOS, Scenario, Step, apply_step, click_well, install_click_injection
+from .runner import REPO_ROOT
+
+OFFLINE_API_KEY = "sk-or-offline-load-test"
+
+
+# === Offline service stubs ===
+
+class OfflineResponse:
+    """Canned OpenRouter chat completion."""
+    status_code = 200
+
+    def __init__(self, payload: Dict):
+        messages = (payload or {}).get("messages", [])
+        question = messages[-1]["content"] if messages else ""
+        self._body = {
+            "choices": [{"message": {"content": f"Offline answer ({len(question)} chars asked)."}}],
+            "usage": {"prompt_tokens": sum(len(m["content"]) for m in messages) // 4, "completion_tokens": 12},
+        }
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> Dict:
+        return self._body
+
+
+def offline_post(url: str, *args, json: Optional[Dict] = None, **kwargs) -> OfflineResponse:
+    """Stand-in for requests.post: answers OpenRouter, refuses everything else."""
+    import requests
+
+    if "openrouter.ai" in url:
+        return OfflineResponse(json)
+    raise requests.exceptions.ConnectionError(f"Network disabled in load-test mode: {url}")
+
+
+def make_offline_rain_service():
+    """
+    Build a rain service whose data is synthesized locally.
+
+    Returns:
+        RainDataService subclass instance returning one year of hourly rain,
+        deterministic per coordinate
+    """
+    from geodash.data.rain_service import RainDataService
+
+    class OfflineRainService(RainDataService):
+        def __init__(self):
+            self.client = "offline"
+
+        def get_rain_data(self, latitude, longitude, days_back=365, timezone="Asia/Bangkok"):
+            seed = zlib.crc32(f"{latitude:.3f},{longitude:.3f}".encode())
+            rng = np.random.default_rng(seed)
+            hours = pd.date_range(end=pd.Timestamp.now(tz=timezone).floor("h"), periods=days_back * 24, freq="h")
+            rain = np.where(rng.random(len(hours)) < 0.08, rng.gamma(0.8, 4.0, len(hours)), 0.0)
+            return pd.DataFrame({"date": hours, "rain": rain.astype(np.float32)})
+
+    return OfflineRainService()
+
+
+@contextmanager
+def offline_services() -> Iterator[None]:
+    """Swap the rain service singleton and requests.post for offline stubs."""
+    from geodash.data import rain_service
+
+    saved_rain_service = rain_service._rain_service
+    rain_service._rain_service = make_offline_rain_service()
+    try:
+        with mock.patch("requests.post", offline_post):
+            yield
+    finally:
+        rain_service._rain_service = saved_rain_service
+
+
+# === Navigation paths ===
+
+def _connect_assistant(at, data):
+    at.session_state["openrouter_api_key"] = OFFLINE_API_KEY
+    at.session_state["api_key_validated"] = True
+
+
+def _ask_assistant(at, data):
+    if len(at.chat_input):
+        at.chat_input[0].set_value("What is the optimal drilling depth for Dan Chang?")
+
+
+# Typical paths through the dashboard; sessions are assigned round-robin
+PATHS: List[Scenario] = [
+    SCENARIOS["general_dashboard"],
+    Scenario("rain_lookup", "Rain Data Analysis", [
+        Step("initial load"),
+        Step("navigate", navigate=True),
+        Step("click well", click_well),
+    ]),
+    SCENARIOS["fields_analysis"],
+    SCENARIOS["discovery"],
+    SCENARIOS["water_station"],
+    Scenario("ai_assistant", "AI Assistant", [
+        Step("initial load"),
+        Step("navigate", navigate=True),
+        Step("connect", _connect_assistant),
+        Step("ask", _ask_assistant),
+    ]),
+]
+
+
+@contextmanager
+def shared_runtime() -> Iterator[None]:
+    """
+    Serve every AppTest session from one mock Runtime, like a single server.
+
+    AppTest installs and removes a process-global Runtime around each run,
+    which breaks sessions rerunning concurrently in other threads.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    with mock.patch.object(Runtime, "instance", classmethod(lambda cls: runtime)), \
+            mock.patch.object(Runtime, "exists", classmethod(lambda cls: True)):
+        yield
+
+
+# === Memory accounting ===
+
+def _collect_ids(value: object, ids: set) -> None:
+    if id(value) in ids:
+        return
+    ids.add(id(value))
+    if isinstance(value, dict):
+        for item in value.values():
+            _collect_ids(item, ids)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_ids(item, ids)
+
+
+def _owned_bytes(value: object, shared_ids: set, seen: set) -> int:
+    """Approximate bytes held by ``value`` that are not part of the shared snapshot."""
+    if id(value) in shared_ids or id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_owned_bytes(v, shared_ids, seen) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_owned_bytes(v, shared_ids, seen) for v in value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def session_state_footprint(at, shared_ids: set) -> Dict[str, int]:
+    """
+    Bytes held by one session's state, excluding the shared published data.
+
+    Returns:
+        Dictionary of session state key -> owned bytes (largest first)
+    """
+    footprint = {}
+    seen: set = set()
+    for key in at.session_state.filtered_state:
+        owned = _owned_bytes(at.session_state[key], shared_ids, seen)
+        if owned:
+            footprint[key] = owned
+    return dict(sorted(footprint.items(), key=lambda item: item[1], reverse=True))
+
+
+# === Sessions ===
+
+class SimulatedSession:
+    """One AppTest session following a navigation path."""
+
+    def __init__(self, index: int, path: Scenario):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.path = path
+        self.app = AppTest.from_file(str(APP_FILE), default_timeout=RERUN_TIMEOUT_S)
+        self.on_page = False
+        self.latencies_s: List[float] = []
+        self.exceptions: List[str] = []
+        self.rss_delta_mb: Optional[float] = None
+
+    def rerun(self, step: Step, data: Dict) -> None:
+        self.on_page = apply_step(self.app, self.path, step, data, self.on_page)
+        started = time.perf_counter()
+        self.app.run()
+        self.latencies_s.append(time.perf_counter() - started)
+        self.exceptions += [f"{step.name}: {e.value}" for e in self.app.exception]
+
+
+def run_load_test(n_sessions: int, concurrency: int) -> Dict[str, object]:
+    """
+    Run ``n_sessions`` simulated sessions, ``concurrency`` of them at a time.
+
+    Sessions start one after another (their first rerun is measured for RSS
+    growth), then walk the rest of their navigation path concurrently.
+
+    Returns:
+        Report with per-session results, RSS totals, latency percentiles and
+        cache statistics
+    """
+    from geodash.data import get_published_data
+    from geodash.data.cache import get_cache_stats, reset_cache_stats
+    from geodash.instrumentation import current_rss_mb
+
+    rss_baseline = current_rss_mb()
+    with offline_services(), shared_runtime():
+        _, data = get_published_data(max_distance_to_farm_m=None)
+        shared_ids: set = set()
+        _collect_ids(data, shared_ids)
+        install_click_injection()
+        reset_cache_stats()
+        rss_loaded = current_rss_mb()
+
+        sessions = [SimulatedSession(i, PATHS[i % len(PATHS)]) for i in range(n_sessions)]
+
+        # Ramp-up: first rerun of every session, one at a time
+        for session in sessions:
+            before = current_rss_mb()
+            session.rerun(session.path.steps[0], data)
+            after = current_rss_mb()
+            if before is not None and after is not None:
+                session.rss_delta_mb = round(after - before, 2)
+
+        # Steady state: remaining steps, sessions interleaved across workers
+        errors_lock = Lock()
+        runner_errors: List[str] = []
+
+        def walk(session: SimulatedSession) -> None:
+            try:
+                for step in session.path.steps[1:]:
+                    session.rerun(step, data)
+            except Exception as e:  # Harness failure, not an app exception
+                with errors_lock:
+                    runner_errors.append(f"session {session.index}: {type(e).__name__}: {e}")
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load-session") as pool:
+            list(pool.map(walk, sessions))
+
+        rss_final = current_rss_mb()
+        cache_stats = get_cache_stats()
+
+    per_session = []
+    for session in sessions:
+        footprint = session_state_footprint(session.app, shared_ids)
+        per_session.append({
+            "session": session.index,
+            "path": session.path.name,
+            "reruns": len(session.latencies_s),
+            "first_rerun_rss_delta_mb": session.rss_delta_mb,
+            "session_state_mb": round(sum(footprint.values()) / 1024 ** 2, 3),
+            "largest_state_keys": {key: round(size / 1024 ** 2, 3) for key, size in list(footprint.items())[:5]},
+            "p50_s": round(float(np.percentile(session.latencies_s, 50)), 4),
+            "max_s": round(max(session.latencies_s), 4),
+            "exceptions": session.exceptions,
+        })
+
+    latencies = np.array([t for session in sessions for t in session.latencies_s])
+    steady = np.array([t for session in sessions for t in session.latencies_s[1:]])
+    growth = rss_final - rss_loaded if rss_final is not None and rss_loaded is not None else None
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sessions": n_sessions,
+        "concurrency": concurrency,
+        "rss_baseline_mb": rss_baseline,
+        "rss_after_data_mb": rss_loaded,
+        "rss_final_mb": rss_final,
+        "rss_growth_mb": round(growth, 1) if growth is not None else None,
+        "rss_per_session_mb": round(growth / n_sessions, 2) if growth is not None else None,
+        "session_state_total_mb": round(sum(s["session_state_mb"] for s in per_session), 2),
+        "reruns": int(latencies.size),
+        "p50_s": round(float(np.percentile(latencies, 50)), 4),
+        "p95_s": round(float(np.percentile(latencies, 95)), 4),
+        "steady_p50_s": round(float(np.percentile(steady, 50)), 4) if steady.size else None,
+        "steady_p95_s": round(float(np.percentile(steady, 95)), 4) if steady.size else None,
+        "cache": {name: {k: stats[k] for k in ("calls", "hits", "misses", "hit_rate")} for name, stats in cache_stats.items()},
+        "runner_errors": runner_errors,
+        "per_session": per_session,
+    }
+
+
+def print_report(report: Dict[str, object]) -> None:
+    print(f"\n{'session':>7}  {'path':<22} {'reruns':>6} {'p50':>9} {'max':>9} {'ΔRSS 1st':>9} {'state':>9}")
+    for s in report["per_session"]:
+        delta = s["first_rerun_rss_delta_mb"]
+        print(
+            f"{s['session']:>7}  {s['path']:<22} {s['reruns']:>6} {s['p50_s'] * 1000:>7.0f}ms {s['max_s'] * 1000:>7.0f}ms"
+            f" {delta if delta is not None else 'N/A':>7}MB {s['session_state_mb']:>7.2f}MB"
+            + (f"  ❌ {s['exceptions'][0][:60]}" if s["exceptions"] else "")
+        )
+
+    print(f"\n📦 RSS: {report['rss_baseline_mb']:.0f} MB at start, {report['rss_after_data_mb']:.0f} MB with data, "
+          f"{report['rss_final_mb']:.0f} MB after {report['sessions']} sessions "
+          f"(+{report['rss_growth_mb']} MB, {report['rss_per_session_mb']} MB/session)")
+    print(f"🧾 Session state not shared between sessions: {report['session_state_total_mb']} MB in total")
+    print(f"⏱️  Reruns: {report['reruns']}, p50 {report['p50_s'] * 1000:.0f} ms, p95 {report['p95_s'] * 1000:.0f} ms "
+          f"(after first load: p50 {(report['steady_p50_s'] or 0) * 1000:.0f} ms, p95 {(report['steady_p95_s'] or 0) * 1000:.0f} ms)")
+    for name, stats in report["cache"].items():
+        print(f"🗄️  {name}: {stats['calls']} calls, hit rate {stats['hit_rate']:.0%}")
+    for error in report["runner_errors"]:
+        print(f"⚠️  {error}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate many concurrent dashboard sessions (offline)")
+    parser.add_argument("--sessions", type=int, default=8, help="Number of simulated sessions")
+    parser.add_argument("--concurrency", type=int, default=4, help="Sessions rerunning at the same time")
+    parser.add_argument("--output", type=Path, help="Write the report as JSON to this file")
+    parser.add_argument("--max-p95", type=float, help="Fail when p95 rerun latency exceeds this many seconds")
+    parser.add_argument("--max-rss-per-session", type=float, help="Fail when RSS growth per session exceeds this many MB")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+
+    print(f"🏁 Load test: {args.sessions} sessions, {args.concurrency} concurrent, offline services ({REPO_ROOT.name})")
+    report = run_load_test(args.sessions, args.concurrency)
+    print_report(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False, default=str))
+        print(f"💾 Report written to {args.output}")
+
+    failed = bool(report["runner_errors"]) or any(s["exceptions"] for s in report["per_session"])
+    if args.max_p95 is not None and report["p95_s"] > args.max_p95:
+        print(f"⚠️  p95 {report['p95_s']:.2f}s over budget {args.max_p95:.2f}s")
+        failed = True
+    if args.max_rss_per_session is not None and (report["rss_per_session_mb"] or 0) > args.max_rss_per_session:
+        print(f"⚠️  {report['rss_per_session_mb']} MB/session over budget {args.max_rss_per_session} MB")
+        failed = True
+    return 1 if failed else 0
+
+
+# Export the load-test API
+__all__ = ["run_load_test", "offline_services", "session_state_footprint", "PATHS", "main"]
+
+
+if __name__ == "__main__":
+    from benchmarks.load_test import main as package_main
+    sys.exit(package_main())
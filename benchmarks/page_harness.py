@@ -0,0 +1,301 @@
+"""
+Headless page render harness built on streamlit.testing.v1.AppTest.
+Drives app.py through scripted interactions per page (navigation, slider
+moves, selections, map clicks) and records, for every rerun, the script
+execution time, number of emitted elements and their serialized payload size.
+
+Usage:
+    python -m benchmarks.page_harness                          # all scenarios
+    python -m benchmarks.page_harness -s fields_analysis       # one scenario
+    python -m benchmarks.page_harness --output pages.json
+    python -m benchmarks.page_harness --compare pages.json     # regression gate
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import logging
+import sys
+import time
+import warnings
+
+from .runner import REPO_ROOT
+
+APP_FILE = REPO_ROOT / "app.py"
+SIMULATED_CLICK_KEY = "simulated_map_click"  # Consumed by the patched st_folium below
+RERUN_TIMEOUT_S = 300
+
+
+@dataclass
+class Step:
+    """One scripted interaction followed by a rerun."""
+    name: str
+    action: Optional[Callable] = None  # action(at, data) applied before the rerun
+    navigate: bool = False  # Select the scenario page in the menu from this step on
+
+
+@dataclass
+class Scenario:
+    """A page and the interactions performed on it."""
+    name: str
+    page: str
+    steps: List[Step]
+
+
+# === Scripted interactions ===
+
+def _narrow_slider(key: str, fraction: float = 0.2) -> Callable:
+    """Shrink a range slider from both ends (or scale a single-value slider)."""
+    def action(at, data):
+        slider = at.slider(key=key)
+        if isinstance(slider.value, tuple):
+            low, high = slider.value
+            trim = int((high - low) * fraction) // 5 * 5
+            slider.set_value((low + trim, high - trim))
+        else:
+            slider.set_value(max(slider.min, round(slider.value * (1 - fraction) * 2) / 2))
+    return action
+
+
+def _select_option(key: str, index: int = 1) -> Callable:
+    def action(at, data):
+        selectbox = at.selectbox(key=key)
+        options = selectbox.options
+        if options:
+            selectbox.select(options[min(index, len(options) - 1)])
+    return action
+
+
+def _toggle_checkbox(key: str) -> Callable:
+    def action(at, data):
+        checkbox = at.checkbox(key=key)
+        checkbox.set_value(not checkbox.value)
+    return action
+
+
+def _with_simulated_click(render: Callable) -> Callable:
+    """
+    Wrap st_folium so a scripted click from session state is merged into its result.
+
+    AppTest cannot drive the st_folium component, so the click steps store
+    {"lat", "lng"} under SIMULATED_CLICK_KEY and the wrapper reports it as
+    last_clicked/last_object_clicked (consuming it) on the next render.
+    """
+    def st_folium(*args, **kwargs):
+        import streamlit as st
+
+        map_state = render(*args, **kwargs)
+        click = st.session_state.pop(SIMULATED_CLICK_KEY, None)
+        if click is None:
+            return map_state
+        return {**(map_state or {}), "last_clicked": click, "last_object_clicked": click}
+
+    st_folium.simulated_click = True
+    return st_folium
+
+
+def install_click_injection() -> None:
+    """
+    Patch st_folium in the map-rendering modules for scripted clicks.
+
+    AppTest runs app.py in this process, so the pages pick up the patched
+    module attribute; the app itself carries no test hooks.
+    """
+    from geodash.pages import fields_analysis
+    from geodash.ui import map_panel
+
+    for module in (map_panel, fields_analysis):
+        if not getattr(module.st_folium, "simulated_click", False):
+            module.st_folium = _with_simulated_click(module.st_folium)
+
+
+def click_well(at, data):
+    wells_df = data["wells_df"]
+    if not wells_df.empty:
+        well = wells_df.iloc[len(wells_df) // 2]
+        at.session_state[SIMULATED_CLICK_KEY] = {"lat": float(well["lat"]), "lng": float(well["lon"])}
+
+
+def click_field(at, data):
+    from geodash.data.polygon_store import PolygonStore
+
+    fields = PolygonStore.coerce(data["polygons"])
+    if len(fields):
+        lat, lon = fields[0].centroid
+        at.session_state[SIMULATED_CLICK_KEY] = {"lat": float(lat), "lng": float(lon)}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("general_dashboard", "General Dashboard", [
+            Step("initial load"),
+            Step("narrow depth slider", _narrow_slider("filter_depth")),
+            Step("reduce distance slider", _narrow_slider("filter_distance_km", 0.5)),
+            Step("select region", _select_option("filter_region")),
+            Step("click well", click_well),
+        ]),
+        Scenario("discovery", "Underground Water Discovery", [
+            Step("initial load"),
+            Step("navigate", navigate=True),
+            Step("toggle deep wells", _toggle_checkbox("show_deep")),
+            Step("narrow depth slider", _narrow_slider("filter_depth")),
+            Step("click well", click_well),
+        ]),
+        Scenario("fields_analysis", "Fields Analysis", [
+            Step("initial load"),
+            Step("navigate", navigate=True),
+            Step("select farm", _select_option("selected_farm")),
+            Step("click field", click_field),
+        ]),
+        Scenario("water_station", "Water Survival Analysis", [
+            Step("initial load"),
+            Step("navigate", navigate=True),
+            Step("select station", _select_option("selected_station")),
+            Step("select well", _select_option("selected_station_well")),
+            Step("group by formation", _select_option("cube_level", 2)),
+        ]),
+    ]
+}
+
+
+# === Measurement ===
+
+def measure_tree(at) -> Tuple[int, int]:
+    """
+    Count emitted elements and their serialized size.
+
+    Returns:
+        Tuple of (element count, payload bytes of all element protos)
+    """
+    elements, payload = 0, 0
+    for block in (at.main, at.sidebar):
+        for element in block:
+            elements += 1
+            proto = getattr(element, "proto", None)
+            if proto is not None and hasattr(proto, "ByteSize"):
+                payload += proto.ByteSize()
+    return elements, payload
+
+
+def apply_step(at, scenario: Scenario, step: Step, data: Dict, on_page: bool) -> bool:
+    """
+    Prepare the next rerun of a scenario step.
+
+    The option_menu component value only lasts one AppTest rerun while the
+    browser re-sends it on every rerun, so once a scenario has navigated its
+    page is re-selected before each rerun.
+
+    Returns:
+        Whether the scenario page is selected from now on
+    """
+    on_page = on_page or step.navigate
+    if on_page:
+        at.session_state["page_nav"] = scenario.page
+    if step.action is not None:
+        step.action(at, data)
+    return on_page
+
+
+def run_scenario(scenario: Scenario) -> List[Dict[str, object]]:
+    """
+    Run a scenario in a fresh AppTest session.
+
+    Returns:
+        One record per step: duration_s, elements, payload_bytes, exceptions
+    """
+    from streamlit.testing.v1 import AppTest
+    from geodash.data import get_published_data
+
+    _, data = get_published_data(max_distance_to_farm_m=None)
+    install_click_injection()
+    at = AppTest.from_file(str(APP_FILE), default_timeout=RERUN_TIMEOUT_S)
+
+    records = []
+    on_page = False
+    for step in scenario.steps:
+        on_page = apply_step(at, scenario, step, data, on_page)
+        started = time.perf_counter()
+        at.run()
+        duration_s = time.perf_counter() - started
+
+        elements, payload = measure_tree(at)
+        records.append({
+            "scenario": scenario.name,
+            "step": step.name,
+            "duration_s": round(duration_s, 4),
+            "elements": elements,
+            "payload_bytes": payload,
+            "exceptions": [str(e.value) for e in at.exception],
+        })
+    return records
+
+
+def compare(records: List[Dict[str, object]], baseline_path: Path, threshold: float) -> List[str]:
+    """
+    Flag steps whose duration or payload grew more than ``threshold`` vs a baseline.
+
+    Returns:
+        Human-readable regression messages
+    """
+    baseline = {(r["scenario"], r["step"]): r for r in json.loads(baseline_path.read_text())["records"]}
+    regressions = []
+    for record in records:
+        previous = baseline.get((record["scenario"], record["step"]))
+        if previous is None:
+            continue
+        for metric in ("duration_s", "payload_bytes"):
+            if previous[metric] and record[metric] / previous[metric] > 1 + threshold:
+                regressions.append(
+                    f"{record['scenario']} / {record['step']}: {metric} "
+                    f"{previous[metric]} -> {record[metric]} ({record[metric] / previous[metric]:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless per-page rerun latency harness")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario(s) to run")
+    parser.add_argument("--output", type=Path, help="Write records as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed growth vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+
+    records: List[Dict[str, object]] = []
+    failed = False
+    for name in args.scenario or sorted(SCENARIOS):
+        for record in run_scenario(SCENARIOS[name]):
+            records.append(record)
+            status = f"  ❌ {record['exceptions'][0][:80]}" if record["exceptions"] else ""
+            print(
+                f"{record['scenario']:<20} {record['step']:<24} {record['duration_s'] * 1000:>9.1f} ms"
+                f"  {record['elements']:>5} elements  {record['payload_bytes'] / 1024:>9.1f} KB{status}",
+                flush=True,
+            )
+            failed = failed or bool(record["exceptions"])
+
+    if args.output:
+        args.output.write_text(json.dumps({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "records": records}, indent=2, ensure_ascii=False))
+        print(f"💾 Records written to {args.output}")
+
+    if args.compare:
+        regressions = compare(records, args.compare, args.threshold)
+        for message in regressions:
+            print(f"⚠️  Regression: {message}")
+        failed = failed or bool(regressions)
+
+    return 1 if failed else 0
+
+
+# Export the harness API
+__all__ = ["Scenario", "Step", "SCENARIOS", "run_scenario", "apply_step", "measure_tree", "click_well", "click_field", "install_click_injection", "main"]
+
+
+if __name__ == "__main__":
+    # Run through the package module so state is shared with benchmarks.runner imports
+    from benchmarks.page_harness import main as package_main
+    sys.exit(package_main())
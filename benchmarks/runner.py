@@ -0,0 +1,273 @@
+"""
+Benchmark runner for the geological dashboard.
+Discovers ``bench_*.py`` modules in this package, runs every registered case
+in a fresh Python process (so peak RSS is per case) and reports wall time and
+peak memory. Results can be saved as JSON and compared against a baseline.
+
+Usage:
+    python -m benchmarks                       # quick sizes
+    python -m benchmarks --full                # full scale (up to 1M wells / 50k fields)
+    python -m benchmarks -k filter_wells       # cases whose name contains the text
+    python -m benchmarks --output results.json --compare baseline.json
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import importlib
+import json
+import os
+import pkgutil
+import statistics
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+REPO_ROOT = PACKAGE_DIR.parent
+RESULT_MARKER = "BENCH_RESULT "
+
+
+class SkipBenchmark(Exception):
+    """Raised by a case setup when an optional dependency or data file is missing."""
+
+
+class BudgetExceeded(AssertionError):
+    """Raised by a case when a hard budget (time, imported modules) is violated."""
+
+
+@dataclass
+class BenchmarkCase:
+    """A registered benchmark: ``setup(size)`` returns the zero-argument callable to time."""
+    name: str
+    module: str
+    setup: Callable
+    sizes: Sequence
+    quick_sizes: Sequence
+    repeat: int = 5
+    budget_s: Optional[float] = None
+
+
+_registry: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(
+    sizes: Sequence,
+    quick_sizes: Optional[Sequence] = None,
+    repeat: int = 5,
+    budget_s: Optional[float] = None,
+) -> Callable:
+    """
+    Register a benchmark case.
+
+    Args:
+        sizes: Sizes (or named variants) run with ``--full``
+        quick_sizes: Sizes run by default (default: the first size)
+        repeat: Timed repetitions per size (the median is reported)
+        budget_s: Fail the run if the median time exceeds this many seconds
+
+    Returns:
+        Decorator for a ``setup(size) -> Callable[[], object]`` function
+    """
+    def decorator(setup: Callable) -> Callable:
+        name = setup.__name__.removeprefix("bench_")
+        _registry[name] = BenchmarkCase(
+            name=name,
+            module=setup.__module__,
+            setup=setup,
+            sizes=list(sizes),
+            quick_sizes=list(quick_sizes) if quick_sizes is not None else list(sizes[:1]),
+            repeat=repeat,
+            budget_s=budget_s,
+        )
+        return setup
+
+    return decorator
+
+
+def discover() -> Dict[str, BenchmarkCase]:
+    """Import every ``bench_*`` module of the package and return the registry."""
+    for module_info in pkgutil.iter_modules([str(PACKAGE_DIR)]):
+        if module_info.name.startswith("bench_"):
+            importlib.import_module(f"{__package__}.{module_info.name}")
+    return _registry
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if not RESOURCE_AVAILABLE:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def _run_case_in_process(name: str, size: str, repeat: int) -> Dict[str, object]:
+    """Run one case/size in this process (called in the child process)."""
+    import logging
+    import warnings
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+
+    case = discover()[name]
+    size_value = next(s for s in case.sizes + case.quick_sizes if str(s) == size)
+
+    started = time.perf_counter()
+    try:
+        func = case.setup(size_value)
+    except SkipBenchmark as e:
+        return {"status": "skipped", "reason": str(e)}
+    setup_s = time.perf_counter() - started
+    setup_rss_mb = _peak_rss_mb()
+
+    times = []
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - started)
+    except BudgetExceeded as e:
+        return {"status": "failed", "reason": str(e)}
+
+    return {
+        "status": "ok",
+        "setup_s": round(setup_s, 4),
+        "times_s": [round(t, 6) for t in times],
+        "median_s": round(statistics.median(times), 6),
+        "min_s": round(min(times), 6),
+        "setup_peak_rss_mb": round(setup_rss_mb, 1) if setup_rss_mb is not None else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1) if RESOURCE_AVAILABLE else None,
+    }
+
+
+def run_case(case: BenchmarkCase, size, repeat: int, timeout_s: float) -> Dict[str, object]:
+    """Run one case/size in a fresh interpreter and parse its result."""
+    command = [
+        sys.executable, "-m", f"{__package__}.runner",
+        "--run-case", case.name, "--size", str(size), "--repeat", str(repeat),
+    ]
+    try:
+        completed = subprocess.run(
+            command, cwd=REPO_ROOT, capture_output=True, text=True, timeout=timeout_s,
+        )
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout", "reason": f"> {timeout_s:.0f}s"}
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+
+    last_error = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+    return {"status": "error", "reason": last_error}
+
+
+def _format_row(case: str, size, result: Dict[str, object]) -> str:
+    if result["status"] != "ok":
+        return f"{case:<36} {str(size):>10}  {result['status']}: {result.get('reason', '')}"
+    rss = result.get("peak_rss_mb")
+    return (
+        f"{case:<36} {str(size):>10}  median {result['median_s'] * 1000:>11.2f} ms"
+        f"  min {result['min_s'] * 1000:>11.2f} ms  peak RSS {rss if rss is not None else 'N/A':>8} MB"
+        + (f"  [{result['flag']}]" if result.get("flag") else "")
+    )
+
+
+def compare(results: List[Dict[str, object]], baseline_path: Path, threshold: float) -> List[str]:
+    """
+    Flag cases whose median got slower than the baseline by more than ``threshold``.
+
+    Returns:
+        Human-readable regression messages
+    """
+    baseline = {
+        (r["case"], str(r["size"])): r
+        for r in json.loads(baseline_path.read_text())["results"]
+        if r.get("status") == "ok"
+    }
+    regressions = []
+    for result in results:
+        previous = baseline.get((result["case"], str(result["size"])))
+        if result.get("status") != "ok" or previous is None:
+            continue
+        ratio = result["median_s"] / previous["median_s"] if previous["median_s"] else 1.0
+        if ratio > 1 + threshold:
+            regressions.append(f"{result['case']}[{result['size']}]: {ratio:.2f}x slower than baseline")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run dashboard benchmarks")
+    parser.add_argument("--full", action="store_true", help="Run the full size range")
+    parser.add_argument("-k", "--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=None, help="Override repetitions per case")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds before a case/size is abandoned")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare medians against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--list", action="store_true", help="List cases and sizes")
+    # Internal: run a single case in this process
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--size", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        result = _run_case_in_process(args.run_case, args.size, args.repeat or 1)
+        print(RESULT_MARKER + json.dumps(result))
+        return 0
+
+    cases = [case for name, case in sorted(discover().items()) if args.filter in name]
+
+    if args.list:
+        for case in cases:
+            print(f"{case.name:<36} quick={case.quick_sizes} full={case.sizes}")
+        return 0
+
+    print(f"🏁 Running {len(cases)} benchmark cases ({'full' if args.full else 'quick'} sizes)")
+    results: List[Dict[str, object]] = []
+    failed = False
+
+    for case in cases:
+        for size in (case.sizes if args.full else case.quick_sizes):
+            result = run_case(case, size, args.repeat or case.repeat, args.timeout)
+            if result["status"] == "ok" and case.budget_s is not None and result["median_s"] > case.budget_s:
+                result["flag"] = f"over budget {case.budget_s}s"
+                failed = True
+            if result["status"] in ("error", "failed"):
+                failed = True
+            results.append({"case": case.name, "size": size, **result})
+            print(_format_row(case.name, size, result), flush=True)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "cpu_count": os.cpu_count(),
+        "mode": "full" if args.full else "quick",
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for message in regressions:
+            print(f"⚠️  Regression: {message}")
+        failed = failed or bool(regressions)
+
+    return 1 if failed else 0
+
+
+# Export the runner API
+__all__ = ["benchmark", "discover", "main", "SkipBenchmark", "BudgetExceeded"]
+
+
+if __name__ == "__main__":
+    # Run through the package module so cases, SkipBenchmark and BudgetExceeded
+    # are the same objects the bench_* modules import
+    from benchmarks.runner import main as package_main
+    sys.exit(package_main())
@@ -0,0 +1,207 @@
+"""
+Synthetic dataset generators for benchmarks.
+Produce wells, field polygons, field attributes and water stations at any
+scale with the same columns as the real loaders, reproducibly per seed.
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from geodash.data.polygon_store import PolygonStore
+
+# Study area (Suphan Buri / Kanchanaburi, around Dan Chang) scaled up so
+# large datasets keep a realistic density
+LAT_RANGE = (14.5, 15.5)
+LON_RANGE = (99.2, 100.2)
+
+REGIONS = ["ด่านช้าง", "หนองไผ่", "ดอนกำยาน", "หนองหญ้าปล้อง", "วังลึก", "หูช้าง"]
+
+
+def _area_scale(n: int, base: int) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """Grow the study area with sqrt(n / base) so point density stays roughly constant."""
+    scale = max(1.0, np.sqrt(n / base))
+    lat_mid, lon_mid = np.mean(LAT_RANGE), np.mean(LON_RANGE)
+    half_lat = (LAT_RANGE[1] - LAT_RANGE[0]) / 2 * scale
+    half_lon = (LON_RANGE[1] - LON_RANGE[0]) / 2 * scale
+    return (lat_mid - half_lat, lat_mid + half_lat), (lon_mid - half_lon, lon_mid + half_lon)
+
+
+def make_wells(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate ``n`` wells with the WellsLoader columns.
+
+    Args:
+        n: Number of wells
+        seed: Random seed
+
+    Returns:
+        DataFrame with well_id, region, lat, lon, depth_m, survived, distance_to_farm
+    """
+    rng = np.random.default_rng(seed)
+    (lat_min, lat_max), (lon_min, lon_max) = _area_scale(n, 10_000)
+
+    return pd.DataFrame({
+        "well_id": pd.Series(np.arange(1, n + 1)).map("WELL-{:07d}".format),
+        "region": pd.Categorical.from_codes(rng.integers(0, len(REGIONS), n), categories=REGIONS).astype(str),
+        "lat": rng.uniform(lat_min, lat_max, n),
+        "lon": rng.uniform(lon_min, lon_max, n),
+        "depth_m": rng.integers(40, 220, n),
+        "survived": rng.random(n) < 0.7,
+        "distance_to_farm": rng.uniform(100, 30_000, n),
+    })
+
+
+def make_fields(n: int, vertices: int = 8, seed: int = 0) -> PolygonStore:
+    """
+    Generate ``n`` non-overlapping star-shaped field polygons on a jittered grid.
+
+    Args:
+        n: Number of fields
+        vertices: Vertices per polygon ring
+        seed: Random seed
+
+    Returns:
+        PolygonStore with name, region and plot_code attributes
+    """
+    rng = np.random.default_rng(seed)
+    (lat_min, lat_max), (lon_min, lon_max) = _area_scale(n, 1_000)
+
+    side = int(np.ceil(np.sqrt(n)))
+    cell_lat = (lat_max - lat_min) / side
+    cell_lon = (lon_max - lon_min) / side
+    cells = np.arange(n)
+    center_lat = lat_min + (cells // side + 0.5) * cell_lat
+    center_lon = lon_min + (cells % side + 0.5) * cell_lon
+
+    # Radius per vertex stays inside the cell so polygons never overlap
+    angles = np.sort(rng.uniform(0, 2 * np.pi, (n, vertices)), axis=1)
+    radius = rng.uniform(0.15, 0.45, (n, vertices))
+    lat = center_lat[:, None] + radius * cell_lat * np.sin(angles)
+    lon = center_lon[:, None] + radius * cell_lon * np.cos(angles)
+
+    coords = np.column_stack([lat.ravel(), lon.ravel()])
+    ring_offsets = np.arange(n + 1) * vertices
+    attributes = pd.DataFrame({
+        "name": [f"Field_{i + 1}" for i in range(n)],
+        "region": [REGIONS[i % len(REGIONS)] for i in range(n)],
+        "plot_code": [str(900_000 + i) for i in range(n)],
+    })
+    return PolygonStore(coords, ring_offsets, attributes)
+
+
+def make_field_data(fields: PolygonStore, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate field_data.csv style attributes for every field of a store.
+
+    Args:
+        fields: Field polygons (their plot_code becomes new_plot_code)
+        seed: Random seed
+
+    Returns:
+        DataFrame with new_plot_code, yield_probability, average_yield,
+        average_area and average_additional_water(mm)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(fields)
+    return pd.DataFrame({
+        "new_plot_code": fields.column("plot_code"),
+        "yield_probability": rng.uniform(0, 1, n),
+        "average_yield": rng.uniform(5, 18, n),
+        "average_area": rng.uniform(2, 60, n),
+        "average_additional_water(mm)": rng.uniform(0, 400, n),
+    })
+
+
+def make_stations(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate ``n`` water station wells like WaterStationsLoader's stations_df.
+
+    Args:
+        n: Number of station wells
+        seed: Random seed
+
+    Returns:
+        DataFrame with station, well, location, drilling depth and latest
+        survival columns
+    """
+    rng = np.random.default_rng(seed)
+    (lat_min, lat_max), (lon_min, lon_max) = _area_scale(n, 1_000)
+
+    return pd.DataFrame({
+        "station_id": [f"ST{i // 3:06d}" for i in range(n)],
+        "well_number": [f"{i:08d}" for i in range(n)],
+        "latitude": rng.uniform(lat_min, lat_max, n),
+        "longitude": rng.uniform(lon_min, lon_max, n),
+        "location": "Synthetic station",
+        "province": pd.Categorical(["สุพรรณบุรี"] * n),
+        "drilling_depth": rng.integers(20, 300, n),
+        "latest_survival": rng.uniform(0.2, 1.0, n).astype(np.float32),
+    })
+
+
+def make_station_survival(stations_df: pd.DataFrame, years: Tuple[int, int] = (2010, 2030), seed: int = 0) -> pd.DataFrame:
+    """
+    Generate WaterStationsLoader's long survival table for a stations table.
+
+    Args:
+        stations_df: Stations from ``make_stations``
+        years: First and last survival year
+        seed: Random seed
+
+    Returns:
+        DataFrame with station_id, well_number (categorical), row (int32),
+        year (int16) and survival_rate (float32), one row per well and year
+    """
+    rng = np.random.default_rng(seed)
+    n = len(stations_df)
+    year_values = np.arange(years[0], years[1] + 1, dtype=np.int16)
+
+    # Survival decays from 1.0 at a random rate per well
+    decay = rng.uniform(0.0, 0.05, (n, 1))
+    survival = np.clip(1.0 - decay * np.arange(len(year_values))[None, :], 0.0, 1.0)
+
+    rows = np.repeat(np.arange(n), len(year_values))
+    return pd.DataFrame({
+        "station_id": pd.Categorical(stations_df["station_id"].to_numpy()[rows]),
+        "well_number": pd.Categorical(stations_df["well_number"].to_numpy()[rows]),
+        "row": rows.astype(np.int32),
+        "year": np.tile(year_values, n),
+        "survival_rate": survival.ravel().astype(np.float32),
+    })
+
+
+def make_potential_wells(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate ``n`` candidate drilling sites like generate_potential_wells.
+
+    Args:
+        n: Number of candidate sites
+        seed: Random seed
+
+    Returns:
+        DataFrame with the potential_wells_df columns
+    """
+    rng = np.random.default_rng(seed)
+    (lat_min, lat_max), (lon_min, lon_max) = _area_scale(n, 1_000)
+
+    depth = rng.integers(30, 150, n)
+    drilling_cost = depth * 1_200
+    return pd.DataFrame({
+        "potential_id": [f"POT-{i + 1:05d}" for i in range(n)],
+        "lat": rng.uniform(lat_min, lat_max, n),
+        "lon": rng.uniform(lon_min, lon_max, n),
+        "field_name": [f"Field {i % 500}" for i in range(n)],
+        "region": [f"Region {i % 12}" for i in range(n)],
+        "recommended_depth_m": depth,
+        "depth_category": np.select([depth < 50, depth < 100], ["shallow", "medium"], "deep"),
+        "success_probability": rng.uniform(0.5, 0.95, n).round(2),
+        "expected_water_yield_m3h": rng.uniform(5, 20, n).round(1),
+        "estimated_cost_thb": drilling_cost + rng.integers(20_000, 40_000, n),
+        "drilling_cost_thb": drilling_cost,
+        "priority_score": rng.uniform(3, 10, n).round(2),
+    })
+
+
+# Export the generators
+__all__ = ["make_wells", "make_fields", "make_field_data", "make_stations", "make_station_survival", "make_potential_wells"]
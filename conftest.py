@@ -0,0 +1,5 @@
+"""
+pytest root configuration.
+Its presence puts the repository root on sys.path, so tests can import the
+``geodash`` and ``benchmarks`` packages when run with a bare ``pytest``.
+"""
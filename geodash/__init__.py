@@ -2,6 +2,7 @@ __all__ = [
     "data",
     "ui",
     "plugins",
+    "instrumentation",
 ]
 
 
@@ -1,13 +1,21 @@
 # geodash/data/__init__.py - Updated for farm-based time series
-from .loader import load_dashboard_data, load_wells_only, load_farm_data, get_data_status
-from .filters import filter_wells  # Remove sidebar_filters since it's simplified
+from .loader import load_dashboard_data, get_published_data, load_wells_only, load_farm_data, get_data_status
+from .filters import filter_wells, filter_state  # Remove sidebar_filters since it's simplified
 from .mockup import generate_mock_data
+from .polygon_store import PolygonStore
+from .cache import cached, cached_by_key, get_cache_stats
 
 __all__ = [
     "load_dashboard_data",      # Main interface
+    "get_published_data",       # Shared snapshot with incremental reload
     "load_wells_only",          # Load only wells
     "load_farm_data",           # NEW: Load farm data including time series
     "get_data_status",          # Check data availability
     "filter_wells",             # Well filtering function
+    "filter_state",             # Cache key of a filtered wells table
     "generate_mock_data",       # Fallback data
+    "PolygonStore",             # Columnar field/farm polygon storage
+    "cached",                   # st.cache_data with geodata hashers and counters
+    "cached_by_key",            # In-process LRU keyed on data version/filter state
+    "get_cache_stats",          # Cache hit/miss counters
 ]
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Area service for field and farm polygons.
+Computes polygon areas for a whole PolygonStore in one vectorized call, either
+in UTM zone 47N (EPSG:32647, the local projected CRS for central Thailand) or
+as ellipsoidal (equal-area) areas via authalic latitudes. Results are cached per geometry version.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Tuple
+import logging
+
+import numpy as np
+
+from .polygon_store import PolygonStore
+
+try:
+    from pyproj import Transformer
+    PYPROJ_AVAILABLE = True
+except ImportError:
+    PYPROJ_AVAILABLE = False
+
+logger = logging.getLogger("AreaService")
+
+# Unit conversions
+SQ_M_PER_HECTARE = 10_000
+SQ_M_PER_RAI = 1_600  # 1 rai = 1,600 m² (6.25 rai per hectare)
+
+# WGS84 ellipsoid and the sphere with the same surface area
+WGS84_A = 6_378_137.0
+WGS84_E2 = 0.00669437999014
+AUTHALIC_RADIUS_M = 6_371_007.181
+
+# Projected CRS for area calculations in Thailand (WGS 84 / UTM zone 47N)
+UTM_47N = "EPSG:32647"
+
+
+def _ring_vertex_index(x: np.ndarray, y: np.ndarray, ring_offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ring membership and successor index of every vertex.
+
+    Args:
+        x: Vertex x values (open rings)
+        y: Vertex y values (open rings)
+        ring_offsets: Ring offsets into the vertex arrays
+
+    Returns:
+        Tuple of (vertex_ring, next_index): ring index of each vertex and the
+        index of the following vertex in the same ring (wrapping to its start)
+    """
+    ring_counts = np.diff(ring_offsets)
+    vertex_ring = np.repeat(np.arange(len(ring_counts)), ring_counts)
+
+    next_index = np.arange(1, len(x) + 1)
+    non_empty = ring_counts > 0
+    next_index[ring_offsets[1:][non_empty] - 1] = ring_offsets[:-1][non_empty]
+
+    return vertex_ring, next_index
+
+
+def _authalic_latitude(lat_rad: np.ndarray) -> np.ndarray:
+    """
+    Convert geodetic latitudes (radians) to authalic latitudes on WGS84.
+
+    Areas on the authalic sphere at authalic latitudes equal ellipsoidal areas.
+    """
+    e = np.sqrt(WGS84_E2)
+
+    def q(sin_lat):
+        return (1 - WGS84_E2) * (
+            sin_lat / (1 - WGS84_E2 * sin_lat ** 2)
+            - np.log((1 - e * sin_lat) / (1 + e * sin_lat)) / (2 * e)
+        )
+
+    return np.arcsin(np.clip(q(np.sin(lat_rad)) / q(1.0), -1.0, 1.0))
+
+
+class AreaService:
+    """Vectorized polygon area calculations with a per-geometry-version cache."""
+
+    METHODS = ("geodesic", "utm")
+
+    def __init__(self, max_cache_entries: int = 32):
+        """
+        Initialize the area service.
+
+        Args:
+            max_cache_entries: Maximum number of (geometry, method) results kept
+        """
+        self.max_cache_entries = max_cache_entries
+        self._cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = Lock()
+        self._transformer = Transformer.from_crs("EPSG:4326", UTM_47N, always_xy=True) if PYPROJ_AVAILABLE else None
+
+    def areas_m2(self, store: PolygonStore, method: str = "geodesic") -> np.ndarray:
+        """
+        Get the area of every polygon in square meters (holes subtracted).
+
+        Args:
+            store: Polygons to measure
+            method: "geodesic" (WGS84 ellipsoidal area via the authalic
+                sphere, default) or "utm" (UTM zone 47N projection)
+
+        Returns:
+            Read-only float64 array with one area per polygon
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown area method '{method}'. Use one of {self.METHODS}")
+
+        if method == "utm" and self._transformer is None:
+            logger.warning("⚠️  pyproj not available, using geodesic areas instead of UTM")
+            method = "geodesic"
+
+        key = (store.geometry_version, method)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        ring_areas = self._utm_ring_areas(store) if method == "utm" else self._geodesic_ring_areas(store)
+        ring_areas[store.ring_is_hole] *= -1
+        areas = np.maximum(np.bincount(store.ring_polygon, weights=ring_areas, minlength=len(store)), 0.0)
+        areas.flags.writeable = False
+
+        with self._lock:
+            self._cache[key] = areas
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+
+        return areas
+
+    def area_table(self, store: PolygonStore, method: str = "geodesic") -> Dict[str, np.ndarray]:
+        """
+        Get areas in square meters, hectares and rai.
+
+        Args:
+            store: Polygons to measure
+            method: Area method (see ``areas_m2``)
+
+        Returns:
+            Dictionary with "area_sq_m", "area_hectares" and "area_rai" arrays
+        """
+        area_sq_m = self.areas_m2(store, method)
+        return {
+            "area_sq_m": area_sq_m,
+            "area_hectares": area_sq_m / SQ_M_PER_HECTARE,
+            "area_rai": area_sq_m / SQ_M_PER_RAI,
+        }
+
+    def clear_cache(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._cache.clear()
+
+    def _utm_ring_areas(self, store: PolygonStore) -> np.ndarray:
+        """Unsigned ring areas from one bulk projection to UTM 47N and the shoelace formula."""
+        x, y = self._transformer.transform(store.coords[:, 1], store.coords[:, 0])
+        vertex_ring, next_index = _ring_vertex_index(x, y, store.ring_offsets)
+
+        cross = x * y[next_index] - x[next_index] * y
+        return np.abs(np.bincount(vertex_ring, weights=cross, minlength=len(store.ring_offsets) - 1)) / 2
+
+    def _geodesic_ring_areas(self, store: PolygonStore) -> np.ndarray:
+        """Unsigned ring areas on the authalic sphere (spherical excess line integral)."""
+        lat = _authalic_latitude(np.radians(store.coords[:, 0]))
+        lon = np.radians(store.coords[:, 1])
+        vertex_ring, next_index = _ring_vertex_index(lon, lat, store.ring_offsets)
+
+        terms = (lon[next_index] - lon) * (2 + np.sin(lat) + np.sin(lat[next_index]))
+        sums = np.bincount(vertex_ring, weights=terms, minlength=len(store.ring_offsets) - 1)
+        return np.abs(sums) * AUTHALIC_RADIUS_M ** 2 / 2
+
+
+# Global instance
+_area_service = None
+
+
+def get_area_service() -> AreaService:
+    """Get or create the global area service instance."""
+    global _area_service
+    if _area_service is None:
+        _area_service = AreaService()
+    return _area_service
+
+
+# Export the service
+__all__ = ["AreaService", "get_area_service", "SQ_M_PER_HECTARE", "SQ_M_PER_RAI"]
@@ -0,0 +1,231 @@
+"""
+Streamlit caching layer for loaders and derived computations.
+Wraps ``st.cache_data`` with hash functions for DataFrames, polygon stores and
+shapely geometries, per-function TTL/max_entries, and hit/miss counters that
+can be exported as a dictionary or DataFrame. ``cached_by_key`` is an
+in-process LRU for per-rerun computations on large frames that are already
+identified by a cheap key (data version plus filter state).
+"""
+from collections import OrderedDict
+from functools import wraps
+from hashlib import blake2b
+from threading import Lock
+from typing import Callable, Dict, Hashable, Optional
+import pickle
+
+import pandas as pd
+import streamlit as st
+
+from .polygon_store import PolygonStore
+
+try:
+    import shapely
+    SHAPELY_AVAILABLE = True
+except ImportError:
+    SHAPELY_AVAILABLE = False
+
+# Defaults for cached functions
+DEFAULT_TTL_S = 3600
+DEFAULT_MAX_ENTRIES = 32
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """
+    Content hash of a DataFrame (all rows, index, column names and dtypes).
+
+    Streamlit's built-in hasher samples frames above 50k rows; this one hashes
+    every row so large well tables never produce stale cache hits.
+    """
+    digest = blake2b(digest_size=16)
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(repr(df.dtypes.astype(str).tolist()).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    except TypeError:
+        # Unhashable cell values (lists, dicts); fall back to the pickled frame
+        digest.update(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+def hash_polygon_store(store: PolygonStore) -> str:
+    """Hash a PolygonStore by its geometry and attributes version."""
+    return store.version
+
+
+def hash_geometry(geometry) -> bytes:
+    """Hash a shapely geometry by its WKB encoding."""
+    return geometry.wkb
+
+
+# Type -> hash function, passed to st.cache_data. Streamlit matches on the
+# exact type, so every concrete shapely geometry class is listed.
+HASH_FUNCS: Dict[object, Callable] = {
+    pd.DataFrame: hash_dataframe,
+    PolygonStore: hash_polygon_store,
+}
+if SHAPELY_AVAILABLE:
+    HASH_FUNCS.update({
+        geometry_type: hash_geometry
+        for geometry_type in (
+            shapely.Point, shapely.LineString, shapely.LinearRing, shapely.Polygon,
+            shapely.MultiPoint, shapely.MultiLineString, shapely.MultiPolygon,
+            shapely.GeometryCollection,
+        )
+    })
+
+# Function name -> {"calls", "misses", "ttl_s", "max_entries"}
+_cache_stats: Dict[str, Dict[str, object]] = {}
+_stats_lock = Lock()
+
+
+def _record(name: str, counter: str) -> None:
+    with _stats_lock:
+        _cache_stats[name][counter] += 1
+
+
+def cached(
+    ttl: Optional[float] = DEFAULT_TTL_S,
+    max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+    name: Optional[str] = None,
+) -> Callable:
+    """
+    Decorator caching a pure function with ``st.cache_data`` and counting hits/misses.
+
+    Args:
+        ttl: Seconds before an entry expires (None keeps entries until evicted)
+        max_entries: Maximum number of cached results for this function
+        name: Name used in the cache statistics (default: module.qualname)
+
+    Returns:
+        Decorator; the wrapped function also exposes ``clear()``
+    """
+    def decorator(func: Callable) -> Callable:
+        stat_name = name or f"{func.__module__}.{func.__qualname__}"
+        with _stats_lock:
+            _cache_stats[stat_name] = {"calls": 0, "misses": 0, "ttl_s": ttl, "max_entries": max_entries}
+
+        @wraps(func)
+        def compute(*args, **kwargs):
+            # Only runs on a cache miss (or expired entry)
+            _record(stat_name, "misses")
+            return func(*args, **kwargs)
+
+        cached_func = st.cache_data(
+            ttl=ttl,
+            max_entries=max_entries,
+            hash_funcs=HASH_FUNCS,
+            show_spinner=False,
+        )(compute)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            _record(stat_name, "calls")
+            return cached_func(*args, **kwargs)
+
+        wrapper.clear = cached_func.clear
+        return wrapper
+
+    return decorator
+
+
+def cached_by_key(
+    key: Callable[..., Optional[Hashable]],
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    name: Optional[str] = None,
+) -> Callable:
+    """
+    Decorator caching results in process memory under a caller-supplied key.
+
+    Unlike ``cached``, arguments are never hashed and hits return the cached
+    object itself rather than an unpickled copy, so a hit costs a dictionary
+    lookup however large the inputs are. Results are shared by all sessions
+    and must be treated as read-only.
+
+    Args:
+        key: Builds the cache key from the call arguments; calls for which it
+            returns None are computed without caching
+        max_entries: Maximum number of cached results (least recently used
+            are evicted)
+        name: Name used in the cache statistics (default: module.qualname)
+
+    Returns:
+        Decorator; the wrapped function also exposes ``clear()``
+    """
+    def decorator(func: Callable) -> Callable:
+        stat_name = name or f"{func.__module__}.{func.__qualname__}"
+        with _stats_lock:
+            _cache_stats[stat_name] = {"calls": 0, "misses": 0, "ttl_s": None, "max_entries": max_entries}
+
+        results: "OrderedDict[Hashable, object]" = OrderedDict()
+        lock = Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            if cache_key is None:
+                return func(*args, **kwargs)
+
+            _record(stat_name, "calls")
+            with lock:
+                if cache_key in results:
+                    results.move_to_end(cache_key)
+                    return results[cache_key]
+
+            _record(stat_name, "misses")
+            result = func(*args, **kwargs)
+            with lock:
+                results[cache_key] = result
+                while len(results) > max_entries:
+                    results.popitem(last=False)
+            return result
+
+        def clear() -> None:
+            with lock:
+                results.clear()
+
+        wrapper.clear = clear
+        return wrapper
+
+    return decorator
+
+
+def get_cache_stats() -> Dict[str, Dict[str, object]]:
+    """
+    Get hit/miss counters for every cached function.
+
+    Returns:
+        Dictionary of function name -> calls, hits, misses, hit_rate, ttl_s, max_entries
+    """
+    with _stats_lock:
+        snapshot = {stat_name: dict(stats) for stat_name, stats in _cache_stats.items()}
+
+    for stats in snapshot.values():
+        stats["hits"] = stats["calls"] - stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / stats["calls"], 4) if stats["calls"] else 0.0
+    return snapshot
+
+
+def cache_stats_frame() -> pd.DataFrame:
+    """Get the cache counters as a DataFrame (one row per cached function)."""
+    stats = get_cache_stats()
+    columns = ["function", "calls", "hits", "misses", "hit_rate", "ttl_s", "max_entries"]
+    return pd.DataFrame([{"function": stat_name, **values} for stat_name, values in stats.items()], columns=columns)
+
+
+def reset_cache_stats() -> None:
+    """Reset all hit/miss counters (cached values are kept)."""
+    with _stats_lock:
+        for stats in _cache_stats.values():
+            stats["calls"] = stats["misses"] = 0
+
+
+# Export the caching helpers
+__all__ = [
+    "cached",
+    "cached_by_key",
+    "get_cache_stats",
+    "cache_stats_frame",
+    "reset_cache_stats",
+    "hash_dataframe",
+    "HASH_FUNCS",
+]
@@ -3,19 +3,32 @@ Base classes and interfaces for data loaders.
 Provides common functionality and consistent patterns for all specialized loaders.
 """
 from abc import ABC, abstractmethod
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 import logging
 import warnings
 
-# Try to import geospatial libraries with graceful fallback
+import numpy as np
+import pandas as pd
+
+from .utils import validate_polygon_buffers
+from ..polygon_store import PolygonStore
+
+# Try to import geospatial libraries with graceful fallback.
+# GeoPandas (and pyogrio/GDAL behind it) is only imported when a file is read.
 try:
-    import geopandas as gpd
-    GEOSPATIAL_AVAILABLE = True
+    import shapely
+    GEOSPATIAL_AVAILABLE = find_spec("geopandas") is not None
 except ImportError:
     GEOSPATIAL_AVAILABLE = False
+
+if not GEOSPATIAL_AVAILABLE:
     warnings.warn("GeoPandas not available. Real geospatial data loading disabled.")
 
+if TYPE_CHECKING:
+    import geopandas as gpd
+
 
 class BaseDataLoader(ABC):
     """
@@ -103,12 +116,14 @@ class BaseGeospatialLoader(BaseDataLoader):
         if not GEOSPATIAL_AVAILABLE:
             self.logger.warning("GeoPandas not available. Geospatial features disabled.")
     
-    def _load_geospatial_file(self, file_path: Path) -> Optional[gpd.GeoDataFrame]:
+    def _load_geospatial_file(self, file_path: Path) -> Optional["gpd.GeoDataFrame"]:
         """Load a geospatial file with error handling."""
         if not GEOSPATIAL_AVAILABLE:
             return None
         
         try:
+            import geopandas as gpd
+            
             self._log_loading_attempt("geospatial file", file_path)
             gdf = gpd.read_file(file_path)
             
@@ -122,35 +137,122 @@ class BaseGeospatialLoader(BaseDataLoader):
             self.logger.error(f"❌ Error loading {file_path}: {e}")
             return None
     
-    def _extract_coordinates_from_geometry(self, geometry) -> List[List[float]]:
-        """Extract coordinate pairs from Shapely geometry."""
-        try:
-            if geometry is None or geometry.is_empty:
-                return []
-            
-            if geometry.geom_type == 'Polygon':
-                coords = list(geometry.exterior.coords)[:-1]  # Remove closing coordinate
-                return [[float(coord[1]), float(coord[0])] for coord in coords]  # lat, lon
-            
-            elif geometry.geom_type == 'MultiPolygon':
-                geoms_list = list(geometry.geoms)
-                if geoms_list:
-                    first_polygon = geoms_list[0]
-                    coords = list(first_polygon.exterior.coords)[:-1]
-                    return [[float(coord[1]), float(coord[0])] for coord in coords]
-            
-        except Exception as e:
-            self.logger.warning(f"⚠️  Error extracting coordinates: {e}")
-            return []
-        
-        return []
-    
     def _find_field_value(self, row, field_names: List[str], default: str = None) -> Optional[str]:
         """Find the first available field value from a list of possible field names."""
         for field in field_names:
             if field in row.index and row[field] is not None and str(row[field]).strip():
                 return str(row[field]).strip()
         return default
+    
+    def _extract_coordinate_buffers(self, geometries) -> Tuple[np.ndarray, ...]:
+        """
+        Extract every ring of every polygon part as flat coordinate buffers.
+        
+        Uses shapely 2 array operations instead of per-geometry Python work.
+        All MultiPolygon parts and interior rings (holes) are preserved, using
+        the GeoArrow nesting: vertices -> rings -> parts -> polygons.
+        
+        Args:
+            geometries: GeoSeries or array of Shapely geometries
+            
+        Returns:
+            Tuple of (coords, ring_offsets, part_offsets, polygon_offsets, rows):
+            - coords: float64 array of shape (n_vertices, 2) holding [lat, lon]
+              pairs without the closing vertex
+            - ring_offsets: int64 array of length n_rings + 1; ring ``k`` is
+              ``coords[ring_offsets[k]:ring_offsets[k + 1]]``
+            - part_offsets: int64 array of length n_parts + 1 delimiting the
+              rings of each part (exterior ring first, then holes)
+            - polygon_offsets: int64 array of length n_polygons + 1 delimiting
+              the parts of each polygon
+            - rows: positional index of the source geometry for each polygon
+        """
+        geoms = np.asarray(geometries, dtype=object)
+        
+        # Keep non-empty Polygon (3) and MultiPolygon (6) geometries
+        type_ids = shapely.get_type_id(geoms)
+        keep = np.isin(type_ids, (3, 6)) & ~shapely.is_empty(geoms)
+        rows = np.flatnonzero(keep)
+        
+        # Polygon -> parts -> rings -> vertices, one bulk call per level
+        parts, part_polygon = shapely.get_parts(geoms[rows], return_index=True)
+        non_empty = ~shapely.is_empty(parts)
+        parts, part_polygon = parts[non_empty], part_polygon[non_empty]
+        rings, ring_part = shapely.get_rings(parts, return_index=True)
+        coords, vertex_ring = shapely.get_coordinates(rings, return_index=True)
+        
+        # Drop the closing vertex of every ring
+        counts = np.bincount(vertex_ring, minlength=len(rings))
+        closing = np.cumsum(counts) - 1
+        open_mask = np.ones(len(coords), dtype=bool)
+        open_mask[closing[counts > 0]] = False
+        coords = coords[open_mask][:, ::-1]  # (lon, lat) -> (lat, lon)
+        
+        ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+        np.cumsum(np.maximum(counts - 1, 0), out=ring_offsets[1:])
+        part_offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ring_part, minlength=len(parts)), out=part_offsets[1:])
+        polygon_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(part_polygon, minlength=len(rows)), out=polygon_offsets[1:])
+        
+        return np.ascontiguousarray(coords, dtype=np.float64), ring_offsets, part_offsets, polygon_offsets, rows
+    
+    def _extract_polygon_store(self, geometries) -> Tuple[PolygonStore, np.ndarray]:
+        """
+        Build a validated PolygonStore (geometry only) from Shapely geometries.
+        
+        Polygons with any ring failing ``validate_polygon_buffers`` (fewer than
+        3 vertices or out-of-range coordinates) are dropped.
+        
+        Args:
+            geometries: GeoSeries or array of Shapely geometries
+            
+        Returns:
+            Tuple of (store, rows) where ``rows`` is the positional index of the
+            source geometry for each polygon in the store
+        """
+        coords, ring_offsets, part_offsets, polygon_offsets, rows = self._extract_coordinate_buffers(geometries)
+        store = PolygonStore(coords, ring_offsets, None, part_offsets, polygon_offsets)
+        
+        invalid_rings = ~validate_polygon_buffers(store.coords, store.ring_offsets)
+        valid = np.bincount(store.ring_polygon, weights=invalid_rings, minlength=len(store)) == 0
+        valid &= np.diff(store.polygon_offsets) > 0
+        
+        if not valid.all():
+            store, rows = store.take(valid), rows[valid]
+        
+        return store, rows
+    
+    def _resolve_field_column(self, df: pd.DataFrame, field_names: List[str]) -> np.ndarray:
+        """
+        Column-wise equivalent of ``_find_field_value`` for a whole DataFrame.
+        
+        Args:
+            df: DataFrame with candidate columns
+            field_names: Candidate column names in priority order
+            
+        Returns:
+            Object array with the first non-empty stripped value per row, or
+            None where no candidate column has a value
+        """
+        result = np.full(len(df), None, dtype=object)
+        unresolved = np.ones(len(df), dtype=bool)
+        
+        for field in field_names:
+            if field not in df.columns:
+                continue
+            
+            column = df[field]
+            values = column.astype(str).str.strip().to_numpy(dtype=object)
+            present = column.notna().to_numpy() & (values != "")
+            take = unresolved & present
+            result[take] = values[take]
+            unresolved &= ~present
+            
+            if not unresolved.any():
+                break
+        
+        return result
 
 
 class DataValidationMixin:
@@ -203,6 +305,12 @@ class ColorManager:
         """Get a farm color by index (cycles through available colors)."""
         return cls.FARM_COLORS[index % len(cls.FARM_COLORS)]
     
+    @classmethod
+    def get_farm_colors(cls, indices: np.ndarray) -> np.ndarray:
+        """Get farm colors for an array of indices (vectorized ``get_farm_color``)."""
+        palette = np.asarray(cls.FARM_COLORS, dtype=object)
+        return palette[np.asarray(indices) % len(palette)]
+    
     @classmethod
     def get_well_color(cls, survived: bool) -> str:
         """Get well color based on survival status."""
@@ -3,13 +3,15 @@ Farm polygons data loader with color assignment and area calculations.
 Handles loading farm boundary polygons from shapefiles with distinct colors and automatic area calculations.
 Provides area data in multiple units: square meters, hectares, and rai (Thai unit).
 """
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Sequence
 
 from .base import BaseGeospatialLoader, DataValidationMixin, ColorManager
-from .utils import validate_polygon_coordinates, log_data_summary
-from ..mockup import generate_mock_data
+from .utils import log_data_summary
+from ..area_service import get_area_service
+from ..polygon_store import PolygonStore
 
 
 class FarmsLoader(BaseGeospatialLoader, DataValidationMixin):
@@ -18,13 +20,19 @@ class FarmsLoader(BaseGeospatialLoader, DataValidationMixin):
     def __init__(self, data_dir: str = "geodash/data"):
         super().__init__(data_dir)
         self.farms_shapefile = self.rdc_farms_dir / "farm_convex_hulls.shp"
+        
+        # Candidate attribute columns for the farm name, in priority order
+        self.farm_name_fields = [
+            'farm_name', 'farm_id', 'name', 'Farm_Name', 'FARM_NAME', 
+            'id', 'ID', 'zone_name', 'area_name'
+        ]
     
-    def load(self) -> List[Dict[str, object]]:
+    def load(self) -> PolygonStore:
         """
         Load farm polygons from RDC_Farms directory with distinct colors.
         
         Returns:
-            List of farm polygon dictionaries with colors and styling
+            PolygonStore of farm polygons with colors, styling and area attributes
         """
         if not self._file_exists(self.farms_shapefile):
             self._log_fallback("farm polygons", f"File not found: {self.farms_shapefile}")
@@ -51,14 +59,14 @@ class FarmsLoader(BaseGeospatialLoader, DataValidationMixin):
             self._log_fallback("farm polygons", f"Error loading farm data: {e}")
             return self._load_fallback_data()
     
-    def _load_fallback_data(self) -> List[Dict[str, object]]:
+    def _load_fallback_data(self) -> PolygonStore:
         """Load mock farm polygons data."""
-        # Return empty list since mock data doesn't include farm polygons
+        # Return an empty store since mock data doesn't include farm polygons
         # This ensures the app still works but without farm boundaries
         log_data_summary("farm polygons", 0, [], "mock")
-        return []
+        return PolygonStore.empty()
     
-    def _process_farm_polygons(self, gdf) -> List[Dict[str, object]]:
+    def _process_farm_polygons(self, gdf) -> PolygonStore:
         """
         Process farm polygons from GeoPandas DataFrame with area calculations.
         
@@ -66,76 +74,38 @@ class FarmsLoader(BaseGeospatialLoader, DataValidationMixin):
             gdf: GeoPandas GeoDataFrame from shapefile
             
         Returns:
-            List of farm polygon dictionaries with styling and area data
+            PolygonStore of farm polygons with styling and area data
         """
-        farm_polygons = []
-        
-        # Calculate areas using projected coordinate system for accuracy
-        gdf_projected = gdf.to_crs('EPSG:3857')  # Web Mercator for area calculations
-        
-        for i, row in gdf.iterrows():
-            try:
-                geometry = row.geometry
-                
-                if geometry is None or geometry.is_empty:
-                    continue
-                
-                if geometry.geom_type in ['Polygon', 'MultiPolygon']:
-                    coords = self._extract_coordinates_from_geometry(geometry)
-                    
-                    if coords and validate_polygon_coordinates(coords):
-                        # Find farm name
-                        farm_name = self._find_farm_name(row, i)
-                        
-                        # Calculate area in square meters and hectares
-                        area_sq_m = gdf_projected.iloc[i].geometry.area
-                        area_hectares = area_sq_m / 10000
-                        area_rai = area_hectares * 6.25  # 1 hectare = 6.25 rai (Thai unit)
-                        
-                        # Assign color from palette
-                        color = ColorManager.get_farm_color(i)
-                        
-                        farm_polygon = {
-                            "name": farm_name,
-                            "farm_id": i + 1,
-                            "coordinates": coords,
-                            "color": color,
-                            "fill_color": color,
-                            "fill_opacity": 0.3,
-                            "weight": 2,
-                            # Area data
-                            "area_sq_m": round(area_sq_m, 2),
-                            "area_hectares": round(area_hectares, 2),
-                            "area_rai": round(area_rai, 2)
-                        }
-                        
-                        farm_polygons.append(farm_polygon)
-                        
-            except Exception as e:
-                self.logger.warning(f"⚠️  Error processing farm row {i}: {e}")
-                continue
+        geometry, rows = self._extract_polygon_store(gdf.geometry)
         
-        self.logger.info(f"🚜 Successfully processed {len(farm_polygons)} farm polygons with area data")
-        return farm_polygons
-    
-    def _find_farm_name(self, row, index: int) -> str:
-        """
-        Find farm name from row data or generate one.
+        # Find farm names column-wise
+        farm_names = self._resolve_field_column(gdf.iloc[rows], self.farm_name_fields)
+        missing_names = farm_names == None  # noqa: E711 - elementwise comparison
+        farm_names[missing_names] = [f"Farm_{row + 1}" for row in rows[missing_names]]
         
-        Args:
-            row: Pandas Series representing a row from the GeoDataFrame
-            index: Row index for fallback naming
-            
-        Returns:
-            Farm name string
-        """
-        farm_name_fields = [
-            'farm_name', 'farm_id', 'name', 'Farm_Name', 'FARM_NAME', 
-            'id', 'ID', 'zone_name', 'area_name'
-        ]
+        # Ellipsoidal areas for all farms in one vectorized call (cached per geometry)
+        areas = get_area_service().area_table(geometry)
+        
+        # Assign colors from palette
+        colors = ColorManager.get_farm_colors(rows)
         
-        farm_name = self._find_field_value(row, farm_name_fields)
-        return farm_name if farm_name else f"Farm_{index+1}"
+        attributes = pd.DataFrame({
+            "name": farm_names,
+            "farm_id": (rows + 1).tolist(),
+            "color": colors,
+            "fill_color": colors,
+            "fill_opacity": 0.3,
+            "weight": 2,
+            # Area data
+            "area_sq_m": np.round(areas["area_sq_m"], 2).tolist(),
+            "area_hectares": np.round(areas["area_hectares"], 2).tolist(),
+            "area_rai": np.round(areas["area_rai"], 2).tolist(),
+        })
+        
+        farm_polygons = geometry.with_attributes(attributes)
+        
+        self.logger.info(f"🚜 Successfully processed {len(farm_polygons)} farm polygons with area data")
+        return farm_polygons
     
     def get_color_palette(self) -> List[str]:
         """
@@ -160,12 +130,12 @@ class FarmsLoader(BaseGeospatialLoader, DataValidationMixin):
             "color": None,      # Will be set per farm
         }
     
-    def get_farm_areas_summary(self, farm_polygons: List[Dict[str, object]]) -> Dict[str, object]:
+    def get_farm_areas_summary(self, farm_polygons: Sequence) -> Dict[str, object]:
         """
         Get summary statistics of farm areas.
         
         Args:
-            farm_polygons: List of farm polygon dictionaries with area data
+            farm_polygons: PolygonStore (or list of farm dictionaries) with area data
             
         Returns:
             Dictionary with area statistics
@@ -173,25 +143,26 @@ class FarmsLoader(BaseGeospatialLoader, DataValidationMixin):
         if not farm_polygons:
             return {}
         
-        areas_hectares = [farm.get('area_hectares', 0) for farm in farm_polygons]
-        areas_rai = [farm.get('area_rai', 0) for farm in farm_polygons]
+        farms = PolygonStore.coerce(farm_polygons)
+        areas_hectares = pd.to_numeric(pd.Series(farms.column('area_hectares')), errors='coerce').fillna(0).to_numpy()
+        areas_rai = pd.to_numeric(pd.Series(farms.column('area_rai')), errors='coerce').fillna(0).to_numpy()
         
         return {
-            "total_farms": len(farm_polygons),
-            "total_area_hectares": round(sum(areas_hectares), 2),
-            "total_area_rai": round(sum(areas_rai), 2),
-            "average_area_hectares": round(sum(areas_hectares) / len(areas_hectares), 2),
-            "average_area_rai": round(sum(areas_rai) / len(areas_rai), 2),
-            "largest_farm_hectares": round(max(areas_hectares), 2),
-            "smallest_farm_hectares": round(min(areas_hectares), 2)
+            "total_farms": len(farms),
+            "total_area_hectares": round(float(areas_hectares.sum()), 2),
+            "total_area_rai": round(float(areas_rai.sum()), 2),
+            "average_area_hectares": round(float(areas_hectares.mean()), 2),
+            "average_area_rai": round(float(areas_rai.mean()), 2),
+            "largest_farm_hectares": round(float(areas_hectares.max()), 2),
+            "smallest_farm_hectares": round(float(areas_hectares.min()), 2)
         }
     
-    def get_farm_by_name(self, farm_polygons: List[Dict[str, object]], name: str) -> Dict[str, object]:
+    def get_farm_by_name(self, farm_polygons: Sequence, name: str) -> Dict[str, object]:
         """
         Get farm data by name including area information.
         
         Args:
-            farm_polygons: List of farm polygon dictionaries
+            farm_polygons: PolygonStore or list of farm polygon dictionaries
             name: Farm name to search for
             
         Returns:
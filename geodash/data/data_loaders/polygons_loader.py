@@ -3,16 +3,17 @@ Field polygons data loader for GeoJSON, Shapefile, and GeoPackage files.
 Handles loading field boundary polygons from various geospatial formats.
 """
 from pathlib import Path
-from typing import Dict, List
+
+import pandas as pd
 
 from .base import BaseGeospatialLoader, DataValidationMixin
 from .utils import (
     load_geojson_file,
-    classify_region_by_coords,
-    validate_polygon_coordinates,
+    classify_regions_by_centroids,
     log_data_summary
 )
 from ..mockup import generate_mock_data
+from ..polygon_store import PolygonStore
 
 
 class PolygonsLoader(BaseGeospatialLoader, DataValidationMixin):
@@ -21,19 +22,30 @@ class PolygonsLoader(BaseGeospatialLoader, DataValidationMixin):
     def __init__(self, data_dir: str = "geodash/data"):
         super().__init__(data_dir)
         self.supported_extensions = ['.geojson', '.json', '.shp', '.gpkg']
+        
+        # Candidate attribute columns, in priority order
+        self.name_fields = [
+            'farm_name', 'plot_code', 'zone_name', 'name', 'field_name', 
+            'NAME', 'FIELD_NAME', 'id', 'ID'
+        ]
+        self.region_fields = [
+            'zone_name', 'farm_name', 'region', 'zone', 'REGION', 
+            'ZONE', 'area', 'AREA', 'amphoe', 'district'
+        ]
     
-    def load(self) -> List[Dict[str, object]]:
+    def load(self) -> PolygonStore:
         """
         Load field polygons from RDC_Fields directory.
         
         Returns:
-            List of polygon dictionaries with name, region, and coordinates
+            PolygonStore with name, region (and plot_code when available)
+            attributes; each item behaves like a polygon dictionary
         """
         if not self.rdc_fields_dir.exists():
             self._log_fallback("field polygons", f"Directory not found: {self.rdc_fields_dir}")
             return self._load_fallback_data()
         
-        polygons = []
+        stores = []
         
         # Find all supported geospatial files
         geospatial_files = self._find_files_with_extensions(
@@ -48,13 +60,14 @@ class PolygonsLoader(BaseGeospatialLoader, DataValidationMixin):
         # Process each file
         for file_path in geospatial_files:
             try:
-                file_polygons = self._load_polygons_from_file(file_path)
-                polygons.extend(file_polygons)
+                stores.append(self._load_polygons_from_file(file_path))
                 
             except Exception as e:
                 self.logger.warning(f"⚠️  Error loading {file_path}: {e}")
                 continue
         
+        polygons = PolygonStore.concat(stores)
+        
         if not polygons:
             self._log_fallback("field polygons", "No valid polygons found in any file")
             return self._load_fallback_data()
@@ -62,14 +75,14 @@ class PolygonsLoader(BaseGeospatialLoader, DataValidationMixin):
         log_data_summary("field polygons", len(polygons), polygons, "real")
         return polygons
     
-    def _load_fallback_data(self) -> List[Dict[str, object]]:
+    def _load_fallback_data(self) -> PolygonStore:
         """Load mock field polygons data."""
         mock_data = generate_mock_data()
-        polygons = mock_data["polygons"]
+        polygons = PolygonStore.coerce(mock_data["polygons"])
         log_data_summary("field polygons", len(polygons), polygons, "mock")
         return polygons
     
-    def _load_polygons_from_file(self, file_path: Path) -> List[Dict[str, object]]:
+    def _load_polygons_from_file(self, file_path: Path) -> PolygonStore:
         """
         Load polygons from a single geospatial file.
         
@@ -77,7 +90,7 @@ class PolygonsLoader(BaseGeospatialLoader, DataValidationMixin):
             file_path: Path to the geospatial file
             
         Returns:
-            List of polygon dictionaries
+            PolygonStore for the file (empty on failure)
         """
         self._log_loading_attempt("field polygons", file_path)
         
@@ -91,24 +104,24 @@ class PolygonsLoader(BaseGeospatialLoader, DataValidationMixin):
             return self._load_from_geopackage(file_path)
         else:
             self.logger.warning(f"⚠️  Unsupported file format: {file_ext}")
-            return []
+            return PolygonStore.empty()
     
-    def _load_from_geojson(self, file_path: Path) -> List[Dict[str, object]]:
+    def _load_from_geojson(self, file_path: Path) -> PolygonStore:
         """Load polygons from GeoJSON file."""
         try:
-            polygons = load_geojson_file(file_path)
+            polygons = PolygonStore.from_records(load_geojson_file(file_path))
             self._log_success("field polygons", len(polygons), "real")
             return polygons
         except Exception as e:
             self.logger.error(f"❌ Error loading GeoJSON {file_path}: {e}")
-            return []
+            return PolygonStore.empty()
     
-    def _load_from_shapefile(self, file_path: Path) -> List[Dict[str, object]]:
+    def _load_from_shapefile(self, file_path: Path) -> PolygonStore:
         """Load polygons from Shapefile."""
         try:
             gdf = self._load_geospatial_file(file_path)
             if gdf is None:
-                return []
+                return PolygonStore.empty()
             
             polygons = self._geopandas_to_polygons(gdf, file_path.name)
             self._log_success("field polygons", len(polygons), "real")
@@ -116,14 +129,14 @@ class PolygonsLoader(BaseGeospatialLoader, DataValidationMixin):
             
         except Exception as e:
             self.logger.error(f"❌ Error loading Shapefile {file_path}: {e}")
-            return []
+            return PolygonStore.empty()
     
-    def _load_from_geopackage(self, file_path: Path) -> List[Dict[str, object]]:
+    def _load_from_geopackage(self, file_path: Path) -> PolygonStore:
         """Load polygons from GeoPackage."""
         try:
             gdf = self._load_geospatial_file(file_path)
             if gdf is None:
-                return []
+                return PolygonStore.empty()
             
             polygons = self._geopandas_to_polygons(gdf, file_path.name)
             self._log_success("field polygons", len(polygons), "real")
@@ -131,78 +144,45 @@ class PolygonsLoader(BaseGeospatialLoader, DataValidationMixin):
             
         except Exception as e:
             self.logger.error(f"❌ Error loading GeoPackage {file_path}: {e}")
-            return []
+            return PolygonStore.empty()
     
-    def _geopandas_to_polygons(self, gdf, filename: str) -> List[Dict[str, object]]:
+    def _geopandas_to_polygons(self, gdf, filename: str) -> PolygonStore:
         """
-        Convert GeoPandas DataFrame to polygon list.
+        Convert GeoPandas DataFrame to a polygon store in one bulk pass.
+        
+        Every MultiPolygon part and interior ring is kept.
         
         Args:
             gdf: GeoPandas GeoDataFrame
             filename: Name of the source file for logging
             
         Returns:
-            List of polygon dictionaries
+            PolygonStore with name, region and (if present) plot_code attributes
         """
-        polygons = []
+        geometry, rows = self._extract_polygon_store(gdf.geometry)
+        source = gdf.iloc[rows]
         
-        for i, row in gdf.iterrows():
-            try:
-                geometry = row.geometry
-                
-                if geometry is None or geometry.is_empty:
-                    continue
-                
-                if geometry.geom_type in ['Polygon', 'MultiPolygon']:
-                    coords = self._extract_coordinates_from_geometry(geometry)
-                    
-                    if coords and validate_polygon_coordinates(coords):
-                        # Try common field names for name and region
-                        name = self._find_polygon_name(row, i)
-                        region = self._find_polygon_region(row, coords)
-                        # Capture plot_code for matching with field data if available
-                        plot_code_value = None
-                        try:
-                            if 'plot_code' in row.index:
-                                plot_code_value = row['plot_code']
-                            elif 'PLOT_CODE' in row.index:
-                                plot_code_value = row['PLOT_CODE']
-                        except Exception:
-                            plot_code_value = None
-                        
-                        polygons.append({
-                            "name": name,
-                            "region": region,
-                            "coordinates": coords,
-                            **({"plot_code": str(plot_code_value)} if plot_code_value is not None else {})
-                        })
-                        
-            except Exception as e:
-                self.logger.warning(f"⚠️  Error processing polygon {i} in {filename}: {e}")
-                continue
+        names = self._resolve_field_column(source, self.name_fields)
+        missing_names = names == None  # noqa: E711 - elementwise comparison
+        names[missing_names] = [f"Field_{row + 1}" for row in rows[missing_names]]
         
-        self.logger.info(f"📍 Successfully loaded {len(polygons)} polygons from {filename}")
-        return polygons
-    
-    def _find_polygon_name(self, row, index: int) -> str:
-        """Find or generate polygon name from row data."""
-        name_fields = [
-            'farm_name', 'plot_code', 'zone_name', 'name', 'field_name', 
-            'NAME', 'FIELD_NAME', 'id', 'ID'
-        ]
+        regions = self._resolve_field_column(source, self.region_fields)
+        missing_regions = regions == None  # noqa: E711 - elementwise comparison
+        if missing_regions.any():
+            centroids = geometry.centroids[missing_regions]
+            regions[missing_regions] = classify_regions_by_centroids(centroids[:, 0], centroids[:, 1])
         
-        name = self._find_field_value(row, name_fields)
-        return name if name else f"Field_{index+1}"
-    
-    def _find_polygon_region(self, row, coords: List[List[float]]) -> str:
-        """Find or classify polygon region from row data."""
-        region_fields = [
-            'zone_name', 'farm_name', 'region', 'zone', 'REGION', 
-            'ZONE', 'area', 'AREA', 'amphoe', 'district'
-        ]
+        attributes = pd.DataFrame({"name": names, "region": regions})
+        
+        # Capture plot_code for matching with field data if available
+        plot_code_column = next((c for c in ('plot_code', 'PLOT_CODE') if c in source.columns), None)
+        if plot_code_column:
+            attributes["plot_code"] = source[plot_code_column].astype(str).to_numpy(dtype=object)
         
-        region = self._find_field_value(row, region_fields)
-        return region if region else classify_region_by_coords(coords)
+        polygons = geometry.with_attributes(attributes)
+        
+        self.logger.info(f"📍 Successfully loaded {len(polygons)} polygons from {filename}")
+        return polygons
 
 
 # Export the loader class
@@ -4,7 +4,6 @@ Generates realistic time series water level data based on well characteristics.
 """
 import numpy as np
 import pandas as pd
-from typing import List
 
 from .base import BaseDataLoader
 from .utils import log_data_summary
@@ -17,6 +16,9 @@ class TimeSeriesLoader(BaseDataLoader):
     def __init__(self, data_dir: str = "geodash/data"):
         super().__init__(data_dir)
         self.months_of_data = 12
+        self.random_seed = 42
+        # Upper bound on wells × months cells materialized per noise chunk
+        self.max_chunk_cells = 4_000_000
     
     def load(self, wells_df: pd.DataFrame = None) -> pd.DataFrame:
         """
@@ -26,7 +28,7 @@ class TimeSeriesLoader(BaseDataLoader):
             wells_df: DataFrame of wells data to generate time series for
             
         Returns:
-            DataFrame with columns: date, well_id, water_level_m
+            DataFrame with columns: date, well_id (categorical), water_level_m (float32)
         """
         if wells_df is None or wells_df.empty:
             self._log_fallback("time series data", "No wells data provided")
@@ -54,124 +56,100 @@ class TimeSeriesLoader(BaseDataLoader):
         """
         Generate realistic time series water level data for wells.
         
+        The full wells × months panel is built from broadcast arrays. Noise is
+        drawn in chunks of wells so temporary memory stays within
+        ``max_chunk_cells`` regardless of the number of wells or months.
+        
         Args:
             wells_df: DataFrame containing well information
             
         Returns:
-            DataFrame with time series water level data
+            Long-format DataFrame with columns date (datetime64), well_id
+            (categorical) and water_level_m (float32), ordered well-major
         """
-        # Generate date range
-        months = pd.date_range(
-            end=pd.Timestamp.today().normalize(),
-            periods=self.months_of_data,
-            freq="MS"
-        )
-        
-        well_ids = wells_df['well_id'].tolist()
-        water_levels_data = []
+        months = self.get_date_range()
+        n_wells, n_months = len(wells_df), len(months)
         
-        for well_id in well_ids:
-            well_info = wells_df[wells_df['well_id'] == well_id].iloc[0]
-            depth = well_info['depth_m']
-            survived = well_info['survived']
-            
-            # Generate time series for this well
-            well_time_series = self._generate_well_time_series(
-                well_id, depth, survived, months
-            )
-            water_levels_data.extend(well_time_series)
+        # Per-well base level and per-month seasonal factor
+        base_levels = self._calculate_base_water_level(
+            wells_df['depth_m'].to_numpy(dtype=np.float64),
+            wells_df['survived'].to_numpy(dtype=bool)
+        )
+        seasonal_factors = self._calculate_seasonal_factor(np.arange(n_months), n_months)
+        
+        # Fill the panel chunk by chunk into a preallocated float32 buffer
+        water_levels = np.empty((n_wells, n_months), dtype=np.float32)
+        chunk_rows = max(1, self.max_chunk_cells // max(n_months, 1))
+        rng = np.random.default_rng(self.random_seed)
+        
+        for start in range(0, n_wells, chunk_rows):
+            stop = min(start + chunk_rows, n_wells)
+            noise = rng.normal(0, 0.2, size=(stop - start, n_months))
+            chunk = base_levels[start:stop, None] * seasonal_factors[None, :] + noise
+            np.maximum(chunk, 0.5, out=chunk)
+            np.round(chunk, 2, out=chunk)
+            water_levels[start:stop] = chunk
+        
+        # Categorical well ids: one code per well repeated across months
+        well_codes, well_categories = pd.factorize(wells_df['well_id'].astype(str))
+        well_ids = pd.Categorical.from_codes(
+            np.repeat(well_codes.astype(np.int32), n_months),
+            categories=well_categories
+        )
         
-        return pd.DataFrame(water_levels_data)
+        return pd.DataFrame({
+            'date': np.tile(months.to_numpy(dtype='datetime64[ns]'), n_wells),
+            'well_id': well_ids,
+            'water_level_m': water_levels.ravel(),
+        })
     
-    def _generate_well_time_series(
-        self, 
-        well_id: str, 
-        depth: float, 
-        survived: bool, 
-        dates: pd.DatetimeIndex
-    ) -> List[dict]:
+    def _calculate_base_water_level(self, depth, survived):
         """
-        Generate time series data for a single well.
+        Calculate base water level based on well characteristics.
         
         Args:
-            well_id: Well identifier
-            depth: Well depth in meters
-            survived: Whether the well is successful
-            dates: Date range for time series
+            depth: Well depth in meters (scalar or array)
+            survived: Whether the well is successful (scalar or array)
             
         Returns:
-            List of time series records
+            Base water level in meters (same shape as inputs)
         """
-        # Base water level depends on depth and survival status
-        base_level = self._calculate_base_water_level(depth, survived)
+        depth = np.asarray(depth, dtype=np.float64)
         
-        time_series = []
+        # Successful wells have decent water levels; deeper wells might have
+        # more stable water sources
+        successful_level = np.maximum(2.0, depth * 0.05)
         
-        for i, date in enumerate(dates):
-            # Add seasonal variation (annual cycle)
-            seasonal_factor = self._calculate_seasonal_factor(i, len(dates))
-            
-            # Add random noise
-            noise = np.random.normal(0, 0.2)
-            
-            # Calculate final water level
-            water_level = max(0.5, base_level * seasonal_factor + noise)
-            
-            time_series.append({
-                'date': date,
-                'well_id': well_id,
-                'water_level_m': round(water_level, 2)
-            })
-        
-        return time_series
-    
-    def _calculate_base_water_level(self, depth: float, survived: bool) -> float:
-        """
-        Calculate base water level based on well characteristics.
+        # Variation based on depth optimality
+        optimal = (depth >= 80) & (depth <= 150)
+        very_deep = depth > 200
+        successful_level = np.where(optimal, successful_level * 1.2, successful_level)
+        successful_level = np.where(very_deep, successful_level * 0.8, successful_level)
         
-        Args:
-            depth: Well depth in meters
-            survived: Whether the well is successful
-            
-        Returns:
-            Base water level in meters
-        """
-        if survived:
-            # Successful wells have decent water levels
-            # Deeper wells might have more stable water sources
-            base_level = max(2.0, depth * 0.05)
-            
-            # Add some variation based on depth optimality
-            if 80 <= depth <= 150:  # Optimal depth range
-                base_level *= 1.2
-            elif depth > 200:  # Very deep wells might have lower levels
-                base_level *= 0.8
-                
-        else:
-            # Failed wells have consistently low water levels
-            base_level = max(1.0, depth * 0.02)
+        # Failed wells have consistently low water levels
+        failed_level = np.maximum(1.0, depth * 0.02)
         
-        return base_level
+        return np.where(np.asarray(survived, dtype=bool), successful_level, failed_level)
     
-    def _calculate_seasonal_factor(self, month_index: int, total_months: int) -> float:
+    def _calculate_seasonal_factor(self, month_index, total_months: int):
         """
         Calculate seasonal variation factor.
         
         Args:
-            month_index: Current month index (0-based)
+            month_index: Month index (0-based, scalar or array)
             total_months: Total number of months in the series
             
         Returns:
-            Seasonal multiplication factor
+            Seasonal multiplication factor (same shape as month_index)
         """
         # Create annual cycle with peak in rainy season (around month 6-8)
-        seasonal_phase = 2 * np.pi * month_index / 12
+        seasonal_phase = 2 * np.pi * np.asarray(month_index) / 12
         
         # Rainy season has higher water levels
         # Dry season (months 2-4) has lower levels
         seasonal_factor = 1 + 0.3 * np.sin(seasonal_phase + np.pi/3)
         
-        return max(0.5, seasonal_factor)  # Ensure it doesn't go too low
+        return np.maximum(0.5, seasonal_factor)  # Ensure it doesn't go too low
     
     def get_date_range(self) -> pd.DatetimeIndex:
         """
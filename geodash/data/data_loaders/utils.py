@@ -3,6 +3,7 @@ Shared utilities for data loaders.
 Common functions used across multiple loaders.
 """
 import json
+from collections.abc import Sequence
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -41,33 +42,82 @@ def classify_region_by_coords(coords: List[List[float]]) -> str:
         return "Unknown"
 
 
-def extract_geojson_coordinates(geometry: Dict[str, Any]) -> List[List[float]]:
+def classify_regions_by_centroids(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ``classify_region_by_coords`` for precomputed centroids.
+    
+    Args:
+        lat: Array of centroid latitudes
+        lon: Array of centroid longitudes
+        
+    Returns:
+        Object array of region names
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    
+    return np.select(
+        [lat > 16.0, lon > 100.5, lat < 15.0, np.isfinite(lat) & np.isfinite(lon)],
+        ["North", "East", "South", "Central"],
+        default="Unknown"
+    ).astype(object)
+
+
+def extract_geojson_rings(geometry: Dict[str, Any]) -> List[List[List[List[float]]]]:
     """
-    Extract coordinates from GeoJSON geometry.
+    Extract every part and ring from a GeoJSON Polygon or MultiPolygon.
     
     Args:
         geometry: GeoJSON geometry dictionary
         
     Returns:
-        List of [lat, lon] coordinate pairs
+        List of parts; each part is a list of rings (exterior first, then
+        holes) and each ring a list of [lat, lon] pairs without the closing
+        vertex
     """
     try:
         geom_type = geometry.get('type')
         coordinates = geometry.get('coordinates', [])
         
         if geom_type == 'Polygon':
-            if coordinates and len(coordinates[0]) > 0:
-                return [[float(coord[1]), float(coord[0])] for coord in coordinates[0][:-1]]
-        
+            polygons = [coordinates]
         elif geom_type == 'MultiPolygon':
-            if coordinates and len(coordinates[0]) > 0 and len(coordinates[0][0]) > 0:
-                return [[float(coord[1]), float(coord[0])] for coord in coordinates[0][0][:-1]]
+            polygons = coordinates
+        else:
+            return []
+        
+        parts = []
+        for polygon in polygons:
+            rings = []
+            for ring in polygon:
+                ring = np.asarray(ring, dtype=np.float64).reshape(-1, 2)
+                if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+                    ring = ring[:-1]
+                rings.append(ring[:, ::-1].tolist())  # (lon, lat) -> (lat, lon)
+            if rings and rings[0]:
+                parts.append(rings)
+        
+        return parts
         
     except Exception as e:
         print(f"⚠️  Error extracting GeoJSON coordinates: {e}")
         return []
+
+
+def extract_geojson_coordinates(geometry: Dict[str, Any]) -> List[List[float]]:
+    """
+    Extract the outer ring of the first part of a GeoJSON geometry.
     
-    return []
+    Use ``extract_geojson_rings`` when all parts and holes are needed.
+    
+    Args:
+        geometry: GeoJSON geometry dictionary
+        
+    Returns:
+        List of [lat, lon] coordinate pairs
+    """
+    parts = extract_geojson_rings(geometry)
+    return parts[0][0] if parts else []
 
 
 def load_geojson_file(file_path: Path) -> List[Dict[str, Any]]:
@@ -78,7 +128,8 @@ def load_geojson_file(file_path: Path) -> List[Dict[str, Any]]:
         file_path: Path to GeoJSON file
         
     Returns:
-        List of polygon dictionaries
+        List of polygon dictionaries; ``coordinates`` holds the outer ring of
+        the first part and ``rings`` every part and hole
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -92,8 +143,9 @@ def load_geojson_file(file_path: Path) -> List[Dict[str, Any]]:
             properties = feature.get('properties', {})
             
             if geometry.get('type') in ['Polygon', 'MultiPolygon']:
-                coords = extract_geojson_coordinates(geometry)
-                if coords:
+                rings = extract_geojson_rings(geometry)
+                if rings:
+                    coords = rings[0][0]
                     name = properties.get('name', properties.get('field_name', 
                            properties.get('id', f"Field_{i+1}")))
                     region = properties.get('region', properties.get('zone', 
@@ -102,7 +154,8 @@ def load_geojson_file(file_path: Path) -> List[Dict[str, Any]]:
                     polygons.append({
                         "name": str(name),
                         "region": str(region),
-                        "coordinates": coords
+                        "coordinates": coords,
+                        "rings": rings
                     })
         
         return polygons
@@ -187,6 +240,30 @@ def validate_polygon_coordinates(coords: List[List[float]]) -> bool:
     return True
 
 
+def validate_polygon_buffers(coords: np.ndarray, ring_offsets: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ``validate_polygon_coordinates`` over a flat coordinate buffer.
+    
+    Args:
+        coords: Array of shape (n_vertices, 2) holding [lat, lon] pairs
+        ring_offsets: Ring offsets of length n_rings + 1
+        
+    Returns:
+        Boolean array with one entry per ring
+    """
+    counts = np.diff(ring_offsets)
+    in_bounds = (
+        (coords[:, 0] >= -90) & (coords[:, 0] <= 90) &
+        (coords[:, 1] >= -180) & (coords[:, 1] <= 180)
+    )
+    
+    # Count out-of-bounds vertices per ring
+    ring_index = np.repeat(np.arange(len(counts)), counts)
+    invalid_per_ring = np.bincount(ring_index, weights=~in_bounds, minlength=len(counts))
+    
+    return (counts >= 3) & (invalid_per_ring == 0)
+
+
 def generate_well_id_if_missing(df: pd.DataFrame, id_column: str = 'well_id', prefix: str = 'WELL') -> pd.DataFrame:
     """
     Generate well IDs for rows that are missing them.
@@ -312,7 +389,7 @@ def log_data_summary(data_type: str, count: int, sample_data: Any = None, source
                 lat_range = f"{sample_data['lat'].min():.3f}-{sample_data['lat'].max():.3f}"
                 lon_range = f"{sample_data['lon'].min():.3f}-{sample_data['lon'].max():.3f}"
                 print(f"📍 Coordinate range: Lat {lat_range}, Lon {lon_range}")
-        elif isinstance(sample_data, list) and len(sample_data) > 0:
+        elif isinstance(sample_data, Sequence) and len(sample_data) > 0:
             print(f"📋 Sample keys: {list(sample_data[0].keys()) if sample_data[0] else 'N/A'}")
 
 
@@ -320,10 +397,13 @@ def log_data_summary(data_type: str, count: int, sample_data: Any = None, source
 __all__ = [
     "classify_region_by_coords",
     "extract_geojson_coordinates", 
+    "extract_geojson_rings",
     "load_geojson_file",
     "clean_dataframe_columns",
     "convert_coordinates_to_numeric",
     "validate_polygon_coordinates",
+    "validate_polygon_buffers",
+    "classify_regions_by_centroids",
     "generate_well_id_if_missing",
     "calculate_data_bounds",
     "generate_realistic_depths",
@@ -1,21 +1,35 @@
 """
 Water stations data loader for survival rate analysis.
 """
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+import time
+
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
-import logging
 
 from .base import BaseDataLoader
 
+DEFAULT_CSV_PATH = "geodash/data/survival_data/badan_survival.csv"
+
 
 class WaterStationsLoader(BaseDataLoader):
     """Loader for water stations survival data from CSV files."""
     
-    def __init__(self, csv_path: str = "geodash/data/survival_data/badan_survival.csv"):
+    # Low-cardinality text columns stored as pandas categoricals
+    CATEGORICAL_COLUMNS = [
+        'village', 'subdistrict', 'district', 'province',
+        'groundwater_basin', 'groundwater_level', 'aquifer_formation', 'formation_code',
+    ]
+    
+    def __init__(self, csv_path: str = DEFAULT_CSV_PATH):
         super().__init__()
         self.csv_path = csv_path
         self.logger = logging.getLogger(__name__)
+        self._data: Optional[Dict[str, Any]] = None
+        self._repository: Optional["StationRepository"] = None
         
     def load(self, **kwargs) -> Dict[str, Any]:
         """Load water stations data (implementation of abstract method)."""
@@ -27,18 +41,27 @@ class WaterStationsLoader(BaseDataLoader):
         return {
             "stations_df": pd.DataFrame(),
             "survival_years": [],
+            "survival_long": pd.DataFrame(columns=["station_id", "well_number", "row", "year", "survival_rate"]),
+            "survival_by_year": pd.Series(dtype=np.float64),
             "stations_summary": {}
         }
     
     def load_data(self, **kwargs) -> Dict[str, Any]:
         """
-        Load water stations data from CSV.
+        Load water stations data from CSV (read once per loader instance).
         
         Returns:
             Dictionary containing:
-            - stations_df: DataFrame with station information
+            - stations_df: DataFrame with station information and
+              latest_survival (no year columns)
             - survival_years: List of years with survival data
+            - survival_long: Long table (station_id, well_number, row, year, survival_rate)
+            - survival_by_year: Average survival rate per year
+            - stations_summary: Totals, provinces, year range and avg_survival_by_year
         """
+        if self._data is not None:
+            return self._data
+        
         try:
             # Read the CSV file
             df = pd.read_csv(self.csv_path)
@@ -72,15 +95,10 @@ class WaterStationsLoader(BaseDataLoader):
             df = df.rename(columns=existing_columns)
             
             # Get survival years (columns that are years)
-            year_columns = []
-            for col in df.columns:
-                try:
-                    if str(col).isdigit() and 2000 <= int(col) <= 2030:
-                        year_columns.append(int(col))
-                except (ValueError, TypeError):
-                    continue
-            
-            year_columns.sort()
+            year_columns = sorted(
+                int(col) for col in df.columns
+                if str(col).isdigit() and 2000 <= int(col) <= 2030
+            )
             
             # Convert numeric columns
             numeric_columns = ['latitude', 'longitude', 'drilling_depth']
@@ -88,38 +106,92 @@ class WaterStationsLoader(BaseDataLoader):
                 if col in df.columns:
                     df[col] = pd.to_numeric(df[col], errors='coerce')
             
-            # Convert survival data columns to numeric
-            for year in year_columns:
-                if str(year) in df.columns:
-                    df[str(year)] = pd.to_numeric(df[str(year)], errors='coerce')
-            
             # Remove rows with missing coordinates
             initial_count = len(df)
-            df = df.dropna(subset=['latitude', 'longitude'])
+            df = df.dropna(subset=['latitude', 'longitude']).reset_index(drop=True)
             if len(df) < initial_count:
                 self.logger.warning(f"⚠️ Dropped {initial_count - len(df)} records with missing coordinates")
             
+            # Administrative and geology labels repeat across wells: store as categories
+            for col in self.CATEGORICAL_COLUMNS:
+                if col in df.columns:
+                    df[col] = df[col].astype('category')
+            
+            # Move the wide year columns into the long survival table
+            survival_long = self._melt_survival(df, year_columns)
+            df = df.drop(columns=[str(year) for year in year_columns])
+            df['latest_survival'] = self._latest_survival(survival_long, len(df))
+            survival_by_year = self._aggregate_by_year(survival_long, year_columns)
+            
             # Create station summary info
-            stations_summary = self._create_stations_summary(df, year_columns)
+            stations_summary = self._create_stations_summary(df, year_columns, survival_by_year)
             
             self.logger.info(f"✅ Successfully processed {len(df)} water station records")
-            self.logger.info(f"📅 Survival data available for years: {year_columns}")
+            self.logger.info(f"📅 Survival data available for years: {year_columns} ({len(survival_long):,} station-years)")
             
-            return {
+            self._data = {
                 "stations_df": df,
                 "survival_years": year_columns,
+                "survival_long": survival_long,
+                "survival_by_year": survival_by_year,
                 "stations_summary": stations_summary
             }
+            return self._data
             
         except Exception as e:
             self.logger.error(f"❌ Error loading water stations data: {str(e)}")
-            return {
-                "stations_df": pd.DataFrame(),
-                "survival_years": [],
-                "stations_summary": {}
-            }
+            return self._load_fallback_data()
     
-    def _create_stations_summary(self, df: pd.DataFrame, year_columns: List[int]) -> Dict[str, Any]:
+    def _melt_survival(self, df: pd.DataFrame, year_columns: List[int]) -> pd.DataFrame:
+        """
+        Melt the wide year columns into a long survival table.
+        
+        Args:
+            df: Stations table with one "YYYY" column per survival year
+            year_columns: Survival years present in the table
+            
+        Returns:
+            DataFrame with station_id and well_number (categorical), row
+            (int32 position in ``df``), year (int16) and survival_rate
+            (float32); years without data are dropped
+        """
+        n_rows, n_years = len(df), len(year_columns)
+        
+        # One to_numeric pass over all year cells (row-major: row, then year)
+        values = df[[str(year) for year in year_columns]].to_numpy().ravel()
+        rates = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float32)
+        keep = ~np.isnan(rates)
+        row_index = np.repeat(np.arange(n_rows), n_years)[keep]
+        
+        def codes(column: str) -> pd.Categorical:
+            source = df[column] if column in df.columns else pd.Series([None] * n_rows)
+            categories = pd.Categorical(source.astype(str))
+            return pd.Categorical.from_codes(categories.codes[row_index], categories.categories)
+        
+        return pd.DataFrame({
+            "station_id": codes("station_id"),
+            "well_number": codes("well_number"),
+            "row": row_index.astype(np.int32),
+            "year": np.tile(np.asarray(year_columns, dtype=np.int16), n_rows)[keep],
+            "survival_rate": rates[keep],
+        })
+    
+    def _latest_survival(self, survival_long: pd.DataFrame, n_rows: int) -> np.ndarray:
+        """Survival rate of each station row in its latest year with data (NaN if none)."""
+        latest = np.full(n_rows, np.nan, dtype=np.float32)
+        rows = survival_long["row"].to_numpy()
+        if len(rows):
+            # Rows are melted row-major (year ascending), so a row's last entry is its latest year
+            is_last = np.append(rows[1:] != rows[:-1], True)
+            latest[rows[is_last]] = survival_long["survival_rate"].to_numpy()[is_last]
+        return latest
+    
+    def _aggregate_by_year(self, survival_long: pd.DataFrame, year_columns: List[int]) -> pd.Series:
+        """Average survival rate per year over all wells (0.0 for years without data)."""
+        by_year = survival_long.groupby("year")["survival_rate"].mean().astype(np.float64)
+        return by_year.reindex(year_columns, fill_value=0.0).rename_axis("year")
+    
+    def _create_stations_summary(self, df: pd.DataFrame, year_columns: List[int], survival_by_year: pd.Series) -> Dict[str, Any]:
         """Create summary statistics for water stations."""
         summary = {}
         
@@ -132,18 +204,18 @@ class WaterStationsLoader(BaseDataLoader):
                 'end': max(year_columns) if year_columns else None
             }
             
-            # Calculate average survival rates by year
+            # Average survival rates by year (from the per-year aggregate)
             if year_columns:
-                survival_by_year = {}
-                for year in year_columns:
-                    year_col = str(year)
-                    if year_col in df.columns:
-                        avg_survival = df[year_col].mean()
-                        survival_by_year[year] = avg_survival if not pd.isna(avg_survival) else 0.0
-                summary['avg_survival_by_year'] = survival_by_year
+                summary['avg_survival_by_year'] = {int(year): float(rate) for year, rate in survival_by_year.items()}
         
         return summary
     
+    def repository(self) -> "StationRepository":
+        """Indexed view over this loader's data (built on first use)."""
+        if self._repository is None:
+            self._repository = StationRepository(self.load_data())
+        return self._repository
+    
     def get_station_data(self, station_id: str, well_number: Optional[str] = None) -> pd.DataFrame:
         """
         Get data for a specific station and optionally a specific well.
@@ -155,63 +227,364 @@ class WaterStationsLoader(BaseDataLoader):
         Returns:
             Filtered DataFrame
         """
-        data = self.load_data()
-        df = data["stations_df"]
+        return self.repository().get_station_data(station_id, well_number)
+    
+    def get_survival_data_for_chart(self, station_id: str, well_number: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get survival data formatted for charting.
         
-        if df.empty:
-            return pd.DataFrame()
+        Args:
+            station_id: Station identifier
+            well_number: Well number (optional)
+            
+        Returns:
+            Dictionary with years and survival rates
+        """
+        return self.repository().get_survival_data_for_chart(station_id, well_number)
+
+
+class StationRepository:
+    """
+    Read-only water stations data with an in-memory index.
+    
+    Row positions are grouped once by station_id and by (station_id,
+    well_number), and per-station metadata, well counts, linear trends and
+    summary stats are computed in grouped passes at load time, so
+    per-selection lookups are dictionary hits. Treat all returned objects as
+    read-only: one repository is shared by every session.
+    
+    Survival is also aggregated into cubes of level members (basin,
+    formation, province, ...) by year, see ``query_cube``.
+    """
+    
+    # Cube levels: name -> station columns grouped together with year
+    CUBE_LEVELS = {
+        "basin_formation": ["groundwater_basin", "aquifer_formation"],
+        "basin": ["groundwater_basin"],
+        "formation": ["aquifer_formation"],
+        "province": ["province"],
+        "district": ["province", "district"],
+    }
+    UNKNOWN_LABEL = "Unknown"
+    
+    def __init__(self, data: Dict[str, Any], version: int = 0, fingerprint: Tuple = ()):
+        self.data = data
+        self.version = version
+        self.fingerprint = fingerprint
         
-        # Filter by station
-        if 'station_id' in df.columns:
-            station_data = df[df['station_id'] == station_id]
-        else:
+        self.stations_df: pd.DataFrame = data["stations_df"]
+        self.survival_long: pd.DataFrame = data["survival_long"]
+        self.survival_years: List[int] = data["survival_years"]
+        self.stations_summary: Dict[str, Any] = data["stations_summary"]
+        
+        self._station_rows = self._group_rows(self.stations_df, ["station_id"])
+        self._well_rows = self._group_rows(self.stations_df, ["station_id", "well_number"])
+        self._station_survival_rows = self._group_rows(self.survival_long, ["station_id"])
+        self._well_survival_rows = self._group_rows(self.survival_long, ["station_id", "well_number"])
+        self._wells = {
+            station_id: pd.unique(self.stations_df["well_number"].to_numpy()[rows]).tolist()
+            for station_id, rows in self._station_rows.items()
+        } if "well_number" in self.stations_df.columns else {}
+        self._charts: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        
+        # First row of each station holds its location metadata
+        first_rows = [rows[0] for rows in self._station_rows.values()]
+        self._station_info = dict(zip(self._station_rows, self.stations_df.iloc[first_rows].to_dict("records")))
+        
+        # Trend line and summary stats of every station and well series
+        self._station_trends = self._compute_trends(["station_id"])
+        self._well_trends = self._compute_trends(["station_id", "well_number"])
+        
+        # Survival cubes by basin / formation / administrative area and year
+        self.cubes = self._build_cubes()
+    
+    @staticmethod
+    def _group_rows(df: pd.DataFrame, columns: List[str]) -> Dict[Any, np.ndarray]:
+        """Row positions per value of ``columns``, keyed by string id(s)."""
+        if df.empty or any(col not in df.columns for col in columns):
+            return {}
+        keys = [df[col].astype(str) for col in columns]
+        indices = pd.Series(np.arange(len(df))).groupby(keys, sort=False, observed=True).indices
+        return {key: np.asarray(rows) for key, rows in indices.items()}
+    
+    def _compute_trends(self, columns: List[str]) -> Dict[Any, Dict[str, float]]:
+        """
+        Fit a least-squares line to every group's yearly survival series at once.
+        
+        The series are the per-year means charted by get_survival_data_for_chart.
+        Slopes come from per-group centered sums, matching ``np.polyfit(deg=1)``.
+        
+        Args:
+            columns: Grouping columns of survival_long
+            
+        Returns:
+            Dict keyed like the row index with slope, intercept, mean, min,
+            max, first, last, change and n_years
+        """
+        if self.survival_long.empty:
+            return {}
+        
+        series = (
+            self.survival_long.groupby(columns + ["year"], observed=True, sort=True)["survival_rate"]
+            .mean().astype(np.float64).reset_index()
+        )
+        series["x"] = series["year"].astype(np.float64)
+        groups = series.groupby(columns, observed=True, sort=False)
+        
+        dx = series["x"] - groups["x"].transform("mean")
+        dy = series["survival_rate"] - groups["survival_rate"].transform("mean")
+        series["sxy"], series["sxx"] = dx * dy, dx * dx
+        
+        stats = groups.agg(
+            x_mean=("x", "mean"),
+            sxy=("sxy", "sum"),
+            sxx=("sxx", "sum"),
+            mean=("survival_rate", "mean"),
+            min=("survival_rate", "min"),
+            max=("survival_rate", "max"),
+            first=("survival_rate", "first"),
+            last=("survival_rate", "last"),
+            n_years=("year", "size"),
+        )
+        stats["slope"] = np.where(stats["sxx"] > 0, stats["sxy"] / stats["sxx"].where(stats["sxx"] > 0, 1.0), 0.0)
+        stats["intercept"] = stats["mean"] - stats["slope"] * stats["x_mean"]
+        stats["change"] = stats["last"] - stats["first"]
+        return stats.drop(columns=["x_mean", "sxy", "sxx"]).to_dict("index")
+    
+    def _build_cubes(self) -> Dict[str, pd.DataFrame]:
+        """
+        Aggregate survival by every cube level and year with vectorized groupbys.
+        
+        Station attributes are gathered onto survival rows through their
+        categorical codes (``row`` points into stations_df); missing labels
+        become UNKNOWN_LABEL so those wells still count.
+        
+        Returns:
+            Dict of level name -> DataFrame with the level columns, label
+            (columns joined with " / "), year, mean_survival, min_survival,
+            max_survival, n_wells and n_stations, sorted by label and year
+        """
+        if self.survival_long.empty or "row" not in self.survival_long.columns:
+            return {}
+        
+        rows = self.survival_long["row"].to_numpy()
+        base = self.survival_long[["station_id", "year", "survival_rate"]].copy()
+        for column in sorted({col for columns in self.CUBE_LEVELS.values() for col in columns}):
+            if column not in self.stations_df.columns:
+                continue
+            labels = self.stations_df[column].astype("category")
+            if self.UNKNOWN_LABEL not in labels.cat.categories:
+                labels = labels.cat.add_categories(self.UNKNOWN_LABEL)
+            labels = labels.fillna(self.UNKNOWN_LABEL)
+            base[column] = pd.Categorical.from_codes(labels.cat.codes.to_numpy()[rows], labels.cat.categories)
+        
+        cubes = {}
+        for level, columns in self.CUBE_LEVELS.items():
+            if any(col not in base.columns for col in columns):
+                continue
+            cube = base.groupby(columns + ["year"], observed=True, sort=True).agg(
+                mean_survival=("survival_rate", "mean"),
+                min_survival=("survival_rate", "min"),
+                max_survival=("survival_rate", "max"),
+                n_wells=("survival_rate", "size"),
+                n_stations=("station_id", "nunique"),
+            ).reset_index()
+            cube["mean_survival"] = cube["mean_survival"].astype(np.float64)
+            
+            label = cube[columns[0]].astype(str)
+            for col in columns[1:]:
+                label = label + " / " + cube[col].astype(str)
+            cube.insert(len(columns), "label", label.astype("category"))
+            cubes[level] = cube
+        return cubes
+    
+    def cube_labels(self, level: str) -> List[str]:
+        """
+        Members of a cube level, most wells first.
+        
+        Args:
+            level: Key of CUBE_LEVELS
+            
+        Returns:
+            Labels ordered by their largest yearly well count
+        """
+        cube = self.cubes.get(level)
+        if cube is None:
+            return []
+        wells = cube.groupby("label", observed=True)["n_wells"].max()
+        return wells.sort_values(ascending=False, kind="stable").index.astype(str).tolist()
+    
+    def query_cube(
+        self,
+        level: str,
+        labels: Optional[List[str]] = None,
+        where: Optional[Dict[str, List[str]]] = None,
+        years: Optional[Tuple[int, int]] = None
+    ) -> pd.DataFrame:
+        """
+        Slice a precomputed survival cube.
+        
+        Args:
+            level: Key of CUBE_LEVELS
+            labels: Keep only these members (see cube_labels)
+            where: Keep rows whose level column is in the given values, e.g.
+                ``{"groundwater_basin": ["เจ้าพระยาตอนล่าง"]}``
+            years: Inclusive (first, last) year range
+            
+        Returns:
+            Matching cube rows (empty DataFrame for an unknown level)
+        """
+        cube = self.cubes.get(level)
+        if cube is None:
             return pd.DataFrame()
         
-        # Filter by well number if specified
-        if well_number and 'well_number' in df.columns:
-            station_data = station_data[station_data['well_number'] == well_number]
+        mask = np.ones(len(cube), dtype=bool)
+        if labels is not None:
+            mask &= cube["label"].isin(labels).to_numpy()
+        for column, values in (where or {}).items():
+            if column in cube.columns:
+                mask &= cube[column].isin(values).to_numpy()
+        if years is not None:
+            mask &= cube["year"].between(years[0], years[1]).to_numpy()
+        return cube[mask]
+    
+    @property
+    def station_ids(self) -> List[str]:
+        """Station identifiers in file order."""
+        return list(self._station_rows)
+    
+    def wells(self, station_id: str) -> List[str]:
+        """Well numbers of a station in file order."""
+        return self._wells.get(str(station_id), [])
+    
+    def well_count(self, station_id: str) -> int:
+        """Number of well rows of a station."""
+        rows = self._station_rows.get(str(station_id))
+        return 0 if rows is None else len(rows)
+    
+    def station_info(self, station_id: str) -> Dict[str, Any]:
+        """Metadata (first row) of a station, or an empty dict if unknown."""
+        return self._station_info.get(str(station_id), {})
+    
+    def get_trend(self, station_id: str, well_number: Optional[str] = None) -> Optional[Dict[str, float]]:
+        """
+        Precomputed trend line and summary stats of a station or well series.
         
-        return station_data
+        Returns:
+            Dict with slope, intercept (survival = slope * year + intercept),
+            mean, min, max, first, last, change and n_years; None without data
+        """
+        if well_number:
+            return self._well_trends.get((str(station_id), str(well_number)))
+        return self._station_trends.get(str(station_id))
+    
+    def get_station_data(self, station_id: str, well_number: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get the station rows for a station and optionally a single well.
+        
+        Args:
+            station_id: Station identifier
+            well_number: Well number (optional)
+            
+        Returns:
+            Filtered DataFrame (empty if unknown)
+        """
+        if well_number:
+            rows = self._well_rows.get((str(station_id), str(well_number)))
+        else:
+            rows = self._station_rows.get(str(station_id))
+        if rows is None:
+            return self.stations_df.iloc[0:0]
+        return self.stations_df.iloc[rows]
     
     def get_survival_data_for_chart(self, station_id: str, well_number: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get survival data formatted for charting.
+        Get the yearly survival series for a station or well (memoized).
         
         Args:
             station_id: Station identifier
             well_number: Well number (optional)
             
         Returns:
-            Dictionary with years and survival rates
+            Dictionary with years, survival_rates, trend (see get_trend) and
+            station_info, or an error
         """
-        station_data = self.get_station_data(station_id, well_number)
+        key = (str(station_id), str(well_number) if well_number else None)
+        chart = self._charts.get(key)
+        if chart is not None:
+            return chart
         
+        station_data = self.get_station_data(station_id, well_number)
         if station_data.empty:
             return {"years": [], "survival_rates": [], "error": "No data found"}
         
-        data = self.load_data()
-        year_columns = data["survival_years"]
-        
-        # Get survival data
-        years = []
-        survival_rates = []
-        
-        for year in year_columns:
-            year_col = str(year)
-            if year_col in station_data.columns:
-                # If multiple wells, take the average
-                avg_rate = station_data[year_col].mean()
-                if not pd.isna(avg_rate):
-                    years.append(year)
-                    survival_rates.append(float(avg_rate))
+        # Average over the selected wells per year (duplicated rows included)
+        if well_number:
+            rows = self._well_survival_rows.get(key, np.empty(0, dtype=np.intp))
+        else:
+            rows = self._station_survival_rows.get(key[0], np.empty(0, dtype=np.intp))
+        rates = self.survival_long.iloc[rows].groupby("year")["survival_rate"].mean()
         
-        return {
-            "years": years,
-            "survival_rates": survival_rates,
+        chart = {
+            "years": rates.index.astype(int).tolist(),
+            "survival_rates": rates.astype(float).tolist(),
+            "trend": self.get_trend(station_id, well_number),
             "station_info": {
                 "station_id": station_id,
                 "well_number": well_number,
-                "location": station_data['location'].iloc[0] if 'location' in station_data.columns and not station_data.empty else "Unknown",
-                "province": station_data['province'].iloc[0] if 'province' in station_data.columns and not station_data.empty else "Unknown"
+                "location": station_data['location'].iloc[0] if 'location' in station_data.columns else "Unknown",
+                "province": station_data['province'].iloc[0] if 'province' in station_data.columns else "Unknown"
             }
         }
+        self._charts[key] = chart
+        return chart
+
+
+# Process-wide repository, shared by all Streamlit sessions
+_repositories: Dict[str, StationRepository] = {}
+_repositories_checked_at: Dict[str, float] = {}
+_repositories_lock = Lock()
+
+
+def _csv_fingerprint(csv_path: str) -> Tuple:
+    """(mtime, size) of the CSV, or () when it is missing."""
+    try:
+        stat = Path(csv_path).stat()
+    except OSError:
+        return ()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_station_repository(csv_path: str = DEFAULT_CSV_PATH, min_check_interval_s: float = 5.0) -> StationRepository:
+    """
+    Get the process-wide station repository, reloading it when the CSV changes.
+    
+    The CSV is stat'ed at most once per ``min_check_interval_s``; a changed
+    file is loaded into a new repository with a higher ``version``.
+    
+    Args:
+        csv_path: Survival CSV path
+        min_check_interval_s: Minimum seconds between file fingerprint checks
+        
+    Returns:
+        Shared read-only StationRepository
+    """
+    with _repositories_lock:
+        repository = _repositories.get(csv_path)
+        now = time.monotonic()
+        if repository is not None and now - _repositories_checked_at.get(csv_path, 0.0) < min_check_interval_s:
+            return repository
+        
+        fingerprint = _csv_fingerprint(csv_path)
+        if repository is None or repository.fingerprint != fingerprint:
+            version = repository.version + 1 if repository is not None else 1
+            repository = StationRepository(WaterStationsLoader(csv_path).load_data(), version, fingerprint)
+            _repositories[csv_path] = repository
+            logging.getLogger(__name__).info(f"🔄 Station repository v{version} ({len(repository.station_ids)} stations)")
+        
+        _repositories_checked_at[csv_path] = now
+        return repository
+
+
+# Export the loader and the shared repository
+__all__ = ["WaterStationsLoader", "StationRepository", "get_station_repository"]
@@ -0,0 +1,258 @@
+"""
+Well success-probability surface from kernel density estimates.
+Survived and total well counts are binned onto a regular lat/lon grid and
+smoothed with a Gaussian kernel applied by FFT convolution (NumPy only). The
+resulting raster drives the groundwater heatmap and is looked up by
+generate_potential_wells.
+"""
+from dataclasses import dataclass
+from typing import Hashable, Optional, Tuple
+import math
+
+import numpy as np
+import pandas as pd
+
+from .cache import cached_by_key
+
+# Grid defaults: cell size and Gaussian bandwidth in meters, cell budget
+# (coarser cells for larger extents), heatmap point budget and prior
+# strength in well-equivalents
+DEFAULT_CELL_M = 250.0
+DEFAULT_BANDWIDTH_M = 1500.0
+MAX_CELLS = 1_000_000
+MAX_HEAT_POINTS = 20_000
+PRIOR_STRENGTH = 1.0
+METERS_PER_DEG_LAT = 111_320.0
+
+
+def _fft_size(n: int) -> int:
+    """Smallest 2^a 3^b 5^c >= n (fast FFT length)."""
+    best = 1 << max(n - 1, 0).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            size = power35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def gaussian_smooth_fft(grid: np.ndarray, sigma_cells: Tuple[float, float]) -> np.ndarray:
+    """
+    Convolve a 2-D grid with an unnormalized Gaussian (peak 1) via FFT.
+
+    The kernel is separable, so each axis is convolved with a 1-D real FFT.
+    Inputs are zero-padded past the kernel radius, so nothing wraps around
+    the grid edges.
+
+    Args:
+        grid: 2-D array (rows = latitude, columns = longitude)
+        sigma_cells: Kernel standard deviation in cells along (rows, columns)
+
+    Returns:
+        Smoothed grid (float64, same shape)
+    """
+    out = np.asarray(grid, dtype=np.float64)
+    for axis, sigma in enumerate(sigma_cells):
+        if sigma <= 0:
+            continue
+        radius = int(math.ceil(4 * sigma))
+        n = out.shape[axis]
+        size = _fft_size(n + 2 * radius)
+
+        offsets = np.arange(-radius, radius + 1)
+        kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+        kernel_fft = np.fft.rfft(kernel, size)
+
+        shape = [1] * out.ndim
+        shape[axis] = -1
+        full = np.fft.irfft(np.fft.rfft(out, size, axis=axis) * kernel_fft.reshape(shape), size, axis=axis)
+        # Full convolution index i is centered on input index i - radius
+        out = np.take(full, np.arange(radius, radius + n), axis=axis)
+    return out
+
+
+@dataclass
+class SuccessSurface:
+    """
+    Smoothed well success probability on a regular lat/lon grid.
+
+    Cell (i, j) covers latitudes lat0 + i * dlat .. + dlat and longitudes
+    lon0 + j * dlon .. + dlon.
+    """
+    lat0: float
+    lon0: float
+    dlat: float
+    dlon: float
+    probability: np.ndarray  # float32 (rows, cols): shrunk towards prior
+    support: np.ndarray      # float32 (rows, cols): kernel-weighted well count
+    prior: float             # Overall success rate
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.probability.shape
+
+    def lookup(self, lat, lon) -> np.ndarray:
+        """
+        Success probability at points (prior outside the grid).
+
+        Args:
+            lat: Latitude(s)
+            lon: Longitude(s)
+
+        Returns:
+            float64 array broadcast from the inputs
+        """
+        lat, lon = np.broadcast_arrays(np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+        rows = np.floor((lat - self.lat0) / self.dlat).astype(np.int64)
+        cols = np.floor((lon - self.lon0) / self.dlon).astype(np.int64)
+        inside = (rows >= 0) & (rows < self.shape[0]) & (cols >= 0) & (cols < self.shape[1])
+
+        values = np.full(lat.shape, self.prior, dtype=np.float64)
+        values[inside] = self.probability[rows[inside], cols[inside]]
+        return values
+
+    def to_heat_points(self, min_support: float = 0.05, max_points: int = MAX_HEAT_POINTS) -> np.ndarray:
+        """
+        Heatmap points at cell centers where there are wells nearby.
+
+        The weight is the success probability faded by the local support, so
+        areas without wells do not light up at the prior. The surface is
+        smooth over several cells, so it is subsampled on a regular stride
+        to stay within ``max_points``.
+
+        Args:
+            min_support: Minimum kernel-weighted well count of emitted cells
+            max_points: Point budget
+
+        Returns:
+            (n, 3) array of [lat, lon, weight]
+        """
+        mask = self.support >= min_support
+        stride = max(1, math.ceil(math.sqrt(np.count_nonzero(mask) / max_points)))
+        if stride > 1:
+            sampled = np.zeros_like(mask)
+            sampled[::stride, ::stride] = mask[::stride, ::stride]
+            mask = sampled
+        rows, cols = np.nonzero(mask)
+        weight = self.probability[rows, cols] * np.minimum(self.support[rows, cols], 1.0)
+        return np.column_stack([
+            self.lat0 + (rows + 0.5) * self.dlat,
+            self.lon0 + (cols + 0.5) * self.dlon,
+            weight.astype(np.float64),
+        ])
+
+
+def compute_success_surface(
+    wells_df: pd.DataFrame,
+    cell_m: float = DEFAULT_CELL_M,
+    bandwidth_m: float = DEFAULT_BANDWIDTH_M,
+    prior_strength: float = PRIOR_STRENGTH,
+    max_cells: int = MAX_CELLS,
+) -> Optional[SuccessSurface]:
+    """
+    Estimate the well success probability surface from well outcomes.
+
+    probability = (K * survived + a * prior) / (K * wells + a), where K * x
+    is the Gaussian-smoothed count grid and a the prior strength, so cells
+    far from any well fall back to the overall success rate. The grid covers
+    the wells plus three bandwidths; cells are enlarged when the extent would
+    need more than ``max_cells``. The result is deterministic.
+
+    Args:
+        wells_df: Wells with lat, lon and survived columns
+        cell_m: Target grid cell size in meters
+        bandwidth_m: Gaussian kernel standard deviation in meters
+        prior_strength: Weight of the overall rate, in wells
+        max_cells: Grid cell budget
+
+    Returns:
+        SuccessSurface, or None without wells
+    """
+    if wells_df is None or wells_df.empty or not {"lat", "lon", "survived"} <= set(wells_df.columns):
+        return None
+
+    lat = wells_df["lat"].to_numpy(dtype=np.float64)
+    lon = wells_df["lon"].to_numpy(dtype=np.float64)
+    survived = wells_df["survived"].to_numpy(dtype=np.float64)
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    lat, lon, survived = lat[valid], lon[valid], survived[valid]
+    if len(lat) == 0:
+        return None
+
+    # Meters -> degrees at the mid latitude; enlarge cells to fit the budget
+    meters_per_deg_lon = METERS_PER_DEG_LAT * max(math.cos(math.radians(float(np.mean(lat)))), 0.1)
+    margin_m = 3 * bandwidth_m
+    extent_lat_m = (lat.max() - lat.min()) * METERS_PER_DEG_LAT + 2 * margin_m
+    extent_lon_m = (lon.max() - lon.min()) * meters_per_deg_lon + 2 * margin_m
+    cell_m = max(cell_m, math.sqrt(extent_lat_m * extent_lon_m / max_cells))
+
+    dlat, dlon = cell_m / METERS_PER_DEG_LAT, cell_m / meters_per_deg_lon
+    lat0 = lat.min() - margin_m / METERS_PER_DEG_LAT
+    lon0 = lon.min() - margin_m / meters_per_deg_lon
+    n_rows = int(math.ceil(extent_lat_m / cell_m)) + 1
+    n_cols = int(math.ceil(extent_lon_m / cell_m)) + 1
+
+    rows = np.clip(((lat - lat0) / dlat).astype(np.int64), 0, n_rows - 1)
+    cols = np.clip(((lon - lon0) / dlon).astype(np.int64), 0, n_cols - 1)
+    cells = rows * n_cols + cols
+    wells = np.bincount(cells, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+    successes = np.bincount(cells, weights=survived, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+
+    sigma = bandwidth_m / cell_m
+    smoothed_wells = np.maximum(gaussian_smooth_fft(wells, (sigma, sigma)), 0.0)
+    smoothed_successes = np.clip(gaussian_smooth_fft(successes, (sigma, sigma)), 0.0, smoothed_wells)
+
+    prior = float(survived.mean())
+    probability = (smoothed_successes + prior_strength * prior) / (smoothed_wells + prior_strength)
+
+    return SuccessSurface(
+        lat0=float(lat0),
+        lon0=float(lon0),
+        dlat=float(dlat),
+        dlon=float(dlon),
+        probability=probability.astype(np.float32),
+        support=smoothed_wells.astype(np.float32),
+        prior=prior,
+    )
+
+
+def _surface_key(wells_df, state=None, cell_m=DEFAULT_CELL_M, bandwidth_m=DEFAULT_BANDWIDTH_M):
+    return None if state is None else (state, cell_m, bandwidth_m)
+
+
+@cached_by_key(_surface_key, max_entries=16, name="success_surface")
+def get_success_surface(
+    wells_df: pd.DataFrame,
+    state: Optional[Hashable] = None,
+    cell_m: float = DEFAULT_CELL_M,
+    bandwidth_m: float = DEFAULT_BANDWIDTH_M,
+) -> Optional[SuccessSurface]:
+    """
+    Success surface for a (filtered) wells table.
+
+    Cached per ``state`` (the table's filter state, see
+    ``filters.filter_state``); computed uncached without one.
+    """
+    return compute_success_surface(wells_df, cell_m=cell_m, bandwidth_m=bandwidth_m)
+
+
+@cached_by_key(lambda wells_df, state=None: state, max_entries=16, name="success_heat_points")
+def get_success_heat_points(wells_df: pd.DataFrame, state: Optional[Hashable] = None) -> list:
+    """Heatmap points of the success surface for a (filtered) wells table, cached per ``state``."""
+    surface = get_success_surface(wells_df, state)
+    return surface.to_heat_points().tolist() if surface is not None else []
+
+
+# Export the density API
+__all__ = [
+    "SuccessSurface",
+    "gaussian_smooth_fft",
+    "compute_success_surface",
+    "get_success_surface",
+    "get_success_heat_points",
+]
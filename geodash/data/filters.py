@@ -1,9 +1,11 @@
 # geodash/data/filters.py - Updated with distance to farm filter
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 import streamlit as st
 
+from .cache import cached_by_key
+
 
 def sidebar_filters(wells_df: pd.DataFrame) -> Dict[str, object]:
     st.sidebar.header("Filters")
@@ -83,13 +85,36 @@ def sidebar_filters(wells_df: pd.DataFrame) -> Dict[str, object]:
     }
 
 
-def filter_wells(wells_df: pd.DataFrame, filters: Dict[str, object]) -> pd.DataFrame:
+def filter_state(filters: Dict[str, object], data_version: Optional[int]) -> Optional[Tuple]:
+    """
+    Cheap identity of a filtered wells table: data snapshot version plus filters.
+    
+    Keys the per-filter-state caches (filtered wells, success surface, heatmap
+    points and tiles) without hashing the frame itself.
+    
+    Args:
+        filters: Dictionary of filter criteria (hashable values)
+        data_version: Version of the published snapshot the wells come from
+        
+    Returns:
+        Hashable key, or None without a data version (no caching)
+    """
+    if data_version is None:
+        return None
+    return (data_version, tuple(sorted(filters.items())))
+
+
+@cached_by_key(lambda wells_df, filters, data_version=None: filter_state(filters, data_version), max_entries=64, name="filter_wells")
+def filter_wells(wells_df: pd.DataFrame, filters: Dict[str, object], data_version: Optional[int] = None) -> pd.DataFrame:
     """
     Filter wells based on all available criteria including distance to farm.
     
     Args:
         wells_df: DataFrame with wells data
         filters: Dictionary of filter criteria
+        data_version: Version of the published snapshot ``wells_df`` belongs
+            to; results are cached per (version, filters) when given and are
+            shared read-only frames
         
     Returns:
         Filtered DataFrame
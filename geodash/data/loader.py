@@ -5,7 +5,9 @@ Main data loader hub for the geological dashboard.
 Updated to handle farm-based time series and potential drilling locations.
 """
 from pathlib import Path
-from typing import Dict, Union, Optional
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+import time
 import logging
 import pandas as pd
 import numpy as np
@@ -13,10 +15,13 @@ import numpy as np
 from .data_loaders import (
     WellsLoader,
     PolygonsLoader, 
-    FarmsLoader,
-    HeatmapLoader
+    FarmsLoader
 )
+from .density import get_success_surface
 from .mockup import generate_mock_data, generate_potential_wells, calculate_water_demand_gap
+from .polygon_store import PolygonStore
+from . import shared_store
+from ..instrumentation import span
 
 
 # Configure logging
@@ -44,10 +49,30 @@ class DashboardDataLoader:
         self.wells_loader = WellsLoader(data_dir)
         self.polygons_loader = PolygonsLoader(data_dir)
         self.farms_loader = FarmsLoader(data_dir)
-        self.heatmap_loader = HeatmapLoader(data_dir)
+        self.field_csv_path = self.data_dir / "field_water_data" / "field_data.csv"
+        
+        # Current published snapshot and the source fingerprints it was built from
+        self.data: Dict[str, object] = {}
+        self.version = 0
+        self._fingerprints: Dict[str, Tuple] = {}
+        self._max_distance_to_farm_m: Optional[float] = None
         
         logger.info("✅ All specialized loaders initialized")
     
+    # Dataset dependency graph: dataset -> upstream datasets.
+    # Listed in build (topological) order.
+    DATASET_DEPENDENCIES = {
+        "polygons": [],
+        "farm_polygons": [],
+        "field_data_df": [],
+        "wells_df": [],
+        "farm_time_series": ["wells_df"],
+        "potential_wells_df": ["polygons", "wells_df"],
+        "demand_gap_df": ["polygons", "wells_df", "potential_wells_df"],
+        "cost_df": [],
+        "prob_df": [],
+    }
+    
     def load_all_data(self, max_distance_to_farm_m: Optional[float] = None) -> Dict[str, object]:
         """
         Load all dashboard data using specialized loaders.
@@ -61,98 +86,216 @@ class DashboardDataLoader:
         logger.info("🚀 Starting comprehensive data loading process...")
         
         try:
-            # Phase 1: Load core geospatial data
-            logger.info("📍 Phase 1: Loading geospatial data...")
-            polygons = self.polygons_loader.load()
-            farm_polygons = self.farms_loader.load()
-            
-            # Load field water CSV for enrichment
-            field_csv_path = self.data_dir / "field_water_data" / "field_data.csv"
-            try:
-                field_data_df = pd.read_csv(field_csv_path)
-                logger.info(f"✅ Loaded field data CSV: {len(field_data_df)} records")
-            except Exception as e:
-                logger.warning(f"⚠️  Could not load field data CSV: {e}")
-                field_data_df = pd.DataFrame()
-            
-            # Phase 2: Load wells data with distance filtering
-            logger.info("🏔️  Phase 2: Loading wells data...")
-            wells_df = self.wells_loader.load(max_distance_to_farm_m)
-            
-            # Phase 3: Generate derived data based on wells
-            logger.info("📊 Phase 3: Generating derived datasets...")
-            heat_points = self.heatmap_loader.load(wells_df)
-            
-            # Phase 4: Generate farm-based time series
-            logger.info("🚜 Phase 4: Generating farm time series...")
-            farm_time_series = self._generate_farm_time_series(wells_df)
-            
-            # Phase 5: Generate potential drilling locations
-            logger.info("💡 Phase 5: Generating potential drilling locations...")
-            
-            # Use real polygons if available
-            if polygons and len(polygons) > 0:
-                logger.info(f"✅ Using {len(polygons)} real field polygons for potential wells")
-                potential_wells_df = generate_potential_wells(
-                    polygons,
-                    wells_df,
-                    num_suggestions=25
-                )
-            else:
-                logger.warning("⚠️  No real polygons available, using mock data")
-                mock_data = generate_mock_data()
-                potential_wells_df = generate_potential_wells(
-                    mock_data["polygons"],
-                    wells_df,
-                    num_suggestions=25
-                )
-            
-            # Calculate water demand gaps
-            if not potential_wells_df.empty:
-                logger.info(f"💧 Calculating water demand gaps...")
-                demand_gap_df = calculate_water_demand_gap(
-                    polygons if polygons else mock_data["polygons"],
-                    wells_df,
-                    potential_wells_df
-                )
-            else:
-                logger.warning("⚠️  No potential wells generated")
-                demand_gap_df = pd.DataFrame()
-            
-            # Load mock cost and probability data
-            mock_data = generate_mock_data()
-            cost_df = mock_data["cost_df"]
-            prob_df = mock_data["prob_df"]
-            
-            # Combine all data
-            data = {
-                "polygons": polygons,
-                "farm_polygons": farm_polygons,
-                "wells_df": wells_df,
-                "farm_time_series": farm_time_series,
-                "heat_points": heat_points,
-                "cost_df": cost_df,
-                "prob_df": prob_df,
-                "field_data_df": field_data_df,
-                "potential_wells_df": potential_wells_df,
-                "demand_gap_df": demand_gap_df,
-            }
+            with span("loader.load_all_data", "loader"):
+                self._build_datasets(max_distance_to_farm_m, force=True)
             
             # Log summary
-            self._log_comprehensive_summary(data)
+            self._log_comprehensive_summary(self.data)
             
             logger.info("🎉 Data loading completed successfully!")
-            return data
+            return dict(self.data)
             
         except Exception as e:
             logger.error(f"❌ Critical error during data loading: {e}")
             import traceback
             traceback.print_exc()
             logger.warning("🔄 Falling back to complete mock dataset...")
-            return self._load_complete_fallback_data(max_distance_to_farm_m)
+            with span("loader.fallback", "loader"):
+                self.data = self._load_complete_fallback_data(max_distance_to_farm_m)
+            self.version += 1
+            return dict(self.data)
+    
+    def refresh(self, max_distance_to_farm_m: Optional[float] = None) -> List[str]:
+        """
+        Incrementally reload datasets whose source files changed on disk.
+        
+        Only the changed source datasets and their downstream derived datasets
+        are recomputed. The new snapshot replaces ``self.data`` atomically, so
+        sessions holding the previous snapshot are never mutated.
+        
+        Args:
+            max_distance_to_farm_m: Maximum distance to farm in meters
+            
+        Returns:
+            Names of the datasets that were rebuilt (empty if nothing changed)
+        """
+        try:
+            with span("loader.refresh", "loader") as record:
+                rebuilt = self._build_datasets(max_distance_to_farm_m)
+                record["rebuilt"] = len(rebuilt)
+        except Exception as e:
+            logger.error(f"❌ Incremental reload failed, keeping version {self.version}: {e}")
+            return []
+        
+        if rebuilt:
+            logger.info(f"🔁 Reloaded {', '.join(rebuilt)} (data version {self.version})")
+        return rebuilt
+    
+    def _build_datasets(self, max_distance_to_farm_m: Optional[float], force: bool = False) -> List[str]:
+        """
+        Rebuild stale datasets in dependency order and publish a new snapshot.
+        
+        Args:
+            max_distance_to_farm_m: Maximum distance to farm in meters
+            force: Rebuild every dataset regardless of fingerprints
+            
+        Returns:
+            Names of the rebuilt datasets
+            
+        Raises:
+            Exception: From a failing dataset builder; the current snapshot is
+                kept and the sources are retried after they change again
+        """
+        self._max_distance_to_farm_m = max_distance_to_farm_m
+        fingerprints = {
+            name: self._source_fingerprint(name, max_distance_to_farm_m)
+            for name in self.DATASET_DEPENDENCIES
+        }
+        
+        data = dict(self.data)
+        rebuilt: List[str] = []
+        
+        try:
+            for name, dependencies in self.DATASET_DEPENDENCIES.items():
+                stale = (
+                    force
+                    or name not in data
+                    or fingerprints[name] != self._fingerprints.get(name)
+                    or any(dep in rebuilt for dep in dependencies)
+                )
+                if stale:
+                    with span(f"loader.{name}", "loader"):
+                        data[name] = getattr(self, f"_build_{name}")(data)
+                    rebuilt.append(name)
+        finally:
+            # Also record a failed attempt, so broken sources are only
+            # retried once their files change again
+            self._fingerprints = fingerprints
+        
+        if rebuilt:
+            self.data = data
+            self.version += 1
+        return rebuilt
+    
+    def _source_files(self, name: str) -> List[Path]:
+        """Files on disk that a source dataset is loaded from."""
+        if name == "polygons":
+            fields_dir = self.polygons_loader.rdc_fields_dir
+            # Every file counts: shapefiles come with .dbf/.shx/.prj sidecars
+            return sorted(p for p in fields_dir.iterdir() if p.is_file()) if fields_dir.exists() else []
+        if name == "farm_polygons":
+            shapefile = self.farms_loader.farms_shapefile
+            return sorted(shapefile.parent.glob(f"{shapefile.stem}.*")) if shapefile.parent.exists() else []
+        if name == "field_data_df":
+            return [self.field_csv_path]
+        if name == "wells_df":
+            return [self.wells_loader.csv_file]
+        return []
+    
+    def _source_fingerprint(self, name: str, max_distance_to_farm_m: Optional[float]) -> Tuple:
+        """
+        Cheap change detector for a dataset: (path, mtime, size) of each source file.
+        
+        Missing files are skipped, so adding or removing a file also changes
+        the fingerprint.
+        """
+        fingerprint = []
+        for path in self._source_files(name):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size))
+        
+        if name == "wells_df":
+            fingerprint.append(("max_distance_to_farm_m", max_distance_to_farm_m))
+        return tuple(fingerprint)
+    
+    # === Dataset builders (one per graph node) ===
+    
+    def _build_polygons(self, data: Dict[str, object]) -> PolygonStore:
+        logger.info("📍 Phase 1: Loading field polygons...")
+        return self.polygons_loader.load()
     
-    def _generate_farm_time_series(self, wells_df) -> pd.DataFrame:
-        """Generate farm-based time series data from wells data."""
+    def _build_farm_polygons(self, data: Dict[str, object]) -> PolygonStore:
+        logger.info("📍 Phase 1: Loading farm polygons...")
+        return self.farms_loader.load()
+    
+    def _build_field_data_df(self, data: Dict[str, object]) -> pd.DataFrame:
+        # Load field water CSV for enrichment
+        try:
+            field_data_df = pd.read_csv(self.field_csv_path)
+            logger.info(f"✅ Loaded field data CSV: {len(field_data_df)} records")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not load field data CSV: {e}")
+            field_data_df = pd.DataFrame()
+        return field_data_df
+    
+    def _build_wells_df(self, data: Dict[str, object]) -> pd.DataFrame:
+        logger.info("🏔️  Phase 2: Loading wells data...")
+        return self.wells_loader.load(self._max_distance_to_farm_m)
+    
+    def _build_farm_time_series(self, data: Dict[str, object]) -> pd.DataFrame:
+        logger.info("🚜 Phase 3: Generating farm time series...")
+        return self._generate_farm_time_series(data["wells_df"])
+    
+    def _build_potential_wells_df(self, data: Dict[str, object]) -> pd.DataFrame:
+        logger.info("💡 Phase 4: Generating potential drilling locations...")
+        polygons = data["polygons"]
+        
+        # Use real polygons if available
+        if polygons and len(polygons) > 0:
+            logger.info(f"✅ Using {len(polygons)} real field polygons for potential wells")
+        else:
+            logger.warning("⚠️  No real polygons available, using mock data")
+            polygons = generate_mock_data()["polygons"]
+        
+        wells_df = data["wells_df"]
+        return generate_potential_wells(
+            polygons,
+            wells_df,
+            num_suggestions=25,
+            success_surface=get_success_surface(wells_df),
+        )
+    
+    def _build_demand_gap_df(self, data: Dict[str, object]) -> pd.DataFrame:
+        potential_wells_df = data["potential_wells_df"]
+        
+        # Calculate water demand gaps
+        if potential_wells_df.empty:
+            logger.warning("⚠️  No potential wells generated")
+            return pd.DataFrame()
+        
+        logger.info("💧 Calculating water demand gaps...")
+        polygons = data["polygons"]
+        return calculate_water_demand_gap(
+            polygons if polygons else generate_mock_data()["polygons"],
+            data["wells_df"],
+            potential_wells_df
+        )
+    
+    def _build_cost_df(self, data: Dict[str, object]) -> pd.DataFrame:
+        # Mock cost estimation data
+        return generate_mock_data()["cost_df"]
+    
+    def _build_prob_df(self, data: Dict[str, object]) -> pd.DataFrame:
+        # Mock probability data
+        return generate_mock_data()["prob_df"]
+    
+    def _generate_farm_time_series(self, wells_df, months_of_data: int = 24) -> pd.DataFrame:
+        """
+        Generate farm-based time series data from wells data.
+        
+        Builds the full months × regions grid in one pass: per-region base rates
+        come from a single groupby and all random draws are made in batched calls.
+        
+        Args:
+            wells_df: DataFrame of wells data with region and survived columns
+            months_of_data: Number of monthly periods to generate (default: 24)
+            
+        Returns:
+            Long-format DataFrame with one row per region and month
+        """
         try:
             if wells_df.empty:
                 logger.warning("⚠️  No wells data for farm time series")
@@ -160,41 +303,37 @@ class DashboardDataLoader:
             
             rng = np.random.default_rng(42)
             
-            # Generate 24 months of data
-            months = pd.date_range(end=pd.Timestamp.today().normalize(), periods=24, freq="MS")
+            months = pd.date_range(end=pd.Timestamp.today().normalize(), periods=months_of_data, freq="MS")
+            
+            # Per-region base survival rate and well count (first-appearance order)
+            region_stats = wells_df.groupby("region", sort=False)["survived"].agg(["mean", "size"])
+            regions = region_stats.index.to_numpy()
+            base_survival_rate = region_stats["mean"].to_numpy(dtype=float)[:, None]
+            total_wells = region_stats["size"].to_numpy(dtype=np.int64)[:, None]
+            
+            n_regions, n_months = len(regions), len(months)
+            
+            # Rainy season (May-Oct) mask broadcast across regions
+            rainy = ((months.month >= 5) & (months.month <= 10))[None, :]
             
-            # Get unique regions
-            unique_regions = wells_df["region"].unique()
-            farm_time_series_data = []
+            # All random draws for the regions × months grid in batched calls
+            uniform = rng.random((3, n_regions, n_months))
+            noise = rng.normal(0, 0.03, size=(n_regions, n_months))
             
-            for region in unique_regions:
-                region_wells = wells_df[wells_df["region"] == region]
-                base_survival_rate = region_wells["survived"].mean()
-                total_wells_in_region = len(region_wells)
-                
-                for month in months:
-                    month_num = month.month
-                    seasonal_factor = 1.0
-                    
-                    if 5 <= month_num <= 10:
-                        seasonal_factor = rng.uniform(1.05, 1.2)
-                    else:
-                        seasonal_factor = rng.uniform(0.85, 1.0)
-                    
-                    noise = rng.normal(0, 0.03)
-                    survival_rate = np.clip(base_survival_rate * seasonal_factor + noise, 0.0, 1.0)
-                    
-                    farm_time_series_data.append({
-                        "date": month,
-                        "region": region,
-                        "survival_rate": survival_rate,
-                        "total_wells": total_wells_in_region,
-                        "successful_wells": int(total_wells_in_region * survival_rate),
-                        "water_level_avg_m": rng.uniform(3.0, 8.0),
-                        "rainfall_mm": rng.uniform(0, 150) if 5 <= month_num <= 10 else rng.uniform(0, 50),
-                    })
+            seasonal_factor = np.where(rainy, 1.05 + 0.15 * uniform[0], 0.85 + 0.15 * uniform[0])
+            survival_rate = np.clip(base_survival_rate * seasonal_factor + noise, 0.0, 1.0)
+            water_level = 3.0 + 5.0 * uniform[1]
+            rainfall = uniform[2] * np.where(rainy, 150.0, 50.0)
             
-            return pd.DataFrame(farm_time_series_data)
+            return pd.DataFrame({
+                "date": np.tile(months.to_numpy(), n_regions),
+                "region": np.repeat(regions, n_months),
+                "survival_rate": survival_rate.ravel(),
+                "total_wells": np.repeat(total_wells.ravel(), n_months),
+                "successful_wells": (total_wells * survival_rate).astype(np.int64).ravel(),
+                "water_level_avg_m": water_level.ravel(),
+                "rainfall_mm": rainfall.ravel(),
+            })
             
         except Exception as e:
             logger.error(f"❌ Error generating farm time series: {e}")
@@ -211,25 +350,27 @@ class DashboardDataLoader:
         if wells_df is not None and max_distance_to_farm_m is not None:
             wells_df = wells_df[wells_df['distance_to_farm'] <= max_distance_to_farm_m]
         
+        # Pack mock polygons once so derived datasets share the same buffers
+        polygons = PolygonStore.coerce(mock_data.get("polygons"))
+        
         # Generate potential wells from mock data
         potential_wells_df = generate_potential_wells(
-            mock_data["polygons"],
+            polygons,
             wells_df,
             num_suggestions=25
         )
         
         demand_gap_df = calculate_water_demand_gap(
-            mock_data["polygons"],
+            polygons,
             wells_df,
             potential_wells_df
         )
         
         complete_data = {
-            "polygons": mock_data.get("polygons", []),
-            "farm_polygons": [],
+            "polygons": polygons,
+            "farm_polygons": PolygonStore.empty(),
             "wells_df": wells_df,
             "farm_time_series": mock_data.get("farm_time_series"),
-            "heat_points": mock_data.get("heat_points", []),
             "cost_df": mock_data.get("cost_df"),
             "prob_df": mock_data.get("prob_df"),
             "field_data_df": pd.DataFrame(),
@@ -285,6 +426,94 @@ def load_dashboard_data(data_dir: Union[str, Path] = "geodash/data", max_distanc
     return loader.load_all_data(max_distance_to_farm_m)
 
 
+# Process-wide published snapshots, shared by all Streamlit sessions
+_published_loaders: Dict[Tuple[str, Optional[float]], DashboardDataLoader] = {}
+_published_checked_at: Dict[Tuple[str, Optional[float]], float] = {}
+_published_attached: Dict[Tuple[str, Optional[float]], Tuple[int, Dict[str, object]]] = {}
+_published_lock = Lock()
+
+
+def get_published_data(
+    data_dir: Union[str, Path] = "geodash/data",
+    max_distance_to_farm_m: Optional[float] = None,
+    min_check_interval_s: float = 5.0
+) -> Tuple[int, Dict[str, object]]:
+    """
+    Get the current process-wide data snapshot, reloading changed sources.
+    
+    The first call loads everything. Later calls stat the source files (at
+    most once per ``min_check_interval_s``) and incrementally rebuild only the
+    affected datasets. Each rebuild publishes a new snapshot with a higher
+    version; sessions compare versions to pick it up.
+    
+    With ``GEODASH_SHARED_DATA`` set, the snapshot is attached from shared
+    memory instead (see ``shared_store``) and is shared by all worker processes.
+    
+    Args:
+        data_dir: Directory containing data files
+        max_distance_to_farm_m: Maximum distance to farm in meters
+        min_check_interval_s: Minimum seconds between file fingerprint checks
+        
+    Returns:
+        Tuple of (version, data); treat ``data`` as read-only
+    """
+    key = (str(Path(data_dir)), max_distance_to_farm_m)
+    
+    # Multi-process deployments: attach to the snapshot in shared memory
+    root = shared_store.shared_root()
+    if root is not None:
+        return _get_shared_data(root, key, min_check_interval_s)
+    
+    with _published_lock:
+        loader = _published_loaders.get(key)
+        now = time.monotonic()
+        
+        if loader is None:
+            loader = DashboardDataLoader(data_dir)
+            loader.load_all_data(max_distance_to_farm_m)
+            _published_loaders[key] = loader
+        elif now - _published_checked_at.get(key, 0.0) >= min_check_interval_s:
+            loader.refresh(max_distance_to_farm_m)
+        else:
+            return loader.version, loader.data
+        
+        _published_checked_at[key] = now
+        return loader.version, loader.data
+
+
+def _get_shared_data(root: Path, key: Tuple[str, Optional[float]], min_check_interval_s: float) -> Tuple[int, Dict[str, object]]:
+    """
+    Get the snapshot published in shared memory, publishing it if none exists.
+    
+    Args:
+        root: Shared-memory directory (GEODASH_SHARED_DATA)
+        key: (data_dir, max_distance_to_farm_m)
+        min_check_interval_s: Minimum seconds between checks for a newer version
+        
+    Returns:
+        Tuple of (version, data) with zero-copy read-only datasets
+    """
+    data_dir, max_distance_to_farm_m = key
+    directory = shared_store.snapshot_dir(root, data_dir, max_distance_to_farm_m)
+    
+    with _published_lock:
+        now = time.monotonic()
+        attached = _published_attached.get(key)
+        if attached is not None and now - _published_checked_at.get(key, 0.0) < min_check_interval_s:
+            return attached
+        
+        def build() -> Dict[str, object]:
+            loader = DashboardDataLoader(data_dir)
+            loader.load_all_data(max_distance_to_farm_m)
+            return loader.data
+        
+        version = shared_store.ensure_published(directory, build)
+        attached = shared_store.attach_snapshot(directory, version)
+        _published_attached[key] = attached
+        _published_checked_at[key] = now
+        return attached
+
+
 # Additional convenience functions
 def load_wells_only(data_dir: Union[str, Path] = "geodash/data", max_distance_to_farm_m: Optional[float] = None):
     """Load only wells data."""
@@ -334,6 +563,7 @@ def get_data_status(data_dir: Union[str, Path] = "geodash/data") -> Dict[str, Di
 __all__ = [
     "DashboardDataLoader",
     "load_dashboard_data",
+    "get_published_data",
     "load_wells_only", 
     "load_farm_data",
     "get_data_status",
@@ -5,10 +5,17 @@ Mockup/fallback data generator for the geological dashboard.
 This module provides mock data when real data is not available.
 Updated to generate time series data for farms and potential drilling locations.
 """
-from typing import Dict, List, Tuple
+from collections.abc import Mapping
+from functools import lru_cache
+from threading import RLock
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
 import numpy as np
 import pandas as pd
 
+from .area_service import get_area_service
+from .density import SuccessSurface, get_success_surface
+from .polygon_store import PolygonStore
+
 try:
     from shapely.geometry import Point, Polygon
     SHAPELY_AVAILABLE = True
@@ -17,197 +24,260 @@ except ImportError:
     print("⚠️ Shapely not available. Potential wells generation will use simplified logic.")
 
 
-def generate_mock_data() -> Dict[str, object]:
-    """
-    Generate mock/fallback datasets for the dashboard.
-    Used when real data files are not available or cannot be loaded.
+# Dan Chang district boundaries shared by all mock datasets
+DAN_CHANG_LAT_RANGE = (14.85, 15.05)  # North-South range
+DAN_CHANG_LON_RANGE = (99.50, 99.75)  # East-West range
 
-    Returns a dict with:
-    - polygons: List[dict] - Mock field polygons
-    - wells_df: pd.DataFrame - Mock well data  
-    - farm_time_series: pd.DataFrame - Mock time series data for farms (not wells)
-    - heat_points: List[List[float]] - Mock heatmap points
-    - cost_df: pd.DataFrame - Mock cost estimation data
-    - prob_df: pd.DataFrame - Mock probability data
-    """
-    rng = np.random.default_rng(42)
+# Sub-districts in Dan Chang used for mock well regions
+MOCK_REGIONS = [
+    "ด่านช้าง",      # Dan Chang (main district)
+    "หนองไผ่",       # Nong Phai
+    "ดอนกำยาน",      # Don Kamyan
+    "หนองหญ้าปล้อง",  # Nong Ya Plong
+    "วังลึก",        # Wang Luek
+    "หูช้าง",         # Hu Chang
+]
 
-    # Define Dan Chang district boundaries (consistent for all data)
-    dan_chang_lat_min, dan_chang_lat_max = 14.85, 15.05  # North-South range
-    dan_chang_lng_min, dan_chang_lng_max = 99.50, 99.75  # East-West range
-
-    # Mock field polygons - located in Dan Chang District area
-    polygons = [
-        {
-            "name": "ไร่ด่านช้าง A (Mock)",
-            "region": "ด่านช้าง",
-            "coordinates": [
-                [14.95, 99.58],
-                [14.95, 99.65],
-                [14.90, 99.65], 
-                [14.90, 99.58],
-            ],
-        },
-        {
-            "name": "ไร่หนองไผ่ B (Mock)",
-            "region": "หนองไผ่",
-            "coordinates": [
-                [14.98, 99.60],
-                [14.98, 99.67],
-                [14.93, 99.67],
-                [14.93, 99.60],
-            ],
-        },
-        {
-            "name": "ไร่วังลึก C (Mock)",
-            "region": "วังลึก", 
-            "coordinates": [
-                [14.92, 99.55],
-                [14.92, 99.62],
-                [14.87, 99.62],
-                [14.87, 99.55],
-            ],
-        },
-    ]
-
-    # Mock well data - located in อำเภอด่านช้าง (Dan Chang District), Suphan Buri
-    well_ids: List[str] = [f"WELL-{i:03d}" for i in range(1, 51)]
-    
-    # Generate wells within Dan Chang district
-    lats = dan_chang_lat_min + rng.random(len(well_ids)) * (dan_chang_lat_max - dan_chang_lat_min)
-    lngs = dan_chang_lng_min + rng.random(len(well_ids)) * (dan_chang_lng_max - dan_chang_lng_min)
-    
-    # Assign regions based on sub-districts in Dan Chang
-    regions = rng.choice([
-        "ด่านช้าง",      # Dan Chang (main district)
-        "หนองไผ่",       # Nong Phai
-        "ดอนกำยาน",      # Don Kamyan  
-        "หนองหญ้าปล้อง",  # Nong Ya Plong
-        "วังลึก",        # Wang Luek
-        "หูช้าง"         # Hu Chang
-    ], size=len(well_ids))
-    
-    depths_m = rng.integers(40, 220, size=len(well_ids))
-    survival_prob = rng.uniform(0.5, 0.95, size=len(well_ids))
-    success = rng.binomial(1, survival_prob).astype(bool)
-
-    wells_df = pd.DataFrame(
-        {
-            "well_id": well_ids,
-            "region": regions,
-            "lat": lats,
-            "lon": lngs,
-            "depth_m": depths_m,
-            "survived": success,
-            "distance_to_farm": rng.uniform(100, 30000, size=len(well_ids))  # Add distance
-        }
-    )
+# Mock field polygons - located in Dan Chang District area
+MOCK_FIELDS = [
+    {
+        "name": "ไร่ด่านช้าง A (Mock)",
+        "region": "ด่านช้าง",
+        "coordinates": [[14.95, 99.58], [14.95, 99.65], [14.90, 99.65], [14.90, 99.58]],
+    },
+    {
+        "name": "ไร่หนองไผ่ B (Mock)",
+        "region": "หนองไผ่",
+        "coordinates": [[14.98, 99.60], [14.98, 99.67], [14.93, 99.67], [14.93, 99.60]],
+    },
+    {
+        "name": "ไร่วังลึก C (Mock)",
+        "region": "วังลึก",
+        "coordinates": [[14.92, 99.55], [14.92, 99.62], [14.87, 99.62], [14.87, 99.55]],
+    },
+]
+
+
+def _mock_polygons(dataset: "MockDataset", rng: np.random.Generator) -> PolygonStore:
+    """Mock field polygons packed into a read-only PolygonStore."""
+    return PolygonStore.from_records(MOCK_FIELDS)
+
+
+def _mock_wells(dataset: "MockDataset", rng: np.random.Generator) -> pd.DataFrame:
+    """Mock wells located in อำเภอด่านช้าง (Dan Chang District), Suphan Buri."""
+    n_wells = 50
+    (lat_min, lat_max), (lon_min, lon_max) = DAN_CHANG_LAT_RANGE, DAN_CHANG_LON_RANGE
+    survival_prob = rng.uniform(0.5, 0.95, size=n_wells)
+
+    return pd.DataFrame({
+        "well_id": [f"WELL-{i:03d}" for i in range(1, n_wells + 1)],
+        "region": rng.choice(MOCK_REGIONS, size=n_wells),
+        "lat": lat_min + rng.random(n_wells) * (lat_max - lat_min),
+        "lon": lon_min + rng.random(n_wells) * (lon_max - lon_min),
+        "depth_m": rng.integers(40, 220, size=n_wells),
+        "survived": rng.binomial(1, survival_prob).astype(bool),
+        "distance_to_farm": rng.uniform(100, 30000, size=n_wells),
+    })
 
-    # Farm-based time series data
+
+def _mock_farm_time_series(dataset: "MockDataset", rng: np.random.Generator) -> pd.DataFrame:
+    """Monthly survival, water level and rainfall per region (regions × 24 months grid)."""
+    region_per_well = dataset["wells_df"]["region"].to_numpy()
+    regions, wells_in_region = np.unique(region_per_well, return_counts=True)
     months = pd.date_range(end=pd.Timestamp.today().normalize(), periods=24, freq="MS")
-    
-    unique_regions = regions
-    farm_time_series_data = []
-    
-    for region in np.unique(unique_regions):
-        base_survival_rate = rng.uniform(0.6, 0.9)
-        
-        for month in months:
-            month_num = month.month
-            seasonal_factor = 1.0
-            
-            if 5 <= month_num <= 10:
-                seasonal_factor = rng.uniform(1.1, 1.3)
-            else:
-                seasonal_factor = rng.uniform(0.8, 1.0)
-            
-            noise = rng.normal(0, 0.05)
-            survival_rate = np.clip(base_survival_rate * seasonal_factor + noise, 0.0, 1.0)
-            wells_in_region = np.sum(regions == region)
-            
-            farm_time_series_data.append({
-                "date": month,
-                "region": region,
-                "survival_rate": survival_rate,
-                "total_wells": wells_in_region,
-                "successful_wells": int(wells_in_region * survival_rate),
-                "water_level_avg_m": rng.uniform(3.0, 8.0),
-                "rainfall_mm": rng.uniform(0, 150) if 5 <= month_num <= 10 else rng.uniform(0, 50)
-            })
-    
-    farm_time_series = pd.DataFrame(farm_time_series_data)
-
-    # Mock heatmap points
-    heat_points = []
-    for _ in range(300):
-        lat = dan_chang_lat_min + rng.random() * (dan_chang_lat_max - dan_chang_lat_min)
-        lon = dan_chang_lng_min + rng.random() * (dan_chang_lng_max - dan_chang_lng_min)
-        weight = float(rng.uniform(0.2, 1.0))
-        heat_points.append([lat, lon, weight])
-
-    for _, well in wells_df.iterrows():
-        num_nearby_points = rng.integers(2, 5)
-        for _ in range(num_nearby_points):
-            lat_offset = rng.normal(0, 0.005)
-            lon_offset = rng.normal(0, 0.005)
-            
-            nearby_lat = np.clip(well['lat'] + lat_offset, dan_chang_lat_min, dan_chang_lat_max)
-            nearby_lon = np.clip(well['lon'] + lon_offset, dan_chang_lng_min, dan_chang_lng_max)
-            
-            base_weight = 0.8 if well['survived'] else 0.4
-            weight = float(np.clip(rng.normal(base_weight, 0.2), 0.1, 1.0))
-            
-            heat_points.append([nearby_lat, nearby_lon, weight])
+    n_regions, n_months = len(regions), len(months)
+
+    rainy = ((months.month >= 5) & (months.month <= 10))[None, :]
+    base_survival_rate = rng.uniform(0.6, 0.9, size=(n_regions, 1))
+    seasonal_factor = np.where(
+        rainy,
+        rng.uniform(1.1, 1.3, size=(n_regions, n_months)),
+        rng.uniform(0.8, 1.0, size=(n_regions, n_months)),
+    )
+    noise = rng.normal(0, 0.05, size=(n_regions, n_months))
+    survival_rate = np.clip(base_survival_rate * seasonal_factor + noise, 0.0, 1.0)
+    total_wells = np.broadcast_to(wells_in_region[:, None], (n_regions, n_months))
+
+    return pd.DataFrame({
+        "date": np.tile(months.to_numpy(), n_regions),
+        "region": np.repeat(regions, n_months),
+        "survival_rate": survival_rate.ravel(),
+        "total_wells": total_wells.ravel(),
+        "successful_wells": (total_wells * survival_rate).astype(np.int64).ravel(),
+        "water_level_avg_m": rng.uniform(3.0, 8.0, size=n_regions * n_months),
+        "rainfall_mm": (rng.random((n_regions, n_months)) * np.where(rainy, 150.0, 50.0)).ravel(),
+    })
+
 
-    # Mock cost and probability data
+def _mock_heat_points(dataset: "MockDataset", rng: np.random.Generator) -> np.ndarray:
+    """300 background points plus 2-4 weighted points scattered around every mock well."""
+    (lat_min, lat_max), (lon_min, lon_max) = DAN_CHANG_LAT_RANGE, DAN_CHANG_LON_RANGE
+    wells_df = dataset["wells_df"]
+
+    # Background points across the district
+    n_background = 300
+    background = np.column_stack([
+        lat_min + rng.random(n_background) * (lat_max - lat_min),
+        lon_min + rng.random(n_background) * (lon_max - lon_min),
+        rng.uniform(0.2, 1.0, size=n_background),
+    ])
+
+    # Points around wells, weighted by well success
+    per_well = rng.integers(2, 5, size=len(wells_df))
+    source = np.repeat(np.arange(len(wells_df)), per_well)
+    n_nearby = len(source)
+    base_weight = np.where(wells_df["survived"].to_numpy(dtype=bool), 0.8, 0.4)[source]
+    nearby = np.column_stack([
+        np.clip(wells_df["lat"].to_numpy()[source] + rng.normal(0, 0.005, n_nearby), lat_min, lat_max),
+        np.clip(wells_df["lon"].to_numpy()[source] + rng.normal(0, 0.005, n_nearby), lon_min, lon_max),
+        np.clip(rng.normal(base_weight, 0.2), 0.1, 1.0),
+    ])
+
+    return np.vstack([background, nearby])
+
+
+def _mock_cost(dataset: "MockDataset", rng: np.random.Generator) -> pd.DataFrame:
+    """Drilling cost estimate per depth bin."""
     depth_bins = np.arange(50, 251, 25)
     base_cost_per_m = 1200
-    cost_df = pd.DataFrame(
-        {
-            "depth_m": depth_bins,
-            "estimated_cost_thb": (depth_bins * base_cost_per_m)
-            + rng.normal(0, 15000, size=len(depth_bins)),
-        }
-    )
+    return pd.DataFrame({
+        "depth_m": depth_bins,
+        "estimated_cost_thb": (depth_bins * base_cost_per_m) + rng.normal(0, 15000, size=len(depth_bins)),
+    })
 
-    prob_df = pd.DataFrame(
-        {
-            "depth_m": depth_bins,
-            "probability": np.clip(
-                1.0 - np.abs((depth_bins - 150) / 150) + rng.normal(0, 0.05, len(depth_bins)),
-                0.05,
-                0.95,
-            ),
-        }
-    )
 
-    return {
-        "polygons": polygons,
-        "wells_df": wells_df,
-        "farm_time_series": farm_time_series,
-        "heat_points": heat_points,
-        "cost_df": cost_df,
-        "prob_df": prob_df,
+def _mock_probability(dataset: "MockDataset", rng: np.random.Generator) -> pd.DataFrame:
+    """Success probability per depth bin, peaking around 150 m."""
+    depth_bins = np.arange(50, 251, 25)
+    return pd.DataFrame({
+        "depth_m": depth_bins,
+        "probability": np.clip(
+            1.0 - np.abs((depth_bins - 150) / 150) + rng.normal(0, 0.05, len(depth_bins)),
+            0.05,
+            0.95,
+        ),
+    })
+
+
+def _mock_water_levels(dataset: "MockDataset", rng: np.random.Generator) -> pd.DataFrame:
+    """Monthly water level series for the mock wells."""
+    from .data_loaders.timeseries_loader import TimeSeriesLoader
+
+    return TimeSeriesLoader()._generate_water_levels_for_wells(dataset["wells_df"])
+
+
+class MockDataset(Mapping):
+    """
+    Read-only mapping of mock datasets for one seed.
+
+    Each dataset is built on first access and then shared. Every key draws
+    from its own child RNG of the seed, so values do not depend on which keys
+    were accessed before. DataFrames are returned as deep copies (the mock
+    frames are tiny), so a caller editing values in place cannot corrupt
+    later fallback loads; arrays are stored read-only.
+    """
+
+    BUILDERS: Dict[str, Callable[["MockDataset", np.random.Generator], object]] = {
+        "polygons": _mock_polygons,
+        "wells_df": _mock_wells,
+        "farm_time_series": _mock_farm_time_series,
+        "heat_points": _mock_heat_points,
+        "cost_df": _mock_cost,
+        "prob_df": _mock_probability,
+        "water_levels": _mock_water_levels,
     }
 
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self._values: Dict[str, object] = {}
+        self._lock = RLock()
+
+    def __getitem__(self, key: str):
+        value = self._values.get(key)
+        if value is None:
+            value = self._build(key)
+
+        if isinstance(value, pd.DataFrame):
+            return value.copy(deep=True)
+        if key == "heat_points":
+            return value.tolist()
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.BUILDERS)
+
+    def __len__(self) -> int:
+        return len(self.BUILDERS)
+
+    def _build(self, key: str):
+        """Build and store one dataset (once per key, thread safe)."""
+        builder = self.BUILDERS[key]  # KeyError for unknown keys, like a dict
+
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                child_index = list(self.BUILDERS).index(key)
+                rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(child_index,)))
+                value = builder(self, rng)
+                if isinstance(value, np.ndarray):
+                    value.flags.writeable = False
+                self._values[key] = value
+        return value
+
+
+@lru_cache(maxsize=None)
+def _mock_dataset(seed: int) -> MockDataset:
+    """One shared MockDataset per seed per process."""
+    return MockDataset(seed)
+
+
+def generate_mock_data(seed: int = 42) -> Mapping[str, object]:
+    """
+    Get mock/fallback datasets for the dashboard.
+    Used when real data files are not available or cannot be loaded.
+
+    The datasets are built once per seed and process, and each key is only
+    built when first accessed.
+
+    Args:
+        seed: Random seed for the mock datasets
+
+    Returns a read-only mapping with:
+    - polygons: PolygonStore - Mock field polygons
+    - wells_df: pd.DataFrame - Mock well data
+    - farm_time_series: pd.DataFrame - Mock time series data for farms (not wells)
+    - heat_points: List[List[float]] - Mock heatmap points
+    - cost_df: pd.DataFrame - Mock cost estimation data
+    - prob_df: pd.DataFrame - Mock probability data
+    - water_levels: pd.DataFrame - Mock monthly water levels per well
+    """
+    return _mock_dataset(seed)
+
 
 # def generate_potential_wells():
 #     pass
 
 
 def generate_potential_wells(
-    field_polygons: List[Dict],
+    field_polygons: Sequence,
     existing_wells_df: pd.DataFrame,
-    num_suggestions: int = 500
+    num_suggestions: int = 500,
+    success_surface: Optional[SuccessSurface] = None
 ) -> pd.DataFrame:
     """
     Generate potential drilling locations around (not inside) field polygons.
     Creates ~500 potential wells distributed around field boundaries.
     
+    Success probabilities start from the depth category range and are
+    shifted by the local success rate of existing wells (success surface
+    minus the overall rate).
+    
     Args:
-        field_polygons: List of field polygon dictionaries
+        field_polygons: PolygonStore (or list of field polygon dictionaries)
         existing_wells_df: DataFrame of existing wells
         num_suggestions: Number of potential locations to generate (default: 500)
+        success_surface: Success probability raster (default: computed from
+            existing_wells_df)
         
     Returns:
         DataFrame with potential well locations
@@ -218,21 +288,22 @@ def generate_potential_wells(
     if not field_polygons:
         return pd.DataFrame()
     
+    if success_surface is None:
+        success_surface = get_success_surface(existing_wells_df)
+    
+    fields = PolygonStore.coerce(field_polygons)
+    
     # Calculate wells per field (distribute evenly)
-    wells_per_field = max(1, num_suggestions // len(field_polygons))
+    wells_per_field = max(1, num_suggestions // len(fields))
     
-    for field_idx, field in enumerate(field_polygons):
-        coords = field.get('coordinates', [])
-        if not coords or len(coords) < 3:
+    for field_idx, field in enumerate(fields):
+        coords = field.coords
+        if len(coords) < 3:
             continue
         
-        # Calculate field bounds
-        lats = [c[0] for c in coords]
-        lons = [c[1] for c in coords]
-        min_lat, max_lat = min(lats), max(lats)
-        min_lon, max_lon = min(lons), max(lons)
-        centroid_lat = sum(lats) / len(lats)
-        centroid_lon = sum(lons) / len(lons)
+        # Field bounds and centroid are precomputed by the store
+        min_lat, min_lon, max_lat, max_lon = field.bbox
+        centroid_lat, centroid_lon = field.centroid
         
         # Calculate approximate field size
         field_height = max_lat - min_lat
@@ -265,7 +336,7 @@ def generate_potential_wells(
             pot_lon = centroid_lon + offset_lon
             
             # Check if point is actually OUTSIDE the field polygon
-            inside_field = _point_in_polygon_simple(pot_lat, pot_lon, coords)
+            inside_field = fields.contains(field_idx, pot_lat, pot_lon)[0]
             if inside_field:
                 continue  # Skip if inside field
             
@@ -305,6 +376,11 @@ def generate_potential_wells(
                 base_probability = rng.uniform(0.75, 0.90)
                 base_yield = rng.uniform(10, 16)
             
+            # Local evidence from existing wells around the site
+            if success_surface is not None:
+                local_anomaly = success_surface.lookup(pot_lat, pot_lon).item() - success_surface.prior
+                base_probability = float(np.clip(base_probability + local_anomaly, 0.05, 0.95))
+            
             # Calculate cost
             cost_per_meter = 1200
             drilling_cost = depth * cost_per_meter
@@ -348,27 +424,8 @@ def generate_potential_wells(
     return potential_df
 
 
-def _point_in_polygon_simple(lat: float, lon: float, polygon_coords: List[List[float]]) -> bool:
-    """
-    Simple point-in-polygon test using ray casting algorithm.
-    
-    Args:
-        lat: Point latitude
-        lon: Point longitude
-        polygon_coords: List of [lat, lon] coordinates
-        
-    Returns:
-        True if point is inside polygon
-    """
-    x, y = lon, lat
-    n = len(polygon_coords)
-    
-
- 
-
-
 def calculate_water_demand_gap(
-    field_polygons: List[Dict],
+    field_polygons: Sequence,
     existing_wells_df: pd.DataFrame,
     potential_wells_df: pd.DataFrame
 ) -> pd.DataFrame:
@@ -376,7 +433,7 @@ def calculate_water_demand_gap(
     Calculate water demand gap for each field considering existing and potential wells.
     
     Args:
-        field_polygons: List of field polygons
+        field_polygons: PolygonStore (or list of field polygons)
         existing_wells_df: Existing wells data
         potential_wells_df: Potential wells data
         
@@ -388,24 +445,18 @@ def calculate_water_demand_gap(
     if not field_polygons:
         return pd.DataFrame()
     
-    for field in field_polygons:
-        coords = field.get('coordinates', [])
-        if not coords or len(coords) < 3:
+    fields = PolygonStore.coerce(field_polygons)
+    
+    # Ellipsoidal field areas for all fields in one call (cached per geometry)
+    fields_area_rai = get_area_service().area_table(fields)["area_rai"]
+    
+    for field in fields:
+        if len(field.coords) < 3:
             continue
         
-        # Calculate centroid
-        centroid_lat = sum(c[0] for c in coords) / len(coords)
-        centroid_lon = sum(c[1] for c in coords) / len(coords)
-        
-        # Estimate field area (very rough, in hectares)
-        # Simple bounding box method
-        lats = [c[0] for c in coords]
-        lons = [c[1] for c in coords]
-        lat_span = max(lats) - min(lats)
-        lon_span = max(lons) - min(lons)
-        area_deg_sq = lat_span * lon_span
-        area_hectares = area_deg_sq * 111 * 111  # Very rough conversion
-        area_rai = area_hectares * 6.25  # Convert to rai
+        # Centroid is precomputed by the store
+        centroid_lat, centroid_lon = field.centroid
+        area_rai = float(fields_area_rai[field.index])
         
         # Estimate water demand (m³/day)
         water_demand_m3_day = area_rai * 25  # 25 m³/rai/day for sugarcane
@@ -0,0 +1,561 @@
+"""
+Compact columnar storage for field and farm polygons.
+Holds all polygon vertices in one flat coordinate buffer with ring, part and
+polygon offsets (the GeoArrow MultiPolygon layout), plus precomputed bounding
+boxes and centroids, so consumers never rescan or copy nested
+coordinate lists. Every part and interior ring (hole) is preserved.
+"""
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Try to import shapely for the true-geometry spatial index
+try:
+    import shapely
+    SHAPELY_AVAILABLE = True
+except ImportError:
+    SHAPELY_AVAILABLE = False
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Return the array with its writeable flag cleared."""
+    array.flags.writeable = False
+    return array
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Concatenate ``arange(start, stop)`` for every pair without a Python loop."""
+    counts = stops - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    return np.arange(total, dtype=np.int64) + offsets
+
+
+def _offsets_from_counts(counts: np.ndarray) -> np.ndarray:
+    """Build an offsets array (length n + 1) from per-item counts."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def points_in_ring(lat, lon, ring: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ray casting test of points against a single ring.
+
+    Args:
+        lat: Point latitude(s)
+        lon: Point longitude(s)
+        ring: Array of shape (n, 2) holding [lat, lon] vertices (open ring)
+
+    Returns:
+        Boolean array with one entry per point
+    """
+    lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))[:, None]
+    lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))[:, None]
+
+    if len(ring) < 3:
+        return np.zeros(lat.shape[0], dtype=bool)
+
+    y1, x1 = ring[:, 0], ring[:, 1]
+    y2, x2 = np.roll(y1, -1), np.roll(x1, -1)
+
+    crosses = (y1 > lat) != (y2 > lat)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_intersect = (x2 - x1) * (lat - y1) / (y2 - y1) + x1
+
+    return np.count_nonzero(crosses & (lon < x_intersect), axis=1) % 2 == 1
+
+
+class PolygonView(Mapping):
+    """
+    Lightweight read-only view of one polygon in a ``PolygonStore``.
+
+    Behaves like the legacy polygon dictionary (``view["name"]``,
+    ``view.get("plot_code")``, ``view["coordinates"]``) while exposing the
+    underlying arrays without copying via ``coords``, ``rings``, ``bbox``,
+    ``centroid`` and ``area_m2``.
+    """
+
+    __slots__ = ("_store", "index")
+
+    def __init__(self, store: "PolygonStore", index: int):
+        self._store = store
+        self.index = index
+
+    @property
+    def coords(self) -> np.ndarray:
+        """Exterior ring of the first part as a read-only (n, 2) [lat, lon] view."""
+        return self._store.ring_coords(self.index)
+
+    @property
+    def rings(self) -> List[np.ndarray]:
+        """All rings of every part (exterior first, then its holes) as array views."""
+        return self._store.polygon_rings(self.index)
+
+    @property
+    def locations(self):
+        """
+        Rings in the form expected by ``folium.Polygon``.
+
+        A single ring for simple polygons, otherwise the list of all rings;
+        Leaflet's even-odd fill renders holes and disjoint parts correctly.
+        """
+        rings = self.rings
+        return rings[0] if len(rings) == 1 else rings
+
+    @property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        """Bounding box as (min_lat, min_lon, max_lat, max_lon)."""
+        return tuple(float(v) for v in self._store.bboxes[self.index])
+
+    @property
+    def centroid(self) -> Tuple[float, float]:
+        """Vertex centroid of the exterior rings as (lat, lon)."""
+        lat, lon = self._store.centroids[self.index]
+        return float(lat), float(lon)
+
+    @property
+    def area_m2(self) -> float:
+        """Geodesic polygon area in square meters (holes subtracted, see AreaService)."""
+        from .area_service import get_area_service
+
+        return float(get_area_service().areas_m2(self._store)[self.index])
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "coordinates":
+            return self.coords.tolist()
+        return self._store._attribute_value(key, self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._store.attribute_names
+        yield "coordinates"
+
+    def __len__(self) -> int:
+        return len(self._store.attribute_names) + 1
+
+    def __repr__(self) -> str:
+        return f"PolygonView(index={self.index}, name={self.get('name')!r})"
+
+
+class PolygonStore(Sequence):
+    """
+    Read-only columnar store of (multi)polygons.
+
+    Vertices of every ring live in a single float64 ``coords`` buffer of
+    [lat, lon] pairs (rings are stored open, without the closing vertex).
+    Three offset arrays describe the nesting:
+
+    - ``ring_offsets`` delimits the vertices of each ring
+    - ``part_offsets`` delimits the rings of each part (exterior ring first,
+      followed by its holes)
+    - ``polygon_offsets`` delimits the parts of each polygon
+
+    Per-polygon attributes (name, region, plot_code, styling, ...) are kept
+    as columns. Indexing returns a ``PolygonView``, so existing code that
+    treats polygons as dictionaries keeps working.
+    """
+
+    def __init__(
+        self,
+        coords: np.ndarray,
+        ring_offsets: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+        part_offsets: Optional[np.ndarray] = None,
+        polygon_offsets: Optional[np.ndarray] = None,
+    ):
+        """
+        Initialize the store from flat buffers.
+
+        Args:
+            coords: Array of shape (n_vertices, 2) holding [lat, lon] pairs
+            ring_offsets: Int array of length n_rings + 1
+            attributes: Per-polygon attribute table (one row per polygon)
+            part_offsets: Int array of length n_parts + 1 delimiting the rings
+                of each part (default: one ring per part)
+            polygon_offsets: Int array of length n_polygons + 1 delimiting the
+                parts of each polygon (default: one part per polygon)
+        """
+        self.coords = _read_only(np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2))
+        self.ring_offsets = _read_only(np.asarray(ring_offsets, dtype=np.int64))
+
+        if part_offsets is None:
+            part_offsets = np.arange(len(self.ring_offsets), dtype=np.int64)
+        self.part_offsets = _read_only(np.asarray(part_offsets, dtype=np.int64))
+
+        if polygon_offsets is None:
+            polygon_offsets = np.arange(len(self.part_offsets), dtype=np.int64)
+        self.polygon_offsets = _read_only(np.asarray(polygon_offsets, dtype=np.int64))
+
+        n_polygons = len(self.polygon_offsets) - 1
+        if attributes is None:
+            attributes = pd.DataFrame(index=pd.RangeIndex(n_polygons))
+        if len(attributes) != n_polygons:
+            raise ValueError(f"Expected {n_polygons} attribute rows, got {len(attributes)}")
+
+        self.attributes = attributes.reset_index(drop=True)
+        self._columns = {col: self.attributes[col].to_numpy(dtype=object) for col in self.attributes.columns}
+
+        self._compute_geometry_stats()
+        self._version: Optional[str] = None
+        self._geometry_version: Optional[str] = None
+        self._geometries = None
+        self._tree = None
+
+    # === Construction ===
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "PolygonStore":
+        """
+        Build a store from legacy polygon dictionaries.
+
+        Args:
+            records: Iterable of dicts with a ``coordinates`` list of [lat, lon]
+                pairs plus arbitrary attribute keys. An optional ``rings`` key
+                (list of parts, each a list of rings, exterior first) takes
+                precedence and preserves all parts and holes.
+
+        Returns:
+            PolygonStore with one polygon per record
+        """
+        records = list(records)
+
+        rings, part_counts, polygon_counts = [], [], []
+        for record in records:
+            parts = record.get("rings") or [[record.get("coordinates", [])]]
+            for part in parts:
+                rings.extend(np.asarray(ring, dtype=np.float64).reshape(-1, 2) for ring in part)
+                part_counts.append(len(part))
+            polygon_counts.append(len(parts))
+
+        coords = np.concatenate(rings) if rings else np.empty((0, 2), dtype=np.float64)
+        attributes = pd.DataFrame(
+            [{k: v for k, v in r.items() if k not in ("coordinates", "rings")} for r in records]
+        )
+        if attributes.empty:
+            attributes = pd.DataFrame(index=pd.RangeIndex(len(records)))
+
+        return cls(
+            coords,
+            _offsets_from_counts(np.array([len(ring) for ring in rings], dtype=np.int64)),
+            attributes,
+            _offsets_from_counts(np.array(part_counts, dtype=np.int64)),
+            _offsets_from_counts(np.array(polygon_counts, dtype=np.int64)),
+        )
+
+    @classmethod
+    def empty(cls) -> "PolygonStore":
+        """Create an empty store."""
+        return cls(np.empty((0, 2)), np.zeros(1, dtype=np.int64))
+
+    @classmethod
+    def coerce(cls, polygons) -> "PolygonStore":
+        """Return ``polygons`` as a PolygonStore, converting legacy lists of dicts."""
+        if isinstance(polygons, PolygonStore):
+            return polygons
+        if polygons is None:
+            return cls.empty()
+        return cls.from_records(polygons)
+
+    @classmethod
+    def concat(cls, stores: List["PolygonStore"]) -> "PolygonStore":
+        """
+        Concatenate several stores into one.
+
+        Args:
+            stores: Stores to concatenate (in order)
+
+        Returns:
+            New PolygonStore
+        """
+        stores = [s for s in stores if len(s)]
+        if not stores:
+            return cls.empty()
+        if len(stores) == 1:
+            return stores[0]
+
+        def rebase(offsets_of, base_of):
+            bases = np.cumsum([0] + [base_of(s) for s in stores[:-1]])
+            return np.concatenate([[0]] + [offsets_of(s)[1:] + base for s, base in zip(stores, bases)])
+
+        return cls(
+            np.concatenate([s.coords for s in stores]),
+            rebase(lambda s: s.ring_offsets, lambda s: len(s.coords)),
+            pd.concat([s.attributes for s in stores], ignore_index=True),
+            rebase(lambda s: s.part_offsets, lambda s: len(s.ring_offsets) - 1),
+            rebase(lambda s: s.polygon_offsets, lambda s: len(s.part_offsets) - 1),
+        )
+
+    def take(self, indices) -> "PolygonStore":
+        """
+        Create a new store holding a subset of polygons.
+
+        Args:
+            indices: Integer positions or boolean mask
+
+        Returns:
+            New PolygonStore with the selected polygons (in the given order)
+        """
+        indices = np.arange(len(self))[np.asarray(indices)]
+
+        part_ids = _ranges(self.polygon_offsets[indices], self.polygon_offsets[indices + 1])
+        ring_ids = _ranges(self.part_offsets[part_ids], self.part_offsets[part_ids + 1])
+        vertex_starts, vertex_stops = self.ring_offsets[ring_ids], self.ring_offsets[ring_ids + 1]
+
+        return PolygonStore(
+            self.coords[_ranges(vertex_starts, vertex_stops)],
+            _offsets_from_counts(vertex_stops - vertex_starts),
+            self.attributes.iloc[indices],
+            _offsets_from_counts(np.diff(self.part_offsets)[part_ids]),
+            _offsets_from_counts(np.diff(self.polygon_offsets)[indices]),
+        )
+
+    def with_attributes(self, attributes: pd.DataFrame) -> "PolygonStore":
+        """Create a store sharing this geometry with a new attribute table."""
+        store = PolygonStore(self.coords, self.ring_offsets, attributes, self.part_offsets, self.polygon_offsets)
+        store._geometry_version = self._geometry_version
+        return store
+
+    # === Precomputed geometry ===
+
+    def _compute_geometry_stats(self) -> None:
+        """Compute ring ownership and per-polygon bbox and centroid."""
+        n_polygons = len(self)
+        n_parts = len(self.part_offsets) - 1
+        n_rings = len(self.ring_offsets) - 1
+
+        ring_part = np.repeat(np.arange(n_parts), np.diff(self.part_offsets))
+        part_polygon = np.repeat(np.arange(n_polygons), np.diff(self.polygon_offsets))
+        self.ring_polygon = _read_only(part_polygon[ring_part])
+        self.ring_is_hole = _read_only(np.arange(n_rings) != self.part_offsets[ring_part])
+
+        vertex_ring = np.repeat(np.arange(n_rings), np.diff(self.ring_offsets))
+        vertex_polygon = self.ring_polygon[vertex_ring]
+        exterior = ~self.ring_is_hole[vertex_ring]
+
+        # Bounding boxes over all vertices (polygons own a contiguous vertex range)
+        bboxes = np.full((n_polygons, 4), np.nan)
+        vertex_counts = np.bincount(vertex_polygon, minlength=n_polygons)
+        non_empty = vertex_counts > 0
+        if non_empty.any():
+            reduce_at = _offsets_from_counts(vertex_counts)[:-1][non_empty]
+            bboxes[non_empty, 0:2] = np.minimum.reduceat(self.coords, reduce_at, axis=0)
+            bboxes[non_empty, 2:4] = np.maximum.reduceat(self.coords, reduce_at, axis=0)
+
+        # Vertex centroid of the exterior rings
+        exterior_counts = np.bincount(vertex_polygon, weights=exterior, minlength=n_polygons)
+        centroids = np.full((n_polygons, 2), np.nan)
+        has_exterior = exterior_counts > 0
+        for axis in range(2):
+            sums = np.bincount(vertex_polygon, weights=self.coords[:, axis] * exterior, minlength=n_polygons)
+            centroids[has_exterior, axis] = sums[has_exterior] / exterior_counts[has_exterior]
+
+        self.bboxes = _read_only(bboxes)
+        self.centroids = _read_only(centroids)
+
+    # === Access ===
+
+    @property
+    def attribute_names(self) -> List[str]:
+        """Names of the per-polygon attribute columns."""
+        return list(self._columns)
+
+    def _attribute_value(self, key: str, index: int) -> Any:
+        column = self._columns.get(key)
+        if column is None:
+            raise KeyError(key)
+        value = column[index]
+        return None if value is None or (isinstance(value, float) and np.isnan(value)) else value
+
+    def column(self, key: str) -> np.ndarray:
+        """Get one attribute column as an object array."""
+        return self._columns[key]
+
+    def _ring(self, ring: int) -> np.ndarray:
+        return self.coords[self.ring_offsets[ring]:self.ring_offsets[ring + 1]]
+
+    def ring_coords(self, index: int) -> np.ndarray:
+        """Exterior ring of the first part of polygon ``index`` as a zero-copy view."""
+        first_part = self.polygon_offsets[index]
+        if first_part == self.polygon_offsets[index + 1]:
+            return self.coords[:0]
+        return self._ring(self.part_offsets[first_part])
+
+    def polygon_rings(self, index: int) -> List[np.ndarray]:
+        """All rings of polygon ``index`` (each part's exterior followed by its holes)."""
+        first_ring = self.part_offsets[self.polygon_offsets[index]]
+        last_ring = self.part_offsets[self.polygon_offsets[index + 1]]
+        return [self._ring(ring) for ring in range(first_ring, last_ring)]
+
+    def __len__(self) -> int:
+        return len(self.polygon_offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return PolygonView(self, index)
+
+    def __repr__(self) -> str:
+        return f"PolygonStore({len(self)} polygons, {len(self.coords)} vertices, {self.nbytes / 1e6:.2f} MB)"
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the coordinate, offset and precomputed arrays."""
+        arrays = (
+            self.coords, self.ring_offsets, self.part_offsets, self.polygon_offsets,
+            self.bboxes, self.centroids,
+        )
+        return int(sum(a.nbytes for a in arrays))
+
+    @property
+    def geometry_version(self) -> str:
+        """Content hash of the coordinates and offsets only (stable across processes)."""
+        if self._geometry_version is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for array in (self.coords, self.ring_offsets, self.part_offsets, self.polygon_offsets):
+                digest.update(array.tobytes())
+            self._geometry_version = digest.hexdigest()
+        return self._geometry_version
+
+    @property
+    def version(self) -> str:
+        """Content hash of geometry and attributes (stable across processes)."""
+        if self._version is None:
+            digest = hashlib.blake2b(self.geometry_version.encode(), digest_size=16)
+            digest.update(pd.util.hash_pandas_object(self.attributes.astype(str), index=False).to_numpy().tobytes())
+            self._version = digest.hexdigest()
+        return self._version
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert back to legacy polygon dictionaries."""
+        return [dict(view) for view in self]
+
+    # === Spatial queries ===
+
+    @property
+    def geometries(self) -> Optional[np.ndarray]:
+        """
+        Shapely (Multi)Polygons for every polygon, built in one bulk call.
+
+        Returns:
+            Object array of geometries in (lon, lat) order, with None for
+            degenerate polygons; None if shapely is not installed
+        """
+        if not SHAPELY_AVAILABLE:
+            return None
+
+        if self._geometries is None:
+            geometries = np.full(len(self), None, dtype=object)
+
+            # Only polygons whose rings all have at least 3 vertices are buildable
+            degenerate_rings = np.diff(self.ring_offsets) < 3
+            valid = (np.bincount(self.ring_polygon, weights=degenerate_rings, minlength=len(self)) == 0) & (
+                np.diff(self.polygon_offsets) > 0
+            )
+
+            if valid.any():
+                subset = self.take(valid)
+                starts, stops = subset.ring_offsets[:-1], subset.ring_offsets[1:]
+
+                # Re-close every ring: start..stop inclusive, last index wraps to start
+                closed = _ranges(starts, stops + 1)
+                closed_ends = np.cumsum(stops - starts + 1) - 1
+                closed[closed_ends] = starts
+
+                geometries[valid] = shapely.from_ragged_array(
+                    shapely.GeometryType.MULTIPOLYGON,
+                    subset.coords[closed][:, ::-1],
+                    (_offsets_from_counts(stops - starts + 1), subset.part_offsets, subset.polygon_offsets),
+                )
+
+            self._geometries = geometries
+        return self._geometries
+
+    @property
+    def spatial_index(self):
+        """STRtree over the true polygon geometry (None without shapely)."""
+        if self._tree is None and self.geometries is not None:
+            self._tree = shapely.STRtree(self.geometries)
+        return self._tree
+
+    def contains(self, index: int, lat, lon) -> np.ndarray:
+        """
+        Test whether point(s) fall inside polygon ``index`` (holes excluded).
+
+        Args:
+            index: Polygon index
+            lat: Point latitude(s)
+            lon: Point longitude(s)
+
+        Returns:
+            Boolean array with one entry per point
+        """
+        geometries = self.geometries
+        if geometries is not None:
+            if geometries[index] is None:
+                return np.zeros(np.size(lat), dtype=bool)
+            return np.atleast_1d(shapely.contains_xy(geometries[index], lon, lat))
+
+        # Even-odd rule over all rings handles holes and disjoint parts
+        inside = np.zeros(np.size(lat), dtype=bool)
+        for ring in self.polygon_rings(index):
+            inside ^= points_in_ring(lat, lon, ring)
+        return inside
+
+    def locate_many(self, lat, lon) -> np.ndarray:
+        """
+        Find the first polygon containing each point.
+
+        Args:
+            lat: Point latitudes
+            lon: Point longitudes
+
+        Returns:
+            Int array of polygon indices, -1 where no polygon contains the point
+        """
+        lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+        lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))
+        result = np.full(len(lat), len(self), dtype=np.int64)
+
+        tree = self.spatial_index
+        if tree is not None:
+            point_ids, polygon_ids = tree.query(shapely.points(lon, lat), predicate="intersects")
+            np.minimum.at(result, point_ids, polygon_ids)
+        else:
+            b = self.bboxes
+            for index in range(len(self)):
+                candidates = np.flatnonzero(
+                    (result == len(self)) & (b[index, 0] <= lat) & (lat <= b[index, 2])
+                    & (b[index, 1] <= lon) & (lon <= b[index, 3])
+                )
+                if len(candidates):
+                    hits = candidates[self.contains(index, lat[candidates], lon[candidates])]
+                    result[hits] = index
+
+        result[result == len(self)] = -1
+        return result
+
+    def locate(self, lat: float, lon: float) -> int:
+        """
+        Find the first polygon containing a point.
+
+        Args:
+            lat: Point latitude
+            lon: Point longitude
+
+        Returns:
+            Polygon index, or -1 if no polygon contains the point
+        """
+        return int(self.locate_many(lat, lon)[0])
+
+
+# Export the store classes
+__all__ = ["PolygonStore", "PolygonView", "points_in_ring"]
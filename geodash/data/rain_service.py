@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import streamlit as st
 
+from ..instrumentation import span
+
 try:
     import openmeteo_requests
     import requests_cache
@@ -88,7 +90,8 @@ class RainDataService:
             }
             
             # Make API request
-            responses = self.client.weather_api(url, params=params)
+            with span("external.open_meteo", "external"):
+                responses = self.client.weather_api(url, params=params)
             response = responses[0]
             
             # Process hourly data
@@ -0,0 +1,343 @@
+"""
+Shared-memory publication of the dashboard datasets for multi-process deployments.
+One process (a dedicated publisher or the first Streamlit worker) writes the
+current snapshot as uncompressed Arrow IPC files under /dev/shm; every other
+worker memory-maps them, so DataFrame columns and polygon buffers are
+zero-copy, read-only views of the same pages and per-worker memory stays flat
+as workers are added.
+
+Enable with ``GEODASH_SHARED_DATA=1`` (default directory) or
+``GEODASH_SHARED_DATA=/path/on/tmpfs``. To pick up source file changes, run
+the publisher alongside the workers:
+
+    python -m geodash.data.shared_store --watch 30
+"""
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from .polygon_store import PolygonStore
+from ..instrumentation import span
+
+# Try to import pyarrow for the IPC format
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Try to import fcntl for the publisher lock (POSIX only)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger("SharedStore")
+
+# tmpfs when available, so published files live in memory
+DEFAULT_ROOT = Path("/dev/shm/geodash") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir()) / "geodash-shm"
+
+# Published versions kept on disk; older ones are removed (mapped pages stay valid)
+KEEP_VERSIONS = 2
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".publish.lock"
+
+# Attached snapshots of this process: (root, version) -> data
+_attached: Dict[Tuple[str, int], Dict[str, object]] = {}
+
+
+def shared_root() -> Optional[Path]:
+    """
+    Shared-memory directory configured by ``GEODASH_SHARED_DATA``.
+
+    Returns:
+        Directory path, or None when shared publication is disabled
+        (variable unset or "0") or pyarrow is missing
+    """
+    setting = os.environ.get("GEODASH_SHARED_DATA", "").strip()
+    if setting in ("", "0"):
+        return None
+    if not ARROW_AVAILABLE:
+        logger.warning("⚠️  GEODASH_SHARED_DATA is set but pyarrow is not installed; loading data per process")
+        return None
+    return DEFAULT_ROOT if setting == "1" else Path(setting)
+
+
+def snapshot_dir(root: Union[str, Path], data_dir: Union[str, Path], max_distance_to_farm_m: Optional[float]) -> Path:
+    """Directory holding the published versions for one loader configuration."""
+    key = hashlib.blake2b(repr((str(Path(data_dir)), max_distance_to_farm_m)).encode(), digest_size=6).hexdigest()
+    return Path(root) / key
+
+
+# === Arrow conversion ===
+
+def _types_mapper(arrow_type):
+    # Arrow-backed strings keep text columns in the mapped buffers too
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def _write_table(table, path: Path) -> None:
+    # Single record batch, no compression: readers map columns without copying
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+
+def _read_table(path: Path):
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def _frame_to_table(df: pd.DataFrame):
+    return pa.Table.from_pandas(df, preserve_index=None)
+
+
+def _table_to_frame(table) -> pd.DataFrame:
+    return table.to_pandas(split_blocks=True, types_mapper=_types_mapper)
+
+
+def _polygons_to_table(store: PolygonStore):
+    """Polygons as a GeoArrow MultiPolygon column plus their attribute columns."""
+    points = pa.FixedSizeListArray.from_arrays(pa.array(store.coords.ravel()), 2)
+    rings = pa.LargeListArray.from_arrays(pa.array(store.ring_offsets), points)
+    parts = pa.LargeListArray.from_arrays(pa.array(store.part_offsets), rings)
+    geometry = pa.LargeListArray.from_arrays(pa.array(store.polygon_offsets), parts)
+
+    table = pa.Table.from_pandas(store.attributes, preserve_index=False)
+    return table.append_column("geometry", geometry)
+
+
+def _table_to_polygons(table) -> PolygonStore:
+    geometry = table.column("geometry").combine_chunks()
+    parts = geometry.values
+    rings = parts.values
+    points = rings.values
+
+    return PolygonStore(
+        points.values.to_numpy(zero_copy_only=True).reshape(-1, 2),
+        rings.offsets.to_numpy(zero_copy_only=True),
+        _table_to_frame(table.drop_columns(["geometry"])),
+        parts.offsets.to_numpy(zero_copy_only=True),
+        geometry.offsets.to_numpy(zero_copy_only=True),
+    )
+
+
+def _write_dataset(name: str, value: object, directory: Path) -> Dict[str, str]:
+    """Write one dataset and return its manifest entry."""
+    try:
+        if isinstance(value, PolygonStore):
+            _write_table(_polygons_to_table(value), directory / f"{name}.arrow")
+            return {"kind": "polygons", "file": f"{name}.arrow"}
+        if isinstance(value, pd.DataFrame):
+            _write_table(_frame_to_table(value), directory / f"{name}.arrow")
+            return {"kind": "frame", "file": f"{name}.arrow"}
+    except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError) as e:
+        logger.warning(f"⚠️  {name} cannot be stored as Arrow ({e}); it will be copied per worker")
+
+    with open(directory / f"{name}.pkl", "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return {"kind": "pickle", "file": f"{name}.pkl"}
+
+
+def _read_dataset(entry: Dict[str, str], directory: Path) -> object:
+    path = directory / entry["file"]
+    kind = entry["kind"]
+    if kind == "polygons":
+        return _table_to_polygons(_read_table(path))
+    if kind == "frame":
+        return _table_to_frame(_read_table(path))
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# === Publication ===
+
+class _PublishLock:
+    """Exclusive inter-process lock on the snapshot directory (no-op without fcntl)."""
+
+    def __init__(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / LOCK_FILE
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a")
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+
+
+def current_version(directory: Union[str, Path]) -> Optional[int]:
+    """Latest published version in ``directory``, or None if nothing is published."""
+    try:
+        return int((Path(directory) / CURRENT_FILE).read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _publish_locked(data: Dict[str, object], directory: Path) -> int:
+    version = (current_version(directory) or 0) + 1
+    staging = Path(tempfile.mkdtemp(prefix=f".v{version:06d}-", dir=directory))
+
+    with span("shared.publish", "loader", datasets=len(data)):
+        manifest = {"version": version, "published_at": time.time(), "datasets": {}}
+        for name, value in data.items():
+            manifest["datasets"][name] = _write_dataset(name, value, staging)
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+        # Readers only ever see complete versions: rename the directory, then the pointer
+        target = directory / f"v{version:06d}"
+        shutil.rmtree(target, ignore_errors=True)
+        staging.rename(target)
+        pointer = directory / f".{CURRENT_FILE}.tmp"
+        pointer.write_text(str(version))
+        os.replace(pointer, directory / CURRENT_FILE)
+
+    # Workers that still map an old version keep their pages until they detach
+    old_versions = sorted(p for p in directory.glob("v*") if p.is_dir())[:-KEEP_VERSIONS]
+    for old in old_versions:
+        shutil.rmtree(old, ignore_errors=True)
+
+    size_mb = sum(f.stat().st_size for f in target.iterdir()) / 1024 ** 2
+    logger.info(f"📤 Published data version {version} to {target} ({size_mb:.1f} MB)")
+    return version
+
+
+def publish_snapshot(data: Dict[str, object], directory: Union[str, Path]) -> int:
+    """
+    Publish a data snapshot as a new version.
+
+    Args:
+        data: Dataset name -> DataFrame, PolygonStore or any picklable value
+        directory: Snapshot directory (see ``snapshot_dir``)
+
+    Returns:
+        The published version number
+    """
+    directory = Path(directory)
+    with _PublishLock(directory):
+        return _publish_locked(data, directory)
+
+
+def ensure_published(directory: Union[str, Path], build: Callable[[], Dict[str, object]]) -> int:
+    """
+    Publish ``build()`` unless a version already exists.
+
+    Workers starting together serialize on the publisher lock: the first one
+    builds and publishes, the others wait and then attach to its version.
+
+    Returns:
+        Current version number
+    """
+    directory = Path(directory)
+    version = current_version(directory)
+    if version is not None:
+        return version
+
+    with _PublishLock(directory):
+        version = current_version(directory)
+        if version is None:
+            logger.info(f"🏗️  No shared snapshot in {directory}; this process publishes it")
+            version = _publish_locked(build(), directory)
+    return version
+
+
+def attach_snapshot(directory: Union[str, Path], version: Optional[int] = None) -> Tuple[int, Dict[str, object]]:
+    """
+    Attach to a published snapshot (memory-mapped, read-only).
+
+    Args:
+        directory: Snapshot directory (see ``snapshot_dir``)
+        version: Version to attach (default: the current one)
+
+    Returns:
+        Tuple of (version, data); DataFrame and polygon buffers are read-only
+        views of the shared files
+
+    Raises:
+        FileNotFoundError: If nothing has been published
+    """
+    directory = Path(directory)
+    if version is None:
+        version = current_version(directory)
+        if version is None:
+            raise FileNotFoundError(f"No shared snapshot published in {directory}")
+
+    key = (str(directory), version)
+    data = _attached.get(key)
+    if data is None:
+        version_dir = directory / f"v{version:06d}"
+        with span("shared.attach", "loader", version=version):
+            manifest = json.loads((version_dir / MANIFEST_FILE).read_text())
+            data = {name: _read_dataset(entry, version_dir) for name, entry in manifest["datasets"].items()}
+
+        # Drop older attachments so their mappings can be released
+        for stale in [k for k in _attached if k[0] == key[0]]:
+            del _attached[stale]
+        _attached[key] = data
+        logger.info(f"📎 Attached shared data version {version} from {version_dir}")
+    return version, data
+
+
+def main(argv=None) -> int:
+    """Publisher process: load the datasets, publish them and optionally watch for changes."""
+    from .loader import DashboardDataLoader
+
+    parser = argparse.ArgumentParser(description="Publish dashboard datasets to shared memory")
+    parser.add_argument("--root", type=Path, default=None, help=f"Shared directory (default: $GEODASH_SHARED_DATA or {DEFAULT_ROOT})")
+    parser.add_argument("--data-dir", default="geodash/data", help="Dashboard data directory")
+    parser.add_argument("--max-distance", type=float, default=None, help="Maximum well distance to farm (m)")
+    parser.add_argument("--watch", type=float, default=None, help="Check source files every N seconds and republish changes")
+    args = parser.parse_args(argv)
+
+    if not ARROW_AVAILABLE:
+        logger.error("❌ pyarrow is required to publish shared data")
+        return 1
+
+    root = args.root or shared_root() or DEFAULT_ROOT
+    directory = snapshot_dir(root, args.data_dir, args.max_distance)
+
+    loader = DashboardDataLoader(args.data_dir)
+    loader.load_all_data(args.max_distance)
+    publish_snapshot(loader.data, directory)
+
+    while args.watch:
+        time.sleep(args.watch)
+        if loader.refresh(args.max_distance):
+            publish_snapshot(loader.data, directory)
+    return 0
+
+
+# Export the shared-memory API
+__all__ = [
+    "shared_root",
+    "snapshot_dir",
+    "publish_snapshot",
+    "ensure_published",
+    "attach_snapshot",
+    "current_version",
+]
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
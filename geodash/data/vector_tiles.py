@@ -0,0 +1,650 @@
+"""
+Mapbox Vector Tile (MVT) export of field and farm polygons.
+An offline build step cuts the PolygonsLoader and FarmsLoader output into
+vector tiles at several zoom levels, with the field data (yield, area,
+additional water) joined in, and stores them in an MBTiles file. The map
+then loads only the visible tiles instead of inlining every polygon, so the
+field layer scales to hundreds of thousands of plots.
+
+The MVT protobuf encoding is written out by hand (NumPy only). Build with:
+
+    python -m geodash.data.vector_tiles --output geodash/data/tiles/polygons.mbtiles
+
+and point ``GEODASH_VECTOR_TILES`` at the file to use it in the map.
+"""
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, Union
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import struct
+import time
+
+import numpy as np
+import pandas as pd
+
+from .cache import hash_dataframe
+from .polygon_store import PolygonStore
+
+logger = logging.getLogger("VectorTiles")
+
+# Source layer names inside the tiles
+FIELDS_LAYER = "fields"
+FARMS_LAYER = "farms"
+
+# Tile grid: coordinate extent per tile, clipping buffer (in extent units)
+# and default zoom range (the map opens at zoom 10)
+EXTENT = 4096
+BUFFER = 64
+DEFAULT_MIN_ZOOM = 8
+DEFAULT_MAX_ZOOM = 16
+
+# Bumped when the tile content changes for the same input data
+FORMAT_VERSION = 1
+
+# Field yield colors: (position, fill, outline), as in the vector field layer
+YIELD_COLOR_STOPS = (
+    (0.0, "#a50f15", "#67000d"),
+    (0.25, "#de2d26", "#a50f15"),
+    (0.5, "#f0f0f0", "#bdbdbd"),
+    (0.75, "#31a354", "#238b45"),
+    (1.0, "#006d2c", "#00441b"),
+)
+MISSING_YIELD_COLORS = ("#bdbdbd", "#737373")
+
+# Geometry command integers (MVT spec 4.3): MoveTo(1), LineTo(n), ClosePath
+MOVE_TO_ONE = 1 | (1 << 3)
+CLOSE_PATH = 7 | (1 << 3)
+LINE_TO = 2
+POLYGON = 3
+
+
+# === Protobuf encoding ===
+
+def _encode_varints(values: np.ndarray) -> bytes:
+    """Encode non-negative integers as concatenated protobuf varints."""
+    values = np.asarray(values, dtype=np.uint64).ravel()
+    if len(values) == 0:
+        return b""
+    width = max(1, -(-int(values.max()).bit_length() // 7))
+    n_bytes = np.ones(len(values), dtype=np.int64)
+    for bits in range(7, 7 * width, 7):
+        n_bytes += values >= np.uint64(1 << bits)
+
+    shifts = np.arange(width, dtype=np.uint64) * np.uint64(7)
+    groups = ((values[:, None] >> shifts) & np.uint64(0x7F)).astype(np.uint8)
+    position = np.arange(width)
+    groups[position < n_bytes[:, None] - 1] |= 0x80
+    return groups[position < n_bytes[:, None]].tobytes()
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _length_delimited(number: int, payload: bytes) -> bytes:
+    return _field(number, 2) + _varint(len(payload)) + payload
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+@lru_cache(maxsize=65536, typed=True)
+def _encode_value(value: Any) -> bytes:
+    """Encode a tile Value message (string, double, uint, sint or bool)."""
+    if isinstance(value, (bool, np.bool_)):
+        return _field(7, 0) + _varint(int(value))
+    if isinstance(value, (int, np.integer)):
+        value = int(value)
+        if value >= 0:
+            return _field(5, 0) + _varint(value)
+        return _field(6, 0) + _varint(int(_zigzag([value])[0]))
+    if isinstance(value, (float, np.floating)):
+        return _field(3, 1) + struct.pack("<d", float(value))
+    return _length_delimited(1, str(value).encode("utf-8"))
+
+
+class _LayerEncoder:
+    """Collects the features of one tile layer with shared key/value tables."""
+
+    def __init__(self, name: str, extent: int = EXTENT):
+        self.name = name
+        self.extent = extent
+        self._keys: Dict[str, int] = {}
+        self._values: Dict[Tuple[type, Any], int] = {}
+        self._features: List[bytes] = []
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def add(self, feature_id: int, properties: Dict[str, Any], geometry: np.ndarray) -> None:
+        tags = []
+        for key, value in properties.items():
+            tags.append(self._keys.setdefault(key, len(self._keys)))
+            tags.append(self._values.setdefault((type(value), value), len(self._values)))
+        self._features.append(
+            _field(1, 0) + _varint(feature_id)
+            + _length_delimited(2, b"".join(_varint(tag) for tag in tags))
+            + _field(3, 0) + _varint(POLYGON)
+            + _length_delimited(4, _encode_varints(geometry))
+        )
+
+    def encode(self) -> bytes:
+        parts = [_field(15, 0) + _varint(2), _length_delimited(1, self.name.encode("utf-8"))]
+        parts.extend(_length_delimited(2, feature) for feature in self._features)
+        parts.extend(_length_delimited(3, key.encode("utf-8")) for key in self._keys)
+        parts.extend(_length_delimited(4, _encode_value(value)) for _, value in self._values)
+        parts.append(_field(5, 0) + _varint(self.extent))
+        return b"".join(parts)
+
+
+# === Geometry ===
+
+def _mercator(coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Project [lat, lon] pairs to normalized Web Mercator (x, y) in [0, 1]."""
+    lat = np.clip(coords[:, 0], -85.05112878, 85.05112878)
+    x = (coords[:, 1] + 180.0) / 360.0
+    y = (1.0 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2.0
+    return x, y
+
+
+def _clip_ring(points: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Clip a closed ring to the square [low, high]^2 (Sutherland-Hodgman)."""
+    if len(points) == 0 or (points.min() >= low and points.max() <= high):
+        return points
+    for axis in (0, 1):
+        for bound, keep_above in ((low, True), (high, False)):
+            if len(points) == 0:
+                return points
+            inside = points[:, axis] >= bound if keep_above else points[:, axis] <= bound
+            if inside.all():
+                continue
+            if not inside.any():
+                return points[:0]
+
+            previous = np.concatenate([points[-1:], points[:-1]])
+            previous_inside = np.concatenate([inside[-1:], inside[:-1]])
+            crossing = inside != previous_inside
+            delta = points[:, axis] - previous[:, axis]
+            t = np.where(crossing, (bound - previous[:, axis]) / np.where(delta == 0, 1, delta), 0.0)
+            intersection = previous + t[:, None] * (points - previous)
+
+            # Each edge (previous -> current) emits its crossing, then the current point
+            candidates = np.stack([intersection, points], axis=1).reshape(-1, 2)
+            emit = np.column_stack([crossing, inside]).ravel()
+            points = candidates[emit]
+    return points
+
+
+def _tile_ring(points: np.ndarray, exterior: bool) -> Optional[np.ndarray]:
+    """
+    Quantize a ring to integer tile coordinates with MVT winding.
+
+    Consecutive duplicate vertices are dropped; rings left without area
+    return None. Exterior rings get positive area (clockwise on screen),
+    holes negative.
+    """
+    ring = np.rint(points).astype(np.int64)
+    ring = ring[np.any(ring != ring[np.arange(-1, len(ring) - 1)], axis=1)]
+    if len(ring) < 3:
+        return None
+    following = ring[np.arange(1, len(ring) + 1) % len(ring)]
+    area2 = int(np.sum(ring[:, 0] * following[:, 1] - following[:, 0] * ring[:, 1]))
+    if area2 == 0:
+        return None
+    return ring if (area2 > 0) == exterior else ring[::-1]
+
+
+def _encode_rings(rings: List[np.ndarray]) -> np.ndarray:
+    """Geometry command integers of a polygon made of tile-coordinate rings."""
+    points = np.concatenate(rings)
+    deltas = _zigzag(np.diff(points, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)))
+
+    commands, start = [], 0
+    for ring in rings:
+        stop = start + len(ring)
+        commands.append(np.array([MOVE_TO_ONE, *deltas[start], LINE_TO | ((len(ring) - 1) << 3)], dtype=np.uint64))
+        commands.append(deltas[start + 1:stop].ravel())
+        commands.append(np.array([CLOSE_PATH], dtype=np.uint64))
+        start = stop
+    return np.concatenate(commands)
+
+
+def _polygon_geometry(store: PolygonStore, index: int, gx: np.ndarray, gy: np.ndarray, origin: Tuple[float, float]) -> Optional[np.ndarray]:
+    """
+    Geometry commands of one polygon clipped to a tile.
+
+    Args:
+        store: Polygon store
+        index: Polygon position
+        gx, gy: Vertex coordinates at the tile zoom, in extent units
+        origin: Tile origin (x, y) in the same units
+
+    Returns:
+        Command integers, or None when nothing of the polygon remains
+    """
+    rings = []
+    for part in range(store.polygon_offsets[index], store.polygon_offsets[index + 1]):
+        part_rings = []
+        for ring in range(store.part_offsets[part], store.part_offsets[part + 1]):
+            start, stop = store.ring_offsets[ring], store.ring_offsets[ring + 1]
+            points = np.column_stack([gx[start:stop] - origin[0], gy[start:stop] - origin[1]])
+            points = _clip_ring(points, -BUFFER, EXTENT + BUFFER)
+            tile_ring = _tile_ring(points, exterior=not part_rings) if len(points) else None
+            if tile_ring is None:
+                if not part_rings:
+                    break  # Exterior gone: skip the holes of this part
+                continue
+            part_rings.append(tile_ring)
+        rings.extend(part_rings)
+    return _encode_rings(rings) if rings else None
+
+
+def _polygon_bounds(store: PolygonStore, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalized Mercator bounds of every polygon with vertices.
+
+    Returns:
+        Tuple of (polygon indices, (n, 4) array of min_x, min_y, max_x, max_y)
+    """
+    vertex_starts = store.ring_offsets[store.part_offsets[store.polygon_offsets[:-1]]]
+    vertex_stops = store.ring_offsets[store.part_offsets[store.polygon_offsets[1:]]]
+    indices = np.flatnonzero(vertex_stops > vertex_starts)
+    if len(indices) == 0:
+        return indices, np.empty((0, 4))
+    # Polygon vertices are contiguous, so each reduceat segment is one polygon
+    starts = vertex_starts[indices]
+    bounds = np.column_stack([
+        np.minimum.reduceat(x, starts),
+        np.minimum.reduceat(y, starts),
+        np.maximum.reduceat(x, starts),
+        np.maximum.reduceat(y, starts),
+    ])
+    return indices, bounds
+
+
+def _tile_assignments(bounds: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Expand polygon bounds into (polygon row, tile x, tile y) triples.
+
+    Tiles are included when the polygon touches them or their buffer.
+    """
+    n = 2 ** zoom
+    margin = BUFFER / EXTENT
+    tx0 = np.clip(np.floor(bounds[:, 0] * n - margin), 0, n - 1).astype(np.int64)
+    ty0 = np.clip(np.floor(bounds[:, 1] * n - margin), 0, n - 1).astype(np.int64)
+    tx1 = np.clip(np.floor(bounds[:, 2] * n + margin), 0, n - 1).astype(np.int64)
+    ty1 = np.clip(np.floor(bounds[:, 3] * n + margin), 0, n - 1).astype(np.int64)
+
+    widths, heights = tx1 - tx0 + 1, ty1 - ty0 + 1
+    counts = widths * heights
+    rows = np.repeat(np.arange(len(bounds)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, tx0[rows] + offset % widths[rows], ty0[rows] + offset // widths[rows]
+
+
+# === Properties ===
+
+def _clean(value: Any) -> Any:
+    """Tile property value, or None for missing values."""
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _hex_colors(values: np.ndarray, stop_index: int) -> np.ndarray:
+    positions = [stop[0] for stop in YIELD_COLOR_STOPS]
+    channels = [
+        np.interp(values, positions, [int(stop[stop_index][1 + 2 * c:3 + 2 * c], 16) for stop in YIELD_COLOR_STOPS]).astype(int)
+        for c in range(3)
+    ]
+    return np.array([f"#{r:02x}{g:02x}{b:02x}" for r, g, b in zip(*channels)], dtype=object)
+
+
+def field_properties(fields: PolygonStore, field_data_df: Optional[pd.DataFrame]) -> List[Dict[str, Any]]:
+    """
+    Tile properties of every field, with the field data joined in.
+
+    Field data rows are matched on new_plot_code == plot_code. Yield colors
+    are normalized over the field data range, like the vector field layer.
+
+    Returns:
+        One property dict per field (missing values left out)
+    """
+    columns = {
+        key: fields.column(key) if key in fields.attribute_names else np.full(len(fields), None, dtype=object)
+        for key in ("name", "region", "plot_code")
+    }
+    joined = pd.DataFrame(index=pd.RangeIndex(len(fields)))
+    if len(fields) and field_data_df is not None and not field_data_df.empty and "new_plot_code" in field_data_df.columns:
+        lookup = field_data_df.assign(new_plot_code=field_data_df["new_plot_code"].astype(str))
+        lookup = lookup.drop_duplicates("new_plot_code", keep="last").set_index("new_plot_code")
+        plot_codes = pd.Series(columns["plot_code"]).map(lambda code: str(code) if code is not None else None)
+        joined = lookup.reindex(plot_codes.to_numpy()).reset_index(drop=True)
+
+    def numeric(column: str) -> np.ndarray:
+        return pd.to_numeric(joined[column], errors="coerce").to_numpy(dtype=float) if column in joined.columns else np.full(len(fields), np.nan)
+
+    yield_probability = numeric("yield_probability")
+    area_rai = numeric("average_area")
+    water_mm = numeric("average_additional_water(mm)")
+
+    fill = np.full(len(fields), MISSING_YIELD_COLORS[0], dtype=object)
+    stroke = np.full(len(fields), MISSING_YIELD_COLORS[1], dtype=object)
+    known = ~np.isnan(yield_probability)
+    if known.any():
+        low, high = np.nanmin(yield_probability), np.nanmax(yield_probability)
+        normalized = (yield_probability[known] - low) / (high - low) if high > low else np.full(known.sum(), 0.5)
+        fill[known] = _hex_colors(np.clip(normalized, 0.0, 1.0), 1)
+        stroke[known] = _hex_colors(np.clip(normalized, 0.0, 1.0), 2)
+
+    records = []
+    for i in range(len(fields)):
+        record = {
+            "name": _clean(columns["name"][i]),
+            "region": _clean(columns["region"][i]),
+            "plot_code": _clean(columns["plot_code"][i]),
+            "yield_probability": _clean(yield_probability[i]),
+            "area_rai": _clean(area_rai[i]),
+            "additional_water_mm": _clean(water_mm[i]),
+            "additional_water_m3": _clean(area_rai[i] * 1600.0 * water_mm[i] / 1000.0),
+            "fill": fill[i],
+            "stroke": stroke[i],
+        }
+        records.append({key: value for key, value in record.items() if value is not None})
+    return records
+
+
+def farm_properties(farms: PolygonStore) -> List[Dict[str, Any]]:
+    """Tile properties of every farm (name, id and styling)."""
+    keys = [key for key in ("name", "farm_id", "color", "fill_color", "fill_opacity", "weight") if key in farms.attribute_names]
+    columns = {key: farms.column(key) for key in keys}
+    records = []
+    for i in range(len(farms)):
+        record = {key: _clean(columns[key][i]) for key in keys}
+        records.append({key: value for key, value in record.items() if value is not None})
+    return records
+
+
+# === Tiling ===
+
+def _tile_layers(
+    layers: List[Tuple[str, PolygonStore, List[Dict[str, Any]]]],
+    zoom: int,
+) -> Dict[Tuple[int, int], List[_LayerEncoder]]:
+    """
+    Cut every layer into the tiles of one zoom level.
+
+    Returns:
+        (x, y) -> layer encoders with at least one feature
+    """
+    world = EXTENT * 2 ** zoom
+    tiles: Dict[Tuple[int, int], List[_LayerEncoder]] = {}
+    for name, store, properties in layers:
+        x, y = _mercator(store.coords)
+        indices, bounds = _polygon_bounds(store, x, y)
+        gx, gy = x * world, y * world
+
+        rows, tile_x, tile_y = _tile_assignments(bounds, zoom)
+        order = np.lexsort((rows, tile_y, tile_x))
+        rows, tile_x, tile_y = rows[order], tile_x[order], tile_y[order]
+        breaks = np.flatnonzero((np.diff(tile_x) != 0) | (np.diff(tile_y) != 0)) + 1
+
+        for group in np.split(np.arange(len(rows)), breaks):
+            if len(group) == 0:
+                continue
+            tx, ty = int(tile_x[group[0]]), int(tile_y[group[0]])
+            encoder = _LayerEncoder(name)
+            for row in rows[group]:
+                index = int(indices[row])
+                geometry = _polygon_geometry(store, index, gx, gy, (tx * EXTENT, ty * EXTENT))
+                if geometry is not None:
+                    encoder.add(index + 1, properties[index], geometry)
+            if len(encoder):
+                tiles.setdefault((tx, ty), []).append(encoder)
+    return tiles
+
+
+def build_mbtiles(
+    output: Union[str, Path],
+    fields: PolygonStore,
+    farms: Optional[PolygonStore] = None,
+    field_data_df: Optional[pd.DataFrame] = None,
+    min_zoom: int = DEFAULT_MIN_ZOOM,
+    max_zoom: int = DEFAULT_MAX_ZOOM,
+) -> Dict[str, object]:
+    """
+    Build an MBTiles file of field and farm vector tiles.
+
+    The file is written under a temporary name and moved into place, so
+    readers never see a partial tileset.
+
+    Args:
+        output: MBTiles file path
+        fields: Field polygons (source layer "fields")
+        farms: Farm polygons (source layer "farms")
+        field_data_df: Field data joined into the field properties
+        min_zoom: Lowest zoom level
+        max_zoom: Highest zoom level (the map overzooms beyond it)
+
+    Returns:
+        Summary: revision, tiles, bytes (gzipped tile data), seconds
+    """
+    started = time.perf_counter()
+    output = Path(output)
+    fields = PolygonStore.coerce(fields)
+    farms = PolygonStore.coerce(farms)
+
+    revision = tileset_revision(fields, farms, field_data_df, min_zoom, max_zoom)
+    layers = [
+        (FIELDS_LAYER, fields, field_properties(fields, field_data_df)),
+        (FARMS_LAYER, farms, farm_properties(farms)),
+    ]
+    layers = [layer for layer in layers if len(layer[1])]
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output.with_suffix(f".{os.getpid()}.tmp")
+    temp_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(temp_path)
+    n_tiles, n_bytes = 0, 0
+    try:
+        connection.executescript("""
+            CREATE TABLE metadata (name TEXT, value TEXT);
+            CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB);
+        """)
+        for zoom in range(min_zoom, max_zoom + 1):
+            for (tx, ty), encoders in _tile_layers(layers, zoom).items():
+                data = gzip.compress(b"".join(_length_delimited(3, encoder.encode()) for encoder in encoders), 6)
+                # MBTiles rows follow the TMS scheme (y flipped)
+                connection.execute("INSERT INTO tiles VALUES (?, ?, ?, ?)", (zoom, tx, 2 ** zoom - 1 - ty, data))
+                n_tiles += 1
+                n_bytes += len(data)
+            logger.info(f"🧩 Zoom {zoom}: {n_tiles} tiles so far")
+        connection.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+
+        store = PolygonStore.concat([fields, farms])
+        bounds = (
+            [float(np.nanmin(store.bboxes[:, 1])), float(np.nanmin(store.bboxes[:, 0])), float(np.nanmax(store.bboxes[:, 3])), float(np.nanmax(store.bboxes[:, 2]))]
+            if len(store) else [-180.0, -85.0, 180.0, 85.0]
+        )
+        vector_layers = [
+            {
+                "id": name,
+                "fields": {key: "Number" if isinstance(value, (int, float)) else "String" for record in properties for key, value in record.items()},
+                "minzoom": min_zoom,
+                "maxzoom": max_zoom,
+            }
+            for name, _, properties in layers
+        ]
+        metadata = {
+            "name": "geodash polygons",
+            "format": "pbf",
+            "type": "overlay",
+            "minzoom": str(min_zoom),
+            "maxzoom": str(max_zoom),
+            "bounds": ",".join(f"{value:.6f}" for value in bounds),
+            "center": f"{(bounds[0] + bounds[2]) / 2:.6f},{(bounds[1] + bounds[3]) / 2:.6f},{max(min_zoom, 10)}",
+            "json": json.dumps({"vector_layers": vector_layers}),
+            "revision": revision,
+        }
+        connection.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(temp_path, output)
+
+    summary = {"revision": revision, "tiles": n_tiles, "bytes": n_bytes, "seconds": round(time.perf_counter() - started, 2)}
+    logger.info(f"✅ Wrote {n_tiles} vector tiles ({n_bytes / 1e6:.1f} MB) to {output} in {summary['seconds']} s")
+    return summary
+
+
+def tileset_revision(
+    fields: PolygonStore,
+    farms: PolygonStore,
+    field_data_df: Optional[pd.DataFrame],
+    min_zoom: int,
+    max_zoom: int,
+) -> str:
+    """Content hash of the inputs of a tileset (used in tile URLs)."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{FORMAT_VERSION}:{min_zoom}:{max_zoom}:{fields.version}:{farms.version}".encode())
+    if field_data_df is not None:
+        digest.update(hash_dataframe(field_data_df).encode())
+    return digest.hexdigest()
+
+
+# === Reading ===
+
+class MBTiles:
+    """Read-only access to the tiles of an MBTiles file (thread-safe)."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = Lock()
+        self.metadata = dict(self._connection.execute("SELECT name, value FROM metadata").fetchall())
+
+    @property
+    def revision(self) -> str:
+        return self.metadata.get("revision", "0")
+
+    @property
+    def min_zoom(self) -> int:
+        return int(self.metadata.get("minzoom", DEFAULT_MIN_ZOOM))
+
+    @property
+    def max_zoom(self) -> int:
+        return int(self.metadata.get("maxzoom", DEFAULT_MAX_ZOOM))
+
+    def tile(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """
+        Gzipped MVT data of an XYZ tile.
+
+        Returns:
+            Tile bytes, or None when the tile holds no features
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, 2 ** z - 1 - y),
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+_mbtiles: Dict[str, Tuple[Tuple[int, int], MBTiles]] = {}
+_mbtiles_lock = Lock()
+
+
+def get_mbtiles(path: Union[str, Path]) -> Optional[MBTiles]:
+    """
+    Get an opened MBTiles file, reopened when the file is rebuilt.
+
+    Returns:
+        MBTiles, or None when the file does not exist
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+
+    with _mbtiles_lock:
+        cached_entry = _mbtiles.get(str(path))
+        if cached_entry is None or cached_entry[0] != fingerprint:
+            # The previous connection stays valid for requests still using it
+            _mbtiles[str(path)] = (fingerprint, MBTiles(path))
+            logger.info(f"🧩 Opened vector tiles {path}")
+        return _mbtiles[str(path)][1]
+
+
+def main(argv=None) -> int:
+    """Build the field and farm vector tiles from the dashboard data files."""
+    from .loader import DashboardDataLoader
+
+    parser = argparse.ArgumentParser(description="Build field/farm vector tiles (MBTiles)")
+    parser.add_argument("--output", type=Path, required=True, help="MBTiles file to write")
+    parser.add_argument("--data-dir", default="geodash/data", help="Dashboard data directory")
+    parser.add_argument("--min-zoom", type=int, default=DEFAULT_MIN_ZOOM, help="Lowest zoom level")
+    parser.add_argument("--max-zoom", type=int, default=DEFAULT_MAX_ZOOM, help="Highest zoom level")
+    args = parser.parse_args(argv)
+
+    loader = DashboardDataLoader(args.data_dir)
+    try:
+        field_data_df = pd.read_csv(loader.field_csv_path)
+    except Exception as e:
+        logger.warning(f"⚠️  Could not load field data CSV: {e}")
+        field_data_df = pd.DataFrame()
+
+    build_mbtiles(
+        args.output,
+        loader.polygons_loader.load(),
+        loader.farms_loader.load(),
+        field_data_df,
+        min_zoom=args.min_zoom,
+        max_zoom=args.max_zoom,
+    )
+    return 0
+
+
+# Export the vector tile API
+__all__ = [
+    "FIELDS_LAYER",
+    "FARMS_LAYER",
+    "build_mbtiles",
+    "tileset_revision",
+    "field_properties",
+    "farm_properties",
+    "MBTiles",
+    "get_mbtiles",
+]
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
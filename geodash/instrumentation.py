@@ -0,0 +1,261 @@
+"""
+Performance instrumentation for the geological dashboard.
+Records timing and memory spans for loader phases, map layers, page renders
+and external service calls into an in-process ring buffer. Spans can be
+exported as JSON or Prometheus text and are shown in the debug sidebar panel.
+"""
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, local
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+import json
+import os
+import threading
+import time
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+# Set GEODASH_INSTRUMENTATION=0 to turn span recording off
+ENABLED = os.environ.get("GEODASH_INSTRUMENTATION", "1") != "0"
+
+# Number of most recent spans kept in memory
+MAX_SPANS = 4096
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_spans: Deque[Dict[str, object]] = deque(maxlen=MAX_SPANS)
+_spans_lock = Lock()
+_active = local()
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size in MB (Linux /proc), or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE / 1024 ** 2
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process in MB, or None if unavailable."""
+    if not RESOURCE_AVAILABLE:
+        return None
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def span(name: str, category: str = "app", **attributes) -> Iterator[Dict[str, object]]:
+    """
+    Time a block of code and record it as a span.
+
+    Args:
+        name: Span name, e.g. "loader.wells_df" or "map.wells"
+        category: Span group: "loader", "map", "page", "external" or "app"
+        **attributes: Extra JSON-serializable values stored with the span
+
+    Yields:
+        The span record; attributes may be added to it inside the block
+    """
+    if not ENABLED:
+        yield {}
+        return
+
+    stack = getattr(_active, "stack", None)
+    if stack is None:
+        stack = _active.stack = []
+
+    record: Dict[str, object] = {
+        "name": name,
+        "category": category,
+        "parent": stack[-1] if stack else None,
+        "depth": len(stack),
+        "thread": threading.current_thread().name,
+        "start": time.time(),
+        **attributes,
+    }
+    rss_start = current_rss_mb()
+    started = time.perf_counter()
+    stack.append(name)
+    try:
+        yield record
+        record["status"] = "ok"
+    except BaseException as e:
+        record["status"] = "error"
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        stack.pop()
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        rss_end = current_rss_mb()
+        if rss_start is not None and rss_end is not None:
+            record["rss_mb"] = round(rss_end, 1)
+            record["rss_delta_mb"] = round(rss_end - rss_start, 2)
+        with _spans_lock:
+            _spans.append(record)
+
+
+def instrumented(name: Optional[str] = None, category: str = "app") -> Callable:
+    """
+    Decorator recording every call of a function as a span.
+
+    Args:
+        name: Span name (default: module.qualname of the function)
+        category: Span group (see ``span``)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_spans(category: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, object]]:
+    """
+    Get recorded spans, oldest first.
+
+    Args:
+        category: Only return spans of this category
+        limit: Only return the most recent ``limit`` spans
+
+    Returns:
+        List of span dictionaries
+    """
+    with _spans_lock:
+        spans = [dict(record) for record in _spans]
+    if category is not None:
+        spans = [record for record in spans if record["category"] == category]
+    if limit is not None:
+        spans = spans[-limit:]
+    return spans
+
+
+def clear_spans() -> None:
+    """Drop all recorded spans."""
+    with _spans_lock:
+        _spans.clear()
+
+
+def summarize_spans(spans: Optional[List[Dict[str, object]]] = None) -> List[Dict[str, object]]:
+    """
+    Aggregate spans by (category, name).
+
+    Returns:
+        List of dictionaries with count, total/mean/max duration (ms) and
+        error count, slowest total first
+    """
+    spans = get_spans() if spans is None else spans
+    groups: Dict[tuple, Dict[str, object]] = {}
+    for record in spans:
+        key = (record["category"], record["name"])
+        group = groups.setdefault(key, {
+            "category": key[0], "name": key[1], "count": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "errors": 0,
+        })
+        group["count"] += 1
+        group["total_ms"] += record["duration_ms"]
+        group["max_ms"] = max(group["max_ms"], record["duration_ms"])
+        group["errors"] += record.get("status") == "error"
+
+    summary = sorted(groups.values(), key=lambda group: group["total_ms"], reverse=True)
+    for group in summary:
+        group["mean_ms"] = round(group["total_ms"] / group["count"], 3)
+        group["total_ms"] = round(group["total_ms"], 3)
+    return summary
+
+
+def export_json(limit: Optional[int] = None) -> str:
+    """Export recorded spans (and process memory) as a JSON document."""
+    return json.dumps({
+        "generated_at": time.time(),
+        "rss_mb": current_rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+        "spans": get_spans(limit=limit),
+    }, ensure_ascii=False, default=str)
+
+
+def _label(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def export_prometheus() -> str:
+    """
+    Export span aggregates, process memory and cache counters as Prometheus text.
+
+    Returns:
+        Text in the Prometheus exposition format (version 0.0.4)
+    """
+    lines = [
+        "# HELP geodash_span_duration_seconds Duration of instrumented spans in the ring buffer.",
+        "# TYPE geodash_span_duration_seconds summary",
+    ]
+    summary = summarize_spans()
+    for group in summary:
+        labels = f'category="{_label(group["category"])}",name="{_label(group["name"])}"'
+        lines.append(f"geodash_span_duration_seconds_count{{{labels}}} {group['count']}")
+        lines.append(f"geodash_span_duration_seconds_sum{{{labels}}} {group['total_ms'] / 1000:.6f}")
+
+    lines += [
+        "# HELP geodash_span_duration_max_seconds Slowest span in the ring buffer.",
+        "# TYPE geodash_span_duration_max_seconds gauge",
+    ]
+    for group in summary:
+        labels = f'category="{_label(group["category"])}",name="{_label(group["name"])}"'
+        lines.append(f"geodash_span_duration_max_seconds{{{labels}}} {group['max_ms'] / 1000:.6f}")
+
+    lines += [
+        "# HELP geodash_span_errors Spans that raised an exception.",
+        "# TYPE geodash_span_errors gauge",
+    ]
+    for group in summary:
+        labels = f'category="{_label(group["category"])}",name="{_label(group["name"])}"'
+        lines.append(f"geodash_span_errors{{{labels}}} {group['errors']}")
+
+    rss, peak = current_rss_mb(), peak_rss_mb()
+    if rss is not None:
+        lines += ["# TYPE geodash_resident_memory_bytes gauge", f"geodash_resident_memory_bytes {int(rss * 1024 ** 2)}"]
+    if peak is not None:
+        lines += ["# TYPE geodash_peak_resident_memory_bytes gauge", f"geodash_peak_resident_memory_bytes {int(peak * 1024 ** 2)}"]
+
+    # Streamlit cache counters, if the caching layer has been imported
+    try:
+        from geodash.data.cache import get_cache_stats
+        cache_stats = get_cache_stats()
+    except ImportError:
+        cache_stats = {}
+    if cache_stats:
+        lines += ["# TYPE geodash_cache_calls_total counter"]
+        lines += [f'geodash_cache_calls_total{{function="{_label(fn)}"}} {stats["calls"]}' for fn, stats in cache_stats.items()]
+        lines += ["# TYPE geodash_cache_misses_total counter"]
+        lines += [f'geodash_cache_misses_total{{function="{_label(fn)}"}} {stats["misses"]}' for fn, stats in cache_stats.items()]
+
+    return "\n".join(lines) + "\n"
+
+
+# Export the instrumentation API
+__all__ = [
+    "span",
+    "instrumented",
+    "get_spans",
+    "clear_spans",
+    "summarize_spans",
+    "export_json",
+    "export_prometheus",
+    "current_rss_mb",
+    "peak_rss_mb",
+]
@@ -1,18 +1,72 @@
 """
 Page module for the Badan geological dashboard.
 Each page is a separate module for better organization.
+
+Page modules (and the heavy libraries they pull in, such as folium, altair,
+plotly or chromadb) are imported on first access of their renderer, so the
+app only pays for the pages a user actually opens.
 """
+from importlib import import_module
+from typing import Callable
+
+# Renderer name -> page module that defines it
+_RENDERER_MODULES = {
+    "render_main_dashboard": ".main_dashboard",
+    "render_general_dashboard": ".general_dashboard",
+    "render_water_survival": ".water_survival",
+    "render_water_station_page": ".water_station",
+    "render_discovery": ".discovery",
+    "render_ai_assistant": ".ai_assistant",
+    "render_fields_analysis": ".fields_analysis",
+}
+
+# Sidebar menu title -> renderer name
+PAGE_REGISTRY = {
+    "General Dashboard": "render_general_dashboard",
+    "Rain Data Analysis": "render_water_survival",
+    "Water Survival Analysis": "render_water_station_page",
+    "Underground Water Discovery": "render_discovery",
+    "Fields Analysis": "render_fields_analysis",
+    "AI Assistant": "render_ai_assistant",
+}
+
+
+def get_page_renderer(page_name: str) -> Callable:
+    """
+    Get the renderer for a sidebar page, importing its module on first use.
+
+    Args:
+        page_name: Sidebar menu title (a key of PAGE_REGISTRY)
+
+    Returns:
+        Page render function
+    """
+    return __getattr__(PAGE_REGISTRY[page_name])
+
+
+def __getattr__(name: str):
+    """Import page renderers lazily (PEP 562)."""
+    module_name = _RENDERER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    renderer = getattr(import_module(module_name, __name__), name)
+    globals()[name] = renderer  # Later lookups skip __getattr__
+    return renderer
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_RENDERER_MODULES))
 
-from .main_dashboard import render_main_dashboard
-from .water_survival import render_water_survival
-from .discovery import render_discovery
-from .ai_assistant import render_ai_assistant
-from .fields_analysis import render_fields_analysis
 
 __all__ = [
     "render_main_dashboard",
+    "render_general_dashboard",
     "render_water_survival",
+    "render_water_station_page",
     "render_discovery",
     "render_ai_assistant",
     "render_fields_analysis",
-]
\ No newline at end of file
+    "PAGE_REGISTRY",
+    "get_page_renderer",
+]
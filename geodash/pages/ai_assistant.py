@@ -11,6 +11,7 @@ from geodash.services.knowledge_base_rag import (
     BilingualRAGChatbot,
     KnowledgeBaseUI,
 )
+from geodash.instrumentation import instrumented, span
 
 
 def validate_openrouter_key(api_key: str) -> tuple[bool, str]:
@@ -27,12 +28,13 @@ def validate_openrouter_key(api_key: str) -> tuple[bool, str]:
             "max_tokens": 10
         }
         
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers=headers,
-            json=test_payload,
-            timeout=10
-        )
+        with span("external.openrouter.validate_key", "external"):
+            response = requests.post(
+                "https://openrouter.ai/api/v1/chat/completions",
+                headers=headers,
+                json=test_payload,
+                timeout=10
+            )
         
         if response.status_code == 200:
             return True, "✅ API key validated successfully! / ตรวจสอบ API key สำเร็จ!"
@@ -125,6 +127,7 @@ def render_api_key_form() -> bool:
     return False
 
 
+@instrumented("page.ai_assistant", "page")
 def render_ai_assistant(data: Dict) -> None:
     """
     Render the bilingual AI Assistant page.
@@ -11,8 +11,10 @@ from geodash.ui import (
     chart_probability_by_depth,
     metadata_panel,
 )
+from geodash.instrumentation import instrumented
 
 
+@instrumented("page.discovery", "page")
 def render_discovery(
     data: Dict,
     filtered_wells: pd.DataFrame,
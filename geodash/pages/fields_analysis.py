@@ -2,21 +2,26 @@
 Fields Analysis page - Comprehensive farm and field analysis with custom layout.
 Updated to use 'average_yield' from field_data.csv instead of yield_probability.
 """
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 import pandas as pd
 import streamlit as st
 import folium
 from streamlit_folium import st_folium
 import altair as alt
 
+from geodash.data.cache import cached
+from geodash.data.polygon_store import PolygonStore, PolygonView
+from geodash.instrumentation import instrumented
 
-def calculate_farm_statistics(field_data_df: pd.DataFrame, farm_polygons: List[Dict]) -> pd.DataFrame:
+
+@cached(ttl=3600, max_entries=16)
+def calculate_farm_statistics(field_data_df: pd.DataFrame, farm_polygons: PolygonStore) -> pd.DataFrame:
     """
     Calculate statistics for each farm from field data.
     
     Args:
         field_data_df: DataFrame with field data
-        farm_polygons: List of farm polygon dictionaries
+        farm_polygons: Farm polygons (PolygonStore or list of dictionaries)
         
     Returns:
         DataFrame with farm statistics
@@ -138,28 +143,27 @@ def render_farms_dashboard(farm_stats_df: pd.DataFrame) -> None:
 
 
 def build_farm_map(
-    selected_farm: Dict,
-    field_polygons: List[Dict],
+    selected_farm: PolygonView,
+    field_polygons: PolygonStore,
     field_data_df: pd.DataFrame
 ) -> Dict:
     """
     Build map showing only selected farm and its fields.
     
     Args:
-        selected_farm: Selected farm polygon dictionary
+        selected_farm: Selected farm polygon
         field_polygons: All field polygons
         field_data_df: DataFrame with field data
         
     Returns:
         Map state dictionary
     """
-    # Calculate center of farm
-    farm_coords = selected_farm.get('coordinates', [])
-    if not farm_coords:
+    # Center on the farm's precomputed centroid
+    farm_coords = selected_farm.coords
+    if len(farm_coords) == 0:
         center_lat, center_lon = 14.95, 99.62
     else:
-        center_lat = sum(coord[0] for coord in farm_coords) / len(farm_coords)
-        center_lon = sum(coord[1] for coord in farm_coords) / len(farm_coords)
+        center_lat, center_lon = selected_farm.centroid
     
     # Create map
     fmap = folium.Map(
@@ -168,10 +172,9 @@ def build_farm_map(
         tiles="OpenStreetMap"
     )
     
-    # Add farm boundary
-    farm_coords_closed = farm_coords + [farm_coords[0]]
+    # Add farm boundary with all parts and holes (Leaflet closes rings)
     folium.Polygon(
-        locations=farm_coords_closed,
+        locations=selected_farm.locations,
         color=selected_farm.get('color', '#FF6B6B'),
         weight=3,
         fill=True,
@@ -222,12 +225,11 @@ def build_farm_map(
             return ("#de2d26", "#a50f15")  # Red - Poor
     
     # Add field polygons
-    for field_poly in field_polygons:
-        field_coords = field_poly.get('coordinates', [])
-        if not field_coords:
+    for field_poly in PolygonStore.coerce(field_polygons):
+        field_coords = field_poly.coords
+        if len(field_coords) == 0:
             continue
         
-        field_coords_closed = field_coords + [field_coords[0]]
         plot_code = str(field_poly.get('plot_code', '')) if field_poly.get('plot_code') is not None else None
         row = field_lookup.get(plot_code) if plot_code else None
         
@@ -264,7 +266,7 @@ def build_farm_map(
             popup_html += "Data: N/A"
         
         folium.Polygon(
-            locations=field_coords_closed,
+            locations=field_poly.locations,
             color=outline_color,
             weight=2,
             fill=True,
@@ -281,8 +283,8 @@ def build_farm_map(
 
 
 def render_field_information(
-    selected_farm: Dict,
-    field_polygons: List[Dict],
+    selected_farm: PolygonView,
+    field_polygons: PolygonStore,
     field_data_df: pd.DataFrame,
     map_state: Dict
 ) -> None:
@@ -290,8 +292,8 @@ def render_field_information(
     Render field information panel on the right side.
     
     Args:
-        selected_farm: Selected farm dictionary
-        field_polygons: List of field polygons
+        selected_farm: Selected farm polygon
+        field_polygons: Field polygons
         field_data_df: DataFrame with field data
         map_state: Current map state
     """
@@ -315,12 +317,10 @@ def render_field_information(
         click_lon = map_state['last_object_clicked'].get('lng')
         
         if click_lat and click_lon:
-            # Find which field was clicked
-            for field in field_polygons:
-                field_coords = field.get('coordinates', [])
-                if _point_in_polygon(click_lat, click_lon, field_coords):
-                    clicked_field = field
-                    break
+            # Find which field was clicked (bbox prefilter + ray casting)
+            field_index = field_polygons.locate(click_lat, click_lon)
+            if field_index >= 0:
+                clicked_field = field_polygons[field_index]
     
     # Display clicked field details or field list
     if clicked_field:
@@ -415,37 +415,7 @@ def render_field_information(
                     st.markdown(f"{i}. {field['name']} ({field['region']})")
 
 
-def _point_in_polygon(lat: float, lon: float, polygon_coords: List[List[float]]) -> bool:
-    """
-    Check if a point is inside a polygon using ray casting algorithm.
-    
-    Args:
-        lat: Point latitude
-        lon: Point longitude
-        polygon_coords: List of [lat, lon] coordinates
-        
-    Returns:
-        True if point is inside polygon
-    """
-    x, y = lon, lat
-    n = len(polygon_coords)
-    inside = False
-    
-    p1x, p1y = polygon_coords[0][1], polygon_coords[0][0]  # lon, lat
-    for i in range(1, n + 1):
-        p2x, p2y = polygon_coords[i % n][1], polygon_coords[i % n][0]
-        if y > min(p1y, p2y):
-            if y <= max(p1y, p2y):
-                if x <= max(p1x, p2x):
-                    if p1y != p2y:
-                        xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                    if p1x == p2x or x <= xinters:
-                        inside = not inside
-        p1x, p1y = p2x, p2y
-    
-    return inside
-
-
+@instrumented("page.fields_analysis", "page")
 def render_fields_analysis(data: Dict) -> None:
     """
     Main render function for Fields Analysis page.
@@ -454,8 +424,8 @@ def render_fields_analysis(data: Dict) -> None:
         data: Complete dashboard data
     """
     # Extract data
-    farm_polygons = data.get('farm_polygons', [])
-    field_polygons = data.get('polygons', [])
+    farm_polygons = PolygonStore.coerce(data.get('farm_polygons'))
+    field_polygons = PolygonStore.coerce(data.get('polygons'))
     field_data_df = data.get('field_data_df')
     
     if not farm_polygons:
@@ -475,17 +445,18 @@ def render_fields_analysis(data: Dict) -> None:
     st.markdown("## 🔍 Individual Farm Analysis")
     
     # Farm selector
-    farm_names = [farm['name'] for farm in farm_polygons]
+    farm_names = farm_polygons.column('name').tolist()
     selected_farm_name = st.selectbox(
         "Select Farm",
         options=farm_names,
-        index=0
+        index=0,
+        key="selected_farm"
     )
     
     # Get selected farm
-    selected_farm = next((f for f in farm_polygons if f['name'] == selected_farm_name), None)
+    selected_farm = farm_polygons[farm_names.index(selected_farm_name)] if selected_farm_name in farm_names else None
     
-    if not selected_farm:
+    if selected_farm is None:
         st.error("❌ Selected farm not found")
         return
     
@@ -13,8 +13,10 @@ from geodash.ui import (
     chart_survival_rate,
     metadata_panel,
 )
+from geodash.instrumentation import instrumented
 
 
+@instrumented("page.general_dashboard", "page")
 def render_general_dashboard(
     data: Dict,
     filtered_wells: pd.DataFrame,
@@ -11,8 +11,10 @@ from geodash.ui import (
     metadata_panel,
     download_button,
 )
+from geodash.instrumentation import instrumented
 
 
+@instrumented("page.main_dashboard", "page")
 def render_main_dashboard(
     data: Dict,
     filtered_wells: pd.DataFrame,
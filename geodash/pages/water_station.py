@@ -7,24 +7,23 @@ import plotly.express as px
 import plotly.graph_objects as go
 from typing import Dict, Any, Optional
 
-from geodash.data.data_loaders.water_stations_loader import WaterStationsLoader
+from geodash.data.data_loaders.water_stations_loader import get_station_repository
+from geodash.instrumentation import instrumented
 
 
+@instrumented("page.water_station", "page")
 def render_water_station_page() -> None:
     """Render the water station analysis page."""
     st.title("🏭 Water Station Analysis")
     st.markdown("Analyze survival rates of water stations from 2010-2025")
     
-    # Initialize loader
-    loader = WaterStationsLoader()
-    
-    # Load data
+    # Shared, indexed station data (loaded once per process)
     with st.spinner("Loading water station data..."):
-        data = loader.load_data()
+        repository = get_station_repository()
     
-    stations_df = data["stations_df"]
-    survival_years = data["survival_years"]
-    stations_summary = data["stations_summary"]
+    stations_df = repository.stations_df
+    survival_years = repository.survival_years
+    stations_summary = repository.stations_summary
     
     if stations_df.empty:
         st.error("❌ No water station data available")
@@ -56,30 +55,31 @@ def render_water_station_page() -> None:
         st.markdown("### 🎛️ Station Selection")
         
         # Station selection
-        station_options = stations_df['station_id'].unique().tolist() if 'station_id' in stations_df.columns else []
+        station_options = repository.station_ids
         selected_station = st.selectbox(
             "Select Station (หมายเลขสถานี)",
             options=station_options,
             index=0 if station_options else None,
-            help="Choose a water station to analyze"
+            help="Choose a water station to analyze",
+            key="selected_station"
         )
         
         # Well selection (based on selected station)
         well_options = []
         if selected_station and 'well_number' in stations_df.columns:
-            station_wells = stations_df[stations_df['station_id'] == selected_station]['well_number'].unique()
-            well_options = ['All Wells'] + station_wells.tolist()
+            well_options = ['All Wells'] + repository.wells(selected_station)
         
         selected_well = st.selectbox(
             "Select Well (หมายเลขบ่อ)",
             options=well_options,
             index=0 if well_options else None,
-            help="Choose a specific well or view all wells for the station"
+            help="Choose a specific well or view all wells for the station",
+            key="selected_station_well"
         )
         
         # Display station information
         if selected_station:
-            station_info = stations_df[stations_df['station_id'] == selected_station].iloc[0]
+            station_info = repository.station_info(selected_station)
             
             st.markdown("### 📍 Station Information")
             st.markdown(f"**Station ID:** {selected_station}")
@@ -91,7 +91,7 @@ def render_water_station_page() -> None:
                 st.markdown(f"**Coordinates:** {station_info['latitude']:.4f}, {station_info['longitude']:.4f}")
             
             # Show wells count for this station
-            wells_count = len(stations_df[stations_df['station_id'] == selected_station])
+            wells_count = repository.well_count(selected_station)
             st.markdown(f"**Wells at Station:** {wells_count}")
     
     with col_right:
@@ -100,7 +100,7 @@ def render_water_station_page() -> None:
             
             # Get survival data for charting
             well_param = None if selected_well == 'All Wells' else selected_well
-            chart_data = loader.get_survival_data_for_chart(selected_station, well_param)
+            chart_data = repository.get_survival_data_for_chart(selected_station, well_param)
             
             if "error" in chart_data:
                 st.error(f"❌ {chart_data['error']}")
@@ -113,17 +113,18 @@ def render_water_station_page() -> None:
                 st.markdown("### 📈 Statistics")
                 col_stat1, col_stat2, col_stat3 = st.columns(3)
                 
-                survival_rates = chart_data["survival_rates"]
+                # Precomputed at load time by the station repository
+                stats = chart_data["trend"]
                 with col_stat1:
-                    st.metric("Average Survival Rate", f"{sum(survival_rates)/len(survival_rates):.2%}")
+                    st.metric("Average Survival Rate", f"{stats['mean']:.2%}")
                 with col_stat2:
-                    st.metric("Highest Rate", f"{max(survival_rates):.2%}")
+                    st.metric("Highest Rate", f"{stats['max']:.2%}")
                 with col_stat3:
-                    st.metric("Lowest Rate", f"{min(survival_rates):.2%}")
+                    st.metric("Lowest Rate", f"{stats['min']:.2%}")
                 
                 # Show trend
-                if len(survival_rates) >= 2:
-                    trend = survival_rates[-1] - survival_rates[0]
+                if stats["n_years"] >= 2:
+                    trend = stats["change"]
                     trend_icon = "📈" if trend > 0 else "📉" if trend < 0 else "➡️"
                     st.markdown(f"**Trend (2010-2024):** {trend_icon} {trend:+.2%}")
                 
@@ -167,6 +168,75 @@ def render_water_station_page() -> None:
         )
         
         st.plotly_chart(overall_fig, use_container_width=True)
+    
+    render_aquifer_comparison(repository)
+
+
+CUBE_LEVEL_NAMES = {
+    "basin_formation": "Basin × Aquifer Formation",
+    "basin": "Groundwater Basin",
+    "formation": "Aquifer Formation",
+    "province": "Province",
+    "district": "Province × District",
+}
+
+
+def render_aquifer_comparison(repository) -> None:
+    """Compare survival across basins, aquifer formations or areas (precomputed cubes)."""
+    st.markdown("---")
+    st.markdown("### 🪨 Aquifer & Area Comparison")
+    
+    levels = [level for level in CUBE_LEVEL_NAMES if level in repository.cubes]
+    if not levels:
+        st.info("No basin or formation data available")
+        return
+    
+    col_level, col_members = st.columns([1, 2])
+    with col_level:
+        level_name = st.selectbox(
+            "Group by",
+            options=[CUBE_LEVEL_NAMES[level] for level in levels],
+            key="cube_level"
+        )
+        level = next(level for level in levels if CUBE_LEVEL_NAMES[level] == level_name)
+    
+    labels = repository.cube_labels(level)
+    with col_members:
+        selected_labels = st.multiselect(
+            "Compare",
+            options=labels,
+            default=labels[:5],
+            help="Groups are ordered by number of wells",
+            key=f"cube_labels_{level}"
+        )
+    
+    if not selected_labels:
+        st.info("👆 Select groups to compare")
+        return
+    
+    cube = repository.query_cube(level, labels=selected_labels)
+    cube = cube.assign(label=cube["label"].astype(str))
+    
+    fig = px.line(
+        cube,
+        x="year",
+        y="mean_survival",
+        color="label",
+        markers=True,
+        hover_data={"n_wells": True, "n_stations": True},
+        labels={"year": "Year", "mean_survival": "Average Survival Rate", "label": CUBE_LEVEL_NAMES[level]}
+    )
+    fig.update_layout(
+        yaxis=dict(tickformat='.1%'),
+        template='plotly_white',
+        height=450,
+        legend=dict(orientation="h", yanchor="top", y=-0.2)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Survival by Year"):
+        table = cube.pivot(index="label", columns="year", values="mean_survival")
+        st.dataframe(table.style.format("{:.1%}"), use_container_width=True)
 
 
 def create_survival_rate_chart(chart_data: Dict[str, Any], station_id: str, well_number: str) -> go.Figure:
@@ -188,18 +258,12 @@ def create_survival_rate_chart(chart_data: Dict[str, Any], station_id: str, well
         hovertemplate='<b>Year:</b> %{x}<br><b>Survival Rate:</b> %{y:.2%}<extra></extra>'
     ))
     
-    # Add trend line if we have enough data points
-    if len(years) >= 3:
-        import numpy as np
-        # Simple linear regression for trend line
-        x_vals = np.array(years)
-        y_vals = np.array(survival_rates)
-        z = np.polyfit(x_vals, y_vals, 1)
-        p = np.poly1d(z)
-        
+    # Add trend line (precomputed linear fit) if we have enough data points
+    trend = chart_data.get("trend")
+    if trend and len(years) >= 3:
         fig.add_trace(go.Scatter(
             x=years,
-            y=p(x_vals),
+            y=[trend["slope"] * year + trend["intercept"] for year in years],
             mode='lines',
             name='Trend',
             line=dict(color='red', width=2, dash='dash'),
@@ -15,8 +15,10 @@ from geodash.ui import (
     metadata_panel,
 )
 from geodash.data.rain_service import get_rain_service
+from geodash.instrumentation import instrumented
 
 
+@instrumented("page.water_survival", "page")
 def render_water_survival(
     data: Dict,
     filtered_wells: pd.DataFrame,
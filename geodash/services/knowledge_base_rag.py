@@ -10,6 +10,8 @@ from typing import List, Dict, Optional, Tuple
 import streamlit as st
 import requests
 
+from geodash.instrumentation import span
+
 # Vector database imports
 try:
     import chromadb
@@ -168,11 +170,12 @@ class KnowledgeBaseManager:
             ids = [f"{doc_id}_chunk_{i}" for i in range(len(chunks))]
             metadatas = [{**metadata, "chunk_index": i, "doc_id": doc_id} for i in range(len(chunks))]
             
-            self.collection.add(
-                documents=chunks,
-                metadatas=metadatas,
-                ids=ids
-            )
+            with span("external.chroma.add", "external", chunks=len(chunks)):
+                self.collection.add(
+                    documents=chunks,
+                    metadatas=metadatas,
+                    ids=ids
+                )
         except Exception as e:
             st.warning(f"Vector DB indexing failed: {e}")
     
@@ -182,10 +185,11 @@ class KnowledgeBaseManager:
             return []
         
         try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results
-            )
+            with span("external.chroma.query", "external"):
+                results = self.collection.query(
+                    query_texts=[query],
+                    n_results=n_results
+                )
             
             formatted_results = []
             
@@ -298,7 +302,8 @@ class BilingualRAGChatbot:
                 "temperature": 0.7,
             }
             
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
+            with span("external.openrouter.chat", "external", model=self.model):
+                response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
             response.raise_for_status()
             data = response.json()
             
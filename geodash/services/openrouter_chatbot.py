@@ -8,6 +8,8 @@ import requests
 from typing import List, Dict, Optional
 import streamlit as st
 
+from geodash.instrumentation import span
+
 
 class BilingualChatbot:
     """
@@ -169,12 +171,13 @@ are approximate and recommend professional surveys."""
                 "temperature": 0.7,
             }
             
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            with span("external.openrouter.chat", "external", model=self.model):
+                response = requests.post(
+                    self.api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=30
+                )
             
             response.raise_for_status()
             data = response.json()
@@ -1,28 +1,50 @@
 # geodash/ui/__init__.py - Updated for farm-based time series
-from .map_panel import (
-    build_map,
-    build_map_with_controls,
-    build_map_with_floating_controls,
-    build_map_with_button_bar,
-)
-from .charts import (
-    chart_farm_survival_analytics,    # NEW: Farm-based time series analysis
-    chart_ground_water_analytics,     # Legacy function (redirects to farm analytics)
-    chart_region_comparison,          # NEW: Compare regions
-    chart_seasonal_analysis,          # NEW: Seasonal analysis
-    chart_survival_rate,
-    chart_probability_by_depth,
-    chart_cost_estimation,
-    chart_rain_statistics,
-    chart_rain_frequency,
-)
-from .widgets import metadata_panel, download_button
+# Submodules are imported on first attribute access (PEP 562) so that folium
+# and altair are only loaded by the pages that use them.
+from importlib import import_module
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "build_map": ".map_panel",
+    "build_map_with_controls": ".map_panel",
+    "build_map_with_floating_controls": ".map_panel",
+    "build_map_with_button_bar": ".map_panel",
+    "build_folium_map": ".map_panel",
+    "chart_farm_survival_analytics": ".charts",    # NEW: Farm-based time series analysis
+    "chart_ground_water_analytics": ".charts",     # Legacy function (redirects to farm analytics)
+    "chart_region_comparison": ".charts",          # NEW: Compare regions
+    "chart_seasonal_analysis": ".charts",          # NEW: Seasonal analysis
+    "chart_survival_rate": ".charts",
+    "chart_probability_by_depth": ".charts",
+    "chart_cost_estimation": ".charts",
+    "chart_rain_statistics": ".charts",
+    "chart_rain_frequency": ".charts",
+    "metadata_panel": ".widgets",
+    "download_button": ".widgets",
+    "debug_panel": ".widgets",                     # Performance spans and cache counters
+}
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
 
 __all__ = [
     "build_map",
     "build_map_with_controls",
-    "build_map_with_floating_controls", 
+    "build_map_with_floating_controls",
     "build_map_with_button_bar",
+    "build_folium_map",
     "chart_farm_survival_analytics",    # NEW
     "chart_ground_water_analytics",     # Legacy compatibility
     "chart_region_comparison",          # NEW
@@ -34,4 +56,5 @@ __all__ = [
     "chart_rain_frequency",
     "metadata_panel",
     "download_button",
-]
\ No newline at end of file
+    "debug_panel",
+]
@@ -6,6 +6,8 @@ import altair as alt
 import pandas as pd
 import streamlit as st
 
+from geodash.data.cache import cached
+
 
 def chart_farm_survival_analytics(farm_time_series: pd.DataFrame, selected_region: Optional[str]) -> None:
     """
@@ -160,18 +162,18 @@ def chart_survival_rate(wells_df: pd.DataFrame) -> None:
     st.altair_chart(pie, use_container_width=True)
 
 
-def chart_region_comparison(farm_time_series: pd.DataFrame) -> None:
+@cached(ttl=3600, max_entries=16)
+def calculate_region_stats(farm_time_series: pd.DataFrame) -> pd.DataFrame:
     """
-    Compare survival rates across different regions/farms.
+    Calculate average survival rate and water level per region.
     
     Args:
         farm_time_series: DataFrame with farm time series data
+        
+    Returns:
+        DataFrame with region, avg_survival_rate, std_survival_rate,
+        total_wells and avg_water_level columns
     """
-    if farm_time_series is None or farm_time_series.empty:
-        st.info("No farm time series data available for region comparison.")
-        return
-    
-    # Calculate average survival rate by region
     region_stats = (
         farm_time_series.groupby("region")
         .agg({
@@ -184,7 +186,21 @@ def chart_region_comparison(farm_time_series: pd.DataFrame) -> None:
     
     # Flatten column names
     region_stats.columns = ['avg_survival_rate', 'std_survival_rate', 'total_wells', 'avg_water_level']
-    region_stats = region_stats.reset_index()
+    return region_stats.reset_index()
+
+
+def chart_region_comparison(farm_time_series: pd.DataFrame) -> None:
+    """
+    Compare survival rates across different regions/farms.
+    
+    Args:
+        farm_time_series: DataFrame with farm time series data
+    """
+    if farm_time_series is None or farm_time_series.empty:
+        st.info("No farm time series data available for region comparison.")
+        return
+    
+    region_stats = calculate_region_stats(farm_time_series)
     
     # Create comparison chart
     bars = (
@@ -1,22 +1,375 @@
 # geodash/ui/map_panel.py
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, List, Optional
 
+from branca.element import MacroElement
 import folium
-from folium.plugins import HeatMap
+from folium.plugins import HeatMap, VectorGridProtobuf
+from folium.template import Template
 import streamlit as st
 from streamlit_folium import st_folium
+import numpy as np
 import pandas as pd
 
+from geodash.data.cache import hash_dataframe
+from geodash.data.density import get_success_surface
+from geodash.data.polygon_store import PolygonStore
+from geodash.data.vector_tiles import FARMS_LAYER, FIELDS_LAYER
+from geodash.instrumentation import span
+from geodash.ui import tiles
+
+
+# Latest survival rate bins (upper edges) and their marker colors; gray for no data
+SURVIVAL_BINS = [0.2, 0.4, 0.6, 0.8]
+SURVIVAL_COLORS = ["#a50f15", "#de2d26", "#fd8d3c", "#78c679", "#238b45"]
+NO_SURVIVAL_COLOR = "#9e9e9e"
+
+
+def stations_geojson(water_stations_df: pd.DataFrame) -> Dict[str, object]:
+    """
+    Build one GeoJSON FeatureCollection of water station wells.
+    
+    Colors and popup values are computed column-wise; the popup and tooltip
+    are rendered client-side from the feature properties.
+    
+    Args:
+        water_stations_df: Stations with latitude, longitude and optionally
+            station_id, well_number, location, province and latest_survival
+        
+    Returns:
+        FeatureCollection dict with one Point feature per row
+    """
+    n = len(water_stations_df)
+    
+    def column(name: str) -> pd.Series:
+        values = water_stations_df[name] if name in water_stations_df.columns else pd.Series(["Unknown"] * n)
+        return values.astype(object).where(values.notna(), "Unknown").astype(str)
+    
+    if "latest_survival" in water_stations_df.columns:
+        survival = water_stations_df["latest_survival"].to_numpy(dtype=float)
+    else:
+        survival = np.full(n, np.nan)
+    has_survival = ~np.isnan(survival)
+    colors = np.where(
+        has_survival,
+        np.asarray(SURVIVAL_COLORS)[np.digitize(np.nan_to_num(survival), SURVIVAL_BINS)],
+        NO_SURVIVAL_COLOR,
+    )
+    survival_text = np.where(has_survival, np.char.add(np.round(np.nan_to_num(survival) * 100, 1).astype(str), "%"), "N/A")
+    
+    station_ids, well_numbers = column("station_id"), column("well_number")
+    labels = "🏭 " + station_ids + " - " + well_numbers
+    lats = water_stations_df["latitude"].to_numpy(dtype=float)
+    lons = water_stations_df["longitude"].to_numpy(dtype=float)
+    
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "station_id": station_id,
+                "well_number": well_number,
+                "location": location,
+                "province": province,
+                "survival": survival_value,
+                "color": color,
+                "label": label,
+            },
+        }
+        for lat, lon, station_id, well_number, location, province, survival_value, color, label in zip(
+            lats.tolist(), lons.tolist(), station_ids, well_numbers, column("location"), column("province"),
+            survival_text.tolist(), colors.tolist(), labels,
+        )
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Potential well marker colors by depth category (see PotentialWellsLayer)
+DEPTH_CATEGORY_COLORS = {
+    "shallow": "#FFC107",  # Amber
+    "medium": "#FF9800",   # Orange
+    "deep": "#FF5722",     # Deep Orange
+}
+DEFAULT_DEPTH_COLOR = "#9E9E9E"
+
+# Potential well columns shipped as feature properties
+POTENTIAL_WELL_PROPERTIES = [
+    "potential_id", "field_name", "region", "depth_category", "recommended_depth_m",
+    "success_probability", "expected_water_yield_m3h", "estimated_cost_thb",
+    "drilling_cost_thb", "priority_score",
+]
+
+
+def potential_wells_geojson(potential_wells_df: pd.DataFrame) -> Dict[str, object]:
+    """
+    Build one GeoJSON FeatureCollection of potential drilling sites.
+    
+    Only raw values are shipped; icons, popups and tooltips are rendered
+    client-side by PotentialWellsLayer.
+    
+    Args:
+        potential_wells_df: Potential wells (lat, lon and POTENTIAL_WELL_PROPERTIES)
+        
+    Returns:
+        FeatureCollection dict with one Point feature per row
+    """
+    columns = [col for col in POTENTIAL_WELL_PROPERTIES if col in potential_wells_df.columns]
+    # to_dict converts numpy scalars to Python ints/floats in one pass
+    records = potential_wells_df[columns].astype(object).where(potential_wells_df[columns].notna(), None).to_dict("records")
+    lats = potential_wells_df["lat"].to_numpy(dtype=float).tolist()
+    lons = potential_wells_df["lon"].to_numpy(dtype=float).tolist()
+    
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lon, lat]}, "properties": properties}
+            for lat, lon, properties in zip(lats, lons, records)
+        ],
+    }
+
+
+class PotentialWellsLayer(MacroElement):
+    """
+    Potential drilling sites as one L.geoJson layer with shared templates.
+    
+    One L.divIcon is created per depth category and shared by all markers;
+    popups are built from feature properties only when a marker is opened.
+    """
+    
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = (function() {
+            var colors = {{ this.colors|tojson }};
+            var icons = {};
+            function iconFor(category) {
+                var color = colors[category] || {{ this.default_color|tojson }};
+                if (!icons[color]) {
+                    icons[color] = L.divIcon({
+                        className: "",
+                        iconSize: [30, 30],
+                        iconAnchor: [15, 15],
+                        html: '<div style="background-color: ' + color + '; border: 3px solid white; '
+                            + 'border-radius: 50%; width: 24px; height: 24px; display: flex; '
+                            + 'align-items: center; justify-content: center; '
+                            + 'box-shadow: 0 2px 5px rgba(0,0,0,0.3); font-weight: bold; '
+                            + 'color: white; font-size: 14px;">💡</div>'
+                    });
+                }
+                return icons[color];
+            }
+            function esc(value) {
+                return String(value === null || value === undefined ? "N/A" : value)
+                    .replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;");
+            }
+            function pct(value) { return Math.round(value * 100) + "%"; }
+            function baht(value) { return "฿" + Math.round(value).toLocaleString("en-US"); }
+            function line(label, value, small) {
+                return '<p style="margin: 5px 0;' + (small ? ' font-size: 11px;' : '') + '">' + label + ' ' + value + '</p>';
+            }
+            function popup(p) {
+                return '<div style="font-family: Arial; width: 250px;">'
+                    + '<h4 style="margin: 0 0 10px 0; color: #FF5722;">💡 ' + esc(p.potential_id) + '</h4>'
+                    + '<hr style="margin: 5px 0;">'
+                    + line('<b>📐 Field:</b>', esc(p.field_name))
+                    + line('<b>🌍 Region:</b>', esc(p.region))
+                    + '<hr style="margin: 5px 0;">'
+                    + line('<b>⬇️ Recommended Depth:</b>', esc(p.recommended_depth_m) + 'm')
+                    + line('<b>📊 Success Probability:</b>', pct(p.success_probability))
+                    + line('<b>💧 Expected Yield:</b>', Number(p.expected_water_yield_m3h).toFixed(1) + ' m³/h')
+                    + '<hr style="margin: 5px 0;">'
+                    + line('<b>💰 Estimated Cost:</b>', baht(p.estimated_cost_thb))
+                    + line('• Drilling:', baht(p.drilling_cost_thb), true)
+                    + line('• Pump & Equipment:', baht(p.estimated_cost_thb - p.drilling_cost_thb), true)
+                    + '<hr style="margin: 5px 0;">'
+                    + line('<b>⭐ Priority Score:</b>', Number(p.priority_score).toFixed(2))
+                    + '<div style="background: #FFF3E0; padding: 8px; margin-top: 10px; border-radius: 4px;">'
+                    + '<p style="margin: 0; font-size: 11px; color: #E65100;">'
+                    + '💡 <b>Tip:</b> Higher priority score = better value</p></div></div>';
+            }
+            return L.geoJson({{ this.data|tojson }}, {
+                pointToLayer: function(feature, latlng) {
+                    return L.marker(latlng, {icon: iconFor(feature.properties.depth_category)});
+                },
+                onEachFeature: function(feature, layer) {
+                    var p = feature.properties;
+                    layer.bindPopup(function() { return popup(p); }, {maxWidth: 300});
+                    layer.bindTooltip("💡 " + esc(p.potential_id) + " - " + esc(p.recommended_depth_m)
+                        + "m (" + pct(p.success_probability) + ")");
+                }
+            }).addTo({{ this._parent.get_name() }});
+        })();
+        {% endmacro %}
+    """)
+    
+    def __init__(self, potential_wells_df: pd.DataFrame):
+        super().__init__()
+        self._name = "PotentialWellsLayer"
+        self.data = potential_wells_geojson(potential_wells_df)
+        self.colors = DEPTH_CATEGORY_COLORS
+        self.default_color = DEFAULT_DEPTH_COLOR
+
+
+class PolygonTilesLayer(VectorGridProtobuf):
+    """
+    One source layer ("fields" or "farms") of the prebuilt polygon vector tiles.
+
+    Styles and popups are built in the browser from the tile properties
+    (colors were computed at build time); other source layers are hidden.
+    Tiles are drawn on canvas and overzoomed past the tileset's max zoom.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = (function() {
+            function esc(value) {
+                return String(value === null || value === undefined ? "N/A" : value)
+                    .replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;");
+            }
+            function num(value, digits) {
+                return value === undefined ? "N/A" : Number(value).toLocaleString("en-US",
+                    {minimumFractionDigits: digits, maximumFractionDigits: digits});
+            }
+            var styles = {
+                fields: function(p) {
+                    return {fill: true, weight: 1, color: p.stroke, fillColor: p.fill, fillOpacity: 0.35};
+                },
+                farms: function(p) {
+                    var color = p.color || "#FF6B6B";
+                    return {fill: true, weight: p.weight || 2, color: color,
+                            fillColor: p.fill_color || color, fillOpacity: p.fill_opacity || 0.3};
+                }
+            };
+            var popups = {
+                fields: function(p) {
+                    var html = "<b>📐 " + esc(p.name) + "</b><br>Region: " + esc(p.region) + "<br>";
+                    if (p.yield_probability === undefined) {
+                        return html + "Yield Performance: N/A<br>Area: N/A<br>Additional Water: N/A";
+                    }
+                    html += "Yield Performance: " + num(p.yield_probability, 2) + "<br>"
+                        + "Area (rai): " + num(p.area_rai, 2) + "<br>";
+                    if (p.additional_water_mm === undefined) {
+                        return html + "Additional Water: N/A";
+                    }
+                    return html + "Additional Water (mm): " + num(p.additional_water_mm, 1) + "<br>"
+                        + "Additional Water (m³): " + num(p.additional_water_m3, 0);
+                },
+                farms: function(p) {
+                    return "<b>🚜 " + esc(p.name) + "</b><br>Farm ID: " + esc(p.farm_id)
+                        + "<br>Type: Farm Boundary<br>Click to view rain data";
+                }
+            };
+            var shown = {{ this.source_layer|tojson }};
+            var layerStyles = {};
+            Object.keys(styles).forEach(function(name) { layerStyles[name] = name === shown ? styles[name] : []; });
+
+            var grid = L.vectorGrid.protobuf({{ this.url|tojson }}, {
+                rendererFactory: L.canvas.tile,
+                interactive: true,
+                minNativeZoom: {{ this.min_zoom }},
+                maxNativeZoom: {{ this.max_zoom }},
+                vectorTileLayerStyles: layerStyles
+            });
+            grid.on("click", function(e) {
+                L.popup({maxWidth: 280})
+                    .setLatLng(e.latlng)
+                    .setContent(popups[shown](e.layer.properties))
+                    .openOn({{ this._parent.get_name() }});
+            });
+            return grid;
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, url: str, source, source_layer: str, name: Optional[str] = None):
+        """
+        Args:
+            url: XYZ URL template of the .pbf tiles
+            source: MBTiles source (zoom range)
+            source_layer: Source layer to draw ("fields" or "farms")
+            name: Layer name shown in layer controls
+        """
+        super().__init__(url, name=name)
+        self._name = "PolygonTilesLayer"
+        self.source_layer = source_layer
+        self.min_zoom = source.min_zoom
+        self.max_zoom = source.max_zoom
+
+
+# Heatmap pre-binning: grid cell size in screen pixels at the map zoom (well
+# under leaflet.heat's own radius/2 cell), maximum emitted points and decimals
+HEATMAP_CELL_PX = 4
+HEATMAP_POINT_BUDGET = 5_000
+HEATMAP_PRECISION = 5
+MAP_ZOOM = 10
+
+
+def bin_heat_points(
+    heat_points,
+    zoom: int = MAP_ZOOM,
+    cell_px: float = HEATMAP_CELL_PX,
+    max_points: int = HEATMAP_POINT_BUDGET,
+    precision: int = HEATMAP_PRECISION,
+) -> List[List[float]]:
+    """
+    Aggregate heatmap points into a weighted grid sized for the map zoom.
+    
+    Each non-empty cell becomes one point at the weighted centroid of its
+    points with the summed weight, which is what leaflet.heat accumulates per
+    cell anyway. The cell size doubles until at most ``max_points`` cells
+    remain, so the payload is bounded regardless of the number of points.
+    
+    Args:
+        heat_points: [lat, lon, weight] rows (list or array)
+        zoom: Map zoom level the grid is sized for
+        cell_px: Cell size in screen pixels at ``zoom``
+        max_points: Point budget
+        precision: Decimal places kept for coordinates
+        
+    Returns:
+        [lat, lon, weight] rows, rounded
+    """
+    points = np.asarray(heat_points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return []
+    lat, lon, weight = points[:, 0], points[:, 1], points[:, 2]
+    
+    # Web Mercator: degrees of longitude per pixel; latitude shrinks by cos(lat)
+    cell_lon = cell_px * 360.0 / (256 * 2 ** zoom)
+    lat_scale = max(np.cos(np.radians(np.mean(lat))), 0.1)
+    while True:
+        ix = ((lon - lon.min()) / cell_lon).astype(np.int64)
+        iy = ((lat - lat.min()) / (cell_lon * lat_scale)).astype(np.int64)
+        cells, inverse = np.unique(iy * (int(ix.max()) + 1) + ix, return_inverse=True)
+        if len(cells) <= max_points:
+            break
+        cell_lon *= 2
+    
+    total = np.bincount(inverse, weights=weight)
+    # Cells whose weights sum to zero fall back to the plain centroid
+    centroid_weight = weight + (total[inverse] == 0)
+    norm = np.bincount(inverse, weights=centroid_weight)
+    binned = np.column_stack([
+        np.round(np.bincount(inverse, weights=lat * centroid_weight) / norm, precision),
+        np.round(np.bincount(inverse, weights=lon * centroid_weight) / norm, precision),
+        np.round(total, 4),
+    ])
+    return binned.tolist()
+
+
+def add_heatmap(fmap: folium.Map, heat_points, zoom: int = MAP_ZOOM) -> None:
+    """Add the groundwater distribution heatmap from pre-binned points."""
+    HeatMap(bin_heat_points(heat_points, zoom), radius=18, blur=22, min_opacity=0.3).add_to(fmap)
+
 
 def build_map_with_controls(
-    polygons: List[Dict[str, object]],
-    farm_polygons: List[Dict[str, object]],
+    polygons: PolygonStore,
+    farm_polygons: PolygonStore,
     wells_df: pd.DataFrame,
     heat_points: List[List[float]],
     current_filters: Dict[str, object],
     field_data_df: Optional[pd.DataFrame] = None,
     water_stations_df: Optional[pd.DataFrame] = None,
     potential_wells_df: Optional[pd.DataFrame] = None,
+    wells_state: Optional[Hashable] = None,
 ) -> Dict[str, object]:
     """
     Build interactive map with dropdown filter controls.
@@ -47,281 +400,295 @@ def build_map_with_controls(
     st.markdown("---")
     
     # === BUILD MAP ===
+    layers = {
+        "show_polygons": show_polygons,
+        "show_farms": show_farms,
+        "show_wells": show_wells,
+        "show_water_stations": show_water_stations,
+        "show_heatmap": show_heatmap,
+        "show_potential": show_potential,
+    }
+    fmap = build_folium_map(
+        polygons,
+        farm_polygons,
+        wells_df,
+        heat_points,
+        layers,
+        field_data_df=field_data_df,
+        water_stations_df=water_stations_df,
+        potential_wells_df=potential_wells_df,
+        wells_state=wells_state,
+    )
+
+    # Render map
+    with span("map.render", "map"):
+        map_state = st_folium(fmap, width=None, height=600, returned_objects=["last_object_clicked", "last_clicked"])
+    
+    # Return both map state and current layer settings
+    return {
+        **(map_state or {}),
+        "layer_settings": layers,
+        "farm_polygons": farm_polygons if show_farms else [],
+        "field_layer_enriched": bool(field_data_df is not None and not field_data_df.empty)
+    }
+
+
+def build_folium_map(
+    polygons: PolygonStore,
+    farm_polygons: PolygonStore,
+    wells_df: pd.DataFrame,
+    heat_points: List[List[float]],
+    layers: Dict[str, bool],
+    field_data_df: Optional[pd.DataFrame] = None,
+    water_stations_df: Optional[pd.DataFrame] = None,
+    potential_wells_df: Optional[pd.DataFrame] = None,
+    wells_state: Optional[Hashable] = None,
+) -> folium.Map:
+    """
+    Build the folium map with the selected layers (no Streamlit calls).
+    
+    Args:
+        polygons: Field polygons
+        farm_polygons: Farm polygons
+        wells_df: Wells to draw
+        heat_points: [lat, lon, weight] heatmap points
+        layers: Layer toggles (show_polygons, show_farms, show_wells,
+            show_water_stations, show_heatmap, show_potential)
+        field_data_df: Field attributes used to color field polygons
+        water_stations_df: Water stations to draw
+        potential_wells_df: Potential drilling locations to draw
+        wells_state: Filter state of ``wells_df`` (see filters.filter_state);
+            keys the cached success surface and its raster tiles
+        
+    Returns:
+        folium.Map ready to render
+    """
+    show_polygons = layers.get("show_polygons", True)
+    show_farms = layers.get("show_farms", True)
+    show_wells = layers.get("show_wells", True)
+    show_water_stations = layers.get("show_water_stations", False)
+    show_heatmap = layers.get("show_heatmap", False)
+    show_potential = layers.get("show_potential", False)
+    raster_tiles = tiles.raster_tiles_enabled()
+    vector_tiles = tiles.vector_tiles_source() if show_farms or show_polygons else None
+    
     center_lat = float(wells_df["lat"].mean()) if not wells_df.empty else 15.95
     center_lon = float(wells_df["lon"].mean()) if not wells_df.empty else 100.1
 
-    fmap = folium.Map(location=[center_lat, center_lon], zoom_start=10, tiles="OpenStreetMap")
-
-    # Farm polygons layer
-    if show_farms and farm_polygons:
-        for i, farm_poly in enumerate(farm_polygons):
-            coords = farm_poly["coordinates"] + [farm_poly["coordinates"][0]]
-            farm_id = farm_poly.get('farm_id', f'farm_{i}')
+    fmap = folium.Map(location=[center_lat, center_lon], zoom_start=MAP_ZOOM, tiles="OpenStreetMap")
+
+    # Farm polygons layer (vector tiles: prebuilt MBTiles instead of inline polygons)
+    if show_farms and vector_tiles is not None:
+        with span("map.farms", "map"):
+            url = tiles.get_tile_server().register_vector("polygons", vector_tiles)
+            PolygonTilesLayer(url, vector_tiles, FARMS_LAYER, name="Farms").add_to(fmap)
+    elif show_farms and farm_polygons:
+        with span("map.farms", "map"):
+            for i, farm_poly in enumerate(PolygonStore.coerce(farm_polygons)):
+                coords = farm_poly.locations  # All parts and holes; Leaflet closes rings
+                farm_id = farm_poly.get('farm_id', f'farm_{i}')
             
-            folium.Polygon(
-                locations=coords,
-                color=farm_poly.get("color", "#FF6B6B"),
-                weight=farm_poly.get("weight", 2),
-                fill=True,
-                fill_color=farm_poly.get("fill_color", farm_poly.get("color", "#FF6B6B")),
-                fill_opacity=farm_poly.get("fill_opacity", 0.3),
-                tooltip=f"🚜 {farm_poly['name']} (Farm ID: {farm_id})",
-                popup=folium.Popup(
-                    f"<b>🚜 {farm_poly['name']}</b><br>Farm ID: {farm_id}<br>Type: Farm Boundary<br>Click to view rain data",
-                    max_width=250
-                ),
-            ).add_to(fmap)
+                folium.Polygon(
+                    locations=coords,
+                    color=farm_poly.get("color", "#FF6B6B"),
+                    weight=farm_poly.get("weight", 2),
+                    fill=True,
+                    fill_color=farm_poly.get("fill_color", farm_poly.get("color", "#FF6B6B")),
+                    fill_opacity=farm_poly.get("fill_opacity", 0.3),
+                    tooltip=f"🚜 {farm_poly['name']} (Farm ID: {farm_id})",
+                    popup=folium.Popup(
+                        f"<b>🚜 {farm_poly['name']}</b><br>Farm ID: {farm_id}<br>Type: Farm Boundary<br>Click to view rain data",
+                        max_width=250
+                    ),
+                ).add_to(fmap)
 
-    # Field polygons layer with yield coloring
-    if show_polygons:
-        # Build quick lookup from field_data by new_plot_code
-        field_lookup = {}
-        if field_data_df is not None and not field_data_df.empty:
-            try:
-                fld = field_data_df.copy()
-                fld['new_plot_code'] = fld['new_plot_code'].astype(str)
-                field_lookup = {
-                    str(row['new_plot_code']): row
-                    for _, row in fld.iterrows()
-                }
-            except Exception:
-                field_lookup = {}
+    # Field polygons layer with yield coloring (raster tiles: fill only)
+    if show_polygons and vector_tiles is not None:
+        with span("map.fields", "map"):
+            url = tiles.get_tile_server().register_vector("polygons", vector_tiles)
+            PolygonTilesLayer(url, vector_tiles, FIELDS_LAYER, name="Fields").add_to(fmap)
+    elif show_polygons and raster_tiles and polygons:
+        with span("map.fields", "map"):
+            version = f"{PolygonStore.coerce(polygons).version[:16]}-{hash_dataframe(field_data_df)[:16] if field_data_df is not None else 'none'}"
+            tiles.add_tile_overlay(
+                fmap, "field_yield", version,
+                lambda: tiles.field_yield_renderer(polygons, field_data_df),
+                name="Field Yield",
+            )
+    elif show_polygons:
+        with span("map.fields", "map"):
+            # Build quick lookup from field_data by new_plot_code
+            field_lookup = {}
+            if field_data_df is not None and not field_data_df.empty:
+                try:
+                    fld = field_data_df.copy()
+                    fld['new_plot_code'] = fld['new_plot_code'].astype(str)
+                    field_lookup = {
+                        str(row['new_plot_code']): row
+                        for _, row in fld.iterrows()
+                    }
+                except Exception:
+                    field_lookup = {}
         
-        # Helper: map yield_probability to dynamic color interpolation
-        def color_for_probability(prob: Optional[float], data_min: float = 0.0, data_max: float = 1.0) -> tuple:
-            if prob is None:
-                return ("#bdbdbd", "#737373")  # neutral gray if missing
-            try:
-                p = float(prob)
-            except Exception:
-                return ("#bdbdbd", "#737373")
+            # Helper: map yield_probability to dynamic color interpolation
+            def color_for_probability(prob: Optional[float], data_min: float = 0.0, data_max: float = 1.0) -> tuple:
+                if prob is None:
+                    return ("#bdbdbd", "#737373")  # neutral gray if missing
+                try:
+                    p = float(prob)
+                except Exception:
+                    return ("#bdbdbd", "#737373")
             
-            # Normalize the probability to 0-1 range based on actual data range
-            normalized_prob = (p - data_min) / (data_max - data_min) if data_max > data_min else 0.5
-            normalized_prob = max(0.0, min(1.0, normalized_prob))  # Clamp to [0, 1]
+                # Normalize the probability to 0-1 range based on actual data range
+                normalized_prob = (p - data_min) / (data_max - data_min) if data_max > data_min else 0.5
+                normalized_prob = max(0.0, min(1.0, normalized_prob))  # Clamp to [0, 1]
             
-            # Define color stops for smooth interpolation
-            color_stops = [
-                (0.0, "#a50f15", "#67000d"),
-                (0.25, "#de2d26", "#a50f15"),
-                (0.5, "#f0f0f0", "#bdbdbd"),
-                (0.75, "#31a354", "#238b45"),
-                (1.0, "#006d2c", "#00441b")
-            ]
+                # Define color stops for smooth interpolation
+                color_stops = [
+                    (0.0, "#a50f15", "#67000d"),
+                    (0.25, "#de2d26", "#a50f15"),
+                    (0.5, "#f0f0f0", "#bdbdbd"),
+                    (0.75, "#31a354", "#238b45"),
+                    (1.0, "#006d2c", "#00441b")
+                ]
             
-            # Find the two color stops to interpolate between
-            for i in range(len(color_stops) - 1):
-                if normalized_prob <= color_stops[i + 1][0]:
-                    t = (normalized_prob - color_stops[i][0]) / (color_stops[i + 1][0] - color_stops[i][0])
+                # Find the two color stops to interpolate between
+                for i in range(len(color_stops) - 1):
+                    if normalized_prob <= color_stops[i + 1][0]:
+                        t = (normalized_prob - color_stops[i][0]) / (color_stops[i + 1][0] - color_stops[i][0])
                     
-                    # Interpolate fill color
-                    fill_rgb1 = tuple(int(color_stops[i][1][j:j+2], 16) for j in (1, 3, 5))
-                    fill_rgb2 = tuple(int(color_stops[i + 1][1][j:j+2], 16) for j in (1, 3, 5))
-                    fill_rgb = tuple(int(fill_rgb1[k] + t * (fill_rgb2[k] - fill_rgb1[k])) for k in range(3))
-                    fill_color = f"#{fill_rgb[0]:02x}{fill_rgb[1]:02x}{fill_rgb[2]:02x}"
+                        # Interpolate fill color
+                        fill_rgb1 = tuple(int(color_stops[i][1][j:j+2], 16) for j in (1, 3, 5))
+                        fill_rgb2 = tuple(int(color_stops[i + 1][1][j:j+2], 16) for j in (1, 3, 5))
+                        fill_rgb = tuple(int(fill_rgb1[k] + t * (fill_rgb2[k] - fill_rgb1[k])) for k in range(3))
+                        fill_color = f"#{fill_rgb[0]:02x}{fill_rgb[1]:02x}{fill_rgb[2]:02x}"
                     
-                    # Interpolate outline color
-                    outline_rgb1 = tuple(int(color_stops[i][2][j:j+2], 16) for j in (1, 3, 5))
-                    outline_rgb2 = tuple(int(color_stops[i + 1][2][j:j+2], 16) for j in (1, 3, 5))
-                    outline_rgb = tuple(int(outline_rgb1[k] + t * (outline_rgb2[k] - outline_rgb1[k])) for k in range(3))
-                    outline_color = f"#{outline_rgb[0]:02x}{outline_rgb[1]:02x}{outline_rgb[2]:02x}"
+                        # Interpolate outline color
+                        outline_rgb1 = tuple(int(color_stops[i][2][j:j+2], 16) for j in (1, 3, 5))
+                        outline_rgb2 = tuple(int(color_stops[i + 1][2][j:j+2], 16) for j in (1, 3, 5))
+                        outline_rgb = tuple(int(outline_rgb1[k] + t * (outline_rgb2[k] - outline_rgb1[k])) for k in range(3))
+                        outline_color = f"#{outline_rgb[0]:02x}{outline_rgb[1]:02x}{outline_rgb[2]:02x}"
                     
-                    return (fill_color, outline_color)
+                        return (fill_color, outline_color)
             
-            return (color_stops[-1][1], color_stops[-1][2])
-        
-        # Calculate data range for dynamic color mapping
-        data_min, data_max = 0.0, 1.0
-        if field_data_df is not None and not field_data_df.empty and 'yield_probability' in field_data_df.columns:
-            try:
-                valid_probs = field_data_df['yield_probability'].dropna()
-                if not valid_probs.empty:
-                    data_min = float(valid_probs.min())
-                    data_max = float(valid_probs.max())
-            except Exception:
-                pass
+                return (color_stops[-1][1], color_stops[-1][2])
         
-        for poly in polygons:
-            coords = poly["coordinates"] + [poly["coordinates"][0]]
-            plot_code = str(poly.get("plot_code", "")) if poly.get("plot_code") is not None else None
-            row = field_lookup.get(plot_code) if plot_code else None
-            
-            # Determine color by yield_probability
-            if row is not None and 'yield_probability' in row:
+            # Calculate data range for dynamic color mapping
+            data_min, data_max = 0.0, 1.0
+            if field_data_df is not None and not field_data_df.empty and 'yield_probability' in field_data_df.columns:
                 try:
-                    yp = float(row['yield_probability'])
+                    valid_probs = field_data_df['yield_probability'].dropna()
+                    if not valid_probs.empty:
+                        data_min = float(valid_probs.min())
+                        data_max = float(valid_probs.max())
                 except Exception:
+                    pass
+        
+            for poly in PolygonStore.coerce(polygons):
+                coords = poly.locations  # All parts and holes; Leaflet closes rings
+                plot_code = str(poly.get("plot_code", "")) if poly.get("plot_code") is not None else None
+                row = field_lookup.get(plot_code) if plot_code else None
+            
+                # Determine color by yield_probability
+                if row is not None and 'yield_probability' in row:
+                    try:
+                        yp = float(row['yield_probability'])
+                    except Exception:
+                        yp = None
+                else:
                     yp = None
-            else:
-                yp = None
-            fill_col, outline_col = color_for_probability(yp, data_min, data_max)
+                fill_col, outline_col = color_for_probability(yp, data_min, data_max)
             
-            # Popup content
-            popup_html = f"<b>📐 {poly['name']}</b><br>Region: {poly['region']}<br>"
-            if row is not None:
-                yield_prob = float(row['yield_probability'])
-                popup_html += f"Yield Performance: {yield_prob:.2f}<br>"
-                area_rai = float(row['average_area'])
-                popup_html += f"Area (rai): {area_rai:.2f}<br>"
+                # Popup content
+                popup_html = f"<b>📐 {poly['name']}</b><br>Region: {poly['region']}<br>"
+                if row is not None:
+                    yield_prob = float(row['yield_probability'])
+                    popup_html += f"Yield Performance: {yield_prob:.2f}<br>"
+                    area_rai = float(row['average_area'])
+                    popup_html += f"Area (rai): {area_rai:.2f}<br>"
                 
-                if 'average_additional_water(mm)' in row:
-                    add_water_mm = float(row['average_additional_water(mm)'])
-                    popup_html += f"Additional Water (mm): {add_water_mm:.1f}<br>"
-                    add_water_m3 = area_rai * 1600.0 * (add_water_mm / 1000.0)
-                    popup_html += f"Additional Water (m³): {add_water_m3:,.0f}"
+                    if 'average_additional_water(mm)' in row:
+                        add_water_mm = float(row['average_additional_water(mm)'])
+                        popup_html += f"Additional Water (mm): {add_water_mm:.1f}<br>"
+                        add_water_m3 = area_rai * 1600.0 * (add_water_mm / 1000.0)
+                        popup_html += f"Additional Water (m³): {add_water_m3:,.0f}"
+                    else:
+                        popup_html += "Additional Water: N/A"
                 else:
-                    popup_html += "Additional Water: N/A"
-            else:
-                popup_html += "Yield Performance: N/A<br>Area: N/A<br>Additional Water: N/A"
+                    popup_html += "Yield Performance: N/A<br>Area: N/A<br>Additional Water: N/A"
             
-            folium.Polygon(
-                locations=coords,
-                color=outline_col,
-                weight=1,
-                fill=True,
-                fill_color=fill_col,
-                fill_opacity=0.35,
-                tooltip=f"📐 {poly['name']} ({poly['region']})",
-                popup=folium.Popup(popup_html, max_width=280),
-            ).add_to(fmap)
+                folium.Polygon(
+                    locations=coords,
+                    color=outline_col,
+                    weight=1,
+                    fill=True,
+                    fill_color=fill_col,
+                    fill_opacity=0.35,
+                    tooltip=f"📐 {poly['name']} ({poly['region']})",
+                    popup=folium.Popup(popup_html, max_width=280),
+                ).add_to(fmap)
 
     # Wells layer
     if show_wells and not wells_df.empty:
-        for _, r in wells_df.iterrows():
-            popup_html = (
-                f"<b>{r['well_id']}</b><br>Region: {r['region']}<br>"
-                f"Depth: {int(r['depth_m'])} m<br>Survival: {'Yes' if r['survived'] else 'No'}"
-            )
-            folium.CircleMarker(
-                location=[float(r["lat"]), float(r["lon"])],
-                radius=1,
-                color="#238b45" if r["survived"] else "#cb181d",
-                fill=True,
-                fill_opacity=0.8,
-                popup=folium.Popup(popup_html, max_width=250),
-                tooltip=r["well_id"],
-            ).add_to(fmap)
+        with span("map.wells", "map"):
+            for _, r in wells_df.iterrows():
+                popup_html = (
+                    f"<b>{r['well_id']}</b><br>Region: {r['region']}<br>"
+                    f"Depth: {int(r['depth_m'])} m<br>Survival: {'Yes' if r['survived'] else 'No'}"
+                )
+                folium.CircleMarker(
+                    location=[float(r["lat"]), float(r["lon"])],
+                    radius=1,
+                    color="#238b45" if r["survived"] else "#cb181d",
+                    fill=True,
+                    fill_opacity=0.8,
+                    popup=folium.Popup(popup_html, max_width=250),
+                    tooltip=r["well_id"],
+                ).add_to(fmap)
 
     # Water stations layer
     if show_water_stations and water_stations_df is not None and not water_stations_df.empty:
-        for _, station in water_stations_df.iterrows():
-            station_id = station.get('station_id', 'Unknown')
-            well_number = station.get('well_number', 'Unknown')
-            location = station.get('location', 'Unknown')
-            
-            popup_html = (
-                f"<b>🏭 Water Station</b><br>"
-                f"Station ID: {station_id}<br>"
-                f"Well Number: {well_number}<br>"
-                f"Location: {location}<br>"
-                f"Province: {station.get('province', 'Unknown')}"
-            )
-            
-            folium.CircleMarker(
-                location=[float(station["latitude"]), float(station["longitude"])],
-                radius=6,
-                color="#1f77b4",
-                fill=True,
-                fill_color="#1f77b4",
-                fill_opacity=0.7,
-                popup=folium.Popup(popup_html, max_width=250),
-                tooltip=f"🏭 {station_id} - {well_number}",
+        with span("map.water_stations", "map"):
+            folium.GeoJson(
+                stations_geojson(water_stations_df),
+                name="Water Stations",
+                marker=folium.CircleMarker(radius=6, fill=True, fill_opacity=0.7, weight=1),
+                style_function=lambda feature: {
+                    "color": feature["properties"]["color"],
+                    "fillColor": feature["properties"]["color"],
+                },
+                popup=folium.GeoJsonPopup(
+                    fields=["station_id", "well_number", "location", "province", "survival"],
+                    aliases=["Station ID", "Well Number", "Location", "Province", "Latest Survival"],
+                    max_width=250,
+                ),
+                tooltip=folium.GeoJsonTooltip(fields=["label"], labels=False),
             ).add_to(fmap)
 
     # === POTENTIAL WELLS LAYER ===
     if show_potential and potential_wells_df is not None and not potential_wells_df.empty:
-        for _, pot_well in potential_wells_df.iterrows():
-            # Color based on depth category
-            depth_colors = {
-                'shallow': '#FFC107',  # Amber
-                'medium': '#FF9800',   # Orange
-                'deep': '#FF5722'      # Deep Orange
-            }
-            
-            marker_color = depth_colors.get(pot_well['depth_category'], '#9E9E9E')
-            
-            # Create detailed popup
-            popup_html = f"""
-            <div style="font-family: Arial; width: 250px;">
-                <h4 style="margin: 0 0 10px 0; color: #FF5722;">💡 {pot_well['potential_id']}</h4>
-                <hr style="margin: 5px 0;">
-                
-                <p style="margin: 5px 0;"><b>📐 Field:</b> {pot_well['field_name']}</p>
-                <p style="margin: 5px 0;"><b>🌍 Region:</b> {pot_well['region']}</p>
-                
-                <hr style="margin: 5px 0;">
-                <p style="margin: 5px 0;"><b>⬇️ Recommended Depth:</b> {pot_well['recommended_depth_m']}m</p>
-                <p style="margin: 5px 0;"><b>📊 Success Probability:</b> {pot_well['success_probability']:.0%}</p>
-                <p style="margin: 5px 0;"><b>💧 Expected Yield:</b> {pot_well['expected_water_yield_m3h']:.1f} m³/h</p>
-                
-                <hr style="margin: 5px 0;">
-                <p style="margin: 5px 0;"><b>💰 Estimated Cost:</b> ฿{pot_well['estimated_cost_thb']:,}</p>
-                <p style="margin: 5px 0; font-size: 11px;">• Drilling: ฿{pot_well['drilling_cost_thb']:,}</p>
-                <p style="margin: 5px 0; font-size: 11px;">• Pump & Equipment: ฿{pot_well['estimated_cost_thb'] - pot_well['drilling_cost_thb']:,}</p>
-                
-                <hr style="margin: 5px 0;">
-                <p style="margin: 5px 0;"><b>⭐ Priority Score:</b> {pot_well['priority_score']:.2f}</p>
-                
-                <div style="background: #FFF3E0; padding: 8px; margin-top: 10px; border-radius: 4px;">
-                    <p style="margin: 0; font-size: 11px; color: #E65100;">
-                        💡 <b>Tip:</b> Higher priority score = better value
-                    </p>
-                </div>
-            </div>
-            """
-            
-            # Create custom icon with depth indicator
-            icon_html = f"""
-            <div style="
-                background-color: {marker_color};
-                border: 3px solid white;
-                border-radius: 50%;
-                width: 24px;
-                height: 24px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                box-shadow: 0 2px 5px rgba(0,0,0,0.3);
-                font-weight: bold;
-                color: white;
-                font-size: 14px;
-            ">💡</div>
-            """
-            
-            # Add marker with custom icon
-            folium.Marker(
-                location=[float(pot_well["lat"]), float(pot_well["lon"])],
-                popup=folium.Popup(popup_html, max_width=300),
-                tooltip=f"💡 {pot_well['potential_id']} - {pot_well['recommended_depth_m']}m ({pot_well['success_probability']:.0%})",
-                icon=folium.DivIcon(html=icon_html)
-            ).add_to(fmap)
-
-    # Heatmap layer
-    if show_heatmap and heat_points:
-        HeatMap(heat_points, radius=18, blur=22, min_opacity=0.3).add_to(fmap)
+        with span("map.potential_wells", "map"):
+            PotentialWellsLayer(potential_wells_df).add_to(fmap)
+
+    # Heatmap layer (raster tiles: success surface of the wells on the map)
+    if show_heatmap and raster_tiles and not wells_df.empty:
+        with span("map.heatmap", "map"):
+            version = tiles.state_version(wells_state) if wells_state is not None else hash_dataframe(wells_df)[:16]
+            tiles.add_tile_overlay(
+                fmap, "success_surface", version,
+                lambda: tiles.success_surface_renderer(get_success_surface(wells_df, wells_state)),
+                name="Groundwater Distribution",
+            )
+    elif show_heatmap and heat_points:
+        with span("map.heatmap", "map"):
+            add_heatmap(fmap, heat_points)
 
-    # Render map
-    map_state = st_folium(fmap, width=None, height=600, returned_objects=["last_object_clicked", "last_clicked"])
-    
-    # Return both map state and current layer settings
-    return {
-        **(map_state or {}),
-        "layer_settings": {
-            "show_polygons": show_polygons,
-            "show_farms": show_farms,
-            "show_wells": show_wells,
-            "show_water_stations": show_water_stations,
-            "show_heatmap": show_heatmap,
-            "show_potential": show_potential,
-        },
-        "farm_polygons": farm_polygons if show_farms else [],
-        "field_layer_enriched": bool(field_data_df is not None and not field_data_df.empty)
-    }
+    return fmap
 
 
 def build_map_with_floating_controls(
-    polygons: List[Dict[str, object]],
-    farm_polygons: List[Dict[str, object]],
+    polygons: PolygonStore,
+    farm_polygons: PolygonStore,
     wells_df: pd.DataFrame,
     heat_points: List[List[float]],
     current_filters: Dict[str, object],
@@ -372,12 +739,12 @@ def build_map_with_floating_controls(
         center_lat = float(wells_df["lat"].mean()) if not wells_df.empty else 15.95
         center_lon = float(wells_df["lon"].mean()) if not wells_df.empty else 100.1
 
-        fmap = folium.Map(location=[center_lat, center_lon], zoom_start=10, tiles="OpenStreetMap")
+        fmap = folium.Map(location=[center_lat, center_lon], zoom_start=MAP_ZOOM, tiles="OpenStreetMap")
 
         # Add layers based on controls
         if show_farms and farm_polygons:
-            for farm_poly in farm_polygons:
-                coords = farm_poly["coordinates"] + [farm_poly["coordinates"][0]]
+            for farm_poly in PolygonStore.coerce(farm_polygons):
+                coords = farm_poly.locations  # All parts and holes; Leaflet closes rings
                 folium.Polygon(
                     locations=coords,
                     color=farm_poly.get("color", "#FF6B6B"),
@@ -389,8 +756,8 @@ def build_map_with_floating_controls(
                 ).add_to(fmap)
 
         if show_polygons:
-            for poly in polygons:
-                coords = poly["coordinates"] + [poly["coordinates"][0]]
+            for poly in PolygonStore.coerce(polygons):
+                coords = poly.locations  # All parts and holes; Leaflet closes rings
                 folium.Polygon(
                     locations=coords,
                     color="#2c7fb8",
@@ -413,7 +780,7 @@ def build_map_with_floating_controls(
                 ).add_to(fmap)
 
         if show_heatmap and heat_points:
-            HeatMap(heat_points, radius=18, blur=22, min_opacity=0.3).add_to(fmap)
+            add_heatmap(fmap, heat_points)
 
         map_state = st_folium(fmap, width=None, height=650, returned_objects=["last_object_clicked"])
         
@@ -428,8 +795,8 @@ def build_map_with_floating_controls(
         }
 
 def build_map_with_button_bar(
-    polygons: List[Dict[str, object]],
-    farm_polygons: List[Dict[str, object]],
+    polygons: PolygonStore,
+    farm_polygons: PolygonStore,
     wells_df: pd.DataFrame,
     heat_points: List[List[float]],
     current_filters: Dict[str, object],
@@ -506,11 +873,11 @@ def build_map_with_button_bar(
     center_lat = float(wells_df["lat"].mean()) if not wells_df.empty else 15.95
     center_lon = float(wells_df["lon"].mean()) if not wells_df.empty else 100.1
 
-    fmap = folium.Map(location=[center_lat, center_lon], zoom_start=10, tiles="OpenStreetMap")
+    fmap = folium.Map(location=[center_lat, center_lon], zoom_start=MAP_ZOOM, tiles="OpenStreetMap")
 
     if show_farms and farm_polygons:
-        for farm_poly in farm_polygons:
-            coords = farm_poly["coordinates"] + [farm_poly["coordinates"][0]]
+        for farm_poly in PolygonStore.coerce(farm_polygons):
+            coords = farm_poly.locations  # All parts and holes; Leaflet closes rings
             folium.Polygon(
                 locations=coords,
                 color=farm_poly.get("color", "#FF6B6B"),
@@ -522,8 +889,8 @@ def build_map_with_button_bar(
             ).add_to(fmap)
 
     if show_polygons:
-        for poly in polygons:
-            coords = poly["coordinates"] + [poly["coordinates"][0]]
+        for poly in PolygonStore.coerce(polygons):
+            coords = poly.locations  # All parts and holes; Leaflet closes rings
             folium.Polygon(
                 locations=coords,
                 color="#2c7fb8",
@@ -551,7 +918,7 @@ def build_map_with_button_bar(
             ).add_to(fmap)
 
     if show_heatmap and heat_points:
-        HeatMap(heat_points, radius=18, blur=22, min_opacity=0.3).add_to(fmap)
+        add_heatmap(fmap, heat_points)
 
     map_state = st_folium(fmap, width=None, height=600, returned_objects=["last_object_clicked"])
     
@@ -562,8 +929,8 @@ def build_map_with_button_bar(
 
 # Keep the original function for backward compatibility
 def build_map(
-    polygons: List[Dict[str, object]],
-    farm_polygons: List[Dict[str, object]],
+    polygons: PolygonStore,
+    farm_polygons: PolygonStore,
     wells_df: pd.DataFrame,
     heat_points: List[List[float]],
     show_polygons: bool = True,
@@ -576,11 +943,11 @@ def build_map(
     center_lat = float(wells_df["lat"].mean()) if not wells_df.empty else 15.95
     center_lon = float(wells_df["lon"].mean()) if not wells_df.empty else 100.1
 
-    fmap = folium.Map(location=[center_lat, center_lon], zoom_start=10, tiles="OpenStreetMap")
+    fmap = folium.Map(location=[center_lat, center_lon], zoom_start=MAP_ZOOM, tiles="OpenStreetMap")
 
     if show_farms and farm_polygons:
-        for farm_poly in farm_polygons:
-            coords = farm_poly["coordinates"] + [farm_poly["coordinates"][0]]
+        for farm_poly in PolygonStore.coerce(farm_polygons):
+            coords = farm_poly.locations  # All parts and holes; Leaflet closes rings
             folium.Polygon(
                 locations=coords,
                 color=farm_poly.get("color", "#FF6B6B"),
@@ -592,8 +959,8 @@ def build_map(
             ).add_to(fmap)
 
     if show_polygons:
-        for poly in polygons:
-            coords = poly["coordinates"] + [poly["coordinates"][0]]
+        for poly in PolygonStore.coerce(polygons):
+            coords = poly.locations  # All parts and holes; Leaflet closes rings
             folium.Polygon(
                 locations=coords,
                 color="#2c7fb8",
@@ -621,7 +988,7 @@ def build_map(
             ).add_to(fmap)
 
     if show_heatmap and heat_points:
-        HeatMap(heat_points, radius=18, blur=22, min_opacity=0.3).add_to(fmap)
+        add_heatmap(fmap, heat_points)
 
     map_state = st_folium(fmap, width=None, height=700, returned_objects=["last_object_clicked"])
     return map_state or {}
\ No newline at end of file
@@ -0,0 +1,518 @@
+# geodash/ui/tiles.py
+"""
+Raster XYZ tiles for heavy map overlays.
+Overlays (success-surface heatmap, field yield coloring) are rendered into
+256 px PNG tiles on demand, cached on disk by (layer, dataset version, z/x/y)
+and served by a threaded local HTTP server. The map only references a
+TileLayer URL, so its payload no longer grows with the data and browsers
+fetch just the visible tiles. The same server serves prebuilt vector tiles
+(MBTiles, see geodash.data.vector_tiles) of the field and farm polygons.
+
+Enable with ``GEODASH_RASTER_TILES=1`` and/or ``GEODASH_VECTOR_TILES=<path to
+an MBTiles file>``. Other settings (environment):
+
+- ``GEODASH_TILE_CACHE``: tile cache directory (default: <tmp>/geodash-tiles)
+- ``GEODASH_TILE_HOST`` / ``GEODASH_TILE_PORT``: server bind address
+  (default 127.0.0.1:8765; a busy port falls back to a free one)
+- ``GEODASH_TILE_URL``: public base URL when tiles are proxied
+- ``GEODASH_TILE_VERSIONS``: versions kept per layer (default 8); older
+  renderers are dropped and their cached tiles deleted
+"""
+from collections import OrderedDict
+from hashlib import blake2b
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock, Thread, get_ident
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import math
+import os
+import re
+import shutil
+import struct
+import tempfile
+import uuid
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from geodash.data.polygon_store import PolygonStore
+
+logger = logging.getLogger("TileServer")
+
+TILE_SIZE = 256
+DEFAULT_PORT = 8765
+KEEP_VERSIONS = 8
+TILE_PATH = re.compile(r"^/(?P<layer>[\w-]+)/(?P<version>[\w-]+)/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)\.(?P<format>png|pbf)$")
+
+# Salt for state_version: published data versions are per-process counters,
+# so tiles cached on disk by another (or an earlier) process must not match
+_PROCESS_SALT = uuid.uuid4().hex
+
+# A renderer returns an RGBA (256, 256, 4) uint8 tile, or None when empty
+Renderer = Callable[[int, int, int], Optional[np.ndarray]]
+
+
+def raster_tiles_enabled() -> bool:
+    """Whether heavy overlays are served as raster tiles (GEODASH_RASTER_TILES)."""
+    return os.environ.get("GEODASH_RASTER_TILES", "").lower() in ("1", "true", "yes")
+
+
+def vector_tiles_source():
+    """
+    Prebuilt field/farm vector tiles configured by GEODASH_VECTOR_TILES.
+
+    Returns:
+        geodash.data.vector_tiles.MBTiles, or None when unset or missing
+    """
+    path = os.environ.get("GEODASH_VECTOR_TILES", "").strip()
+    if not path:
+        return None
+    from geodash.data.vector_tiles import get_mbtiles
+
+    source = get_mbtiles(path)
+    if source is None:
+        logger.warning(f"⚠️  GEODASH_VECTOR_TILES={path} does not exist; using inline polygons")
+    return source
+
+
+# === Tile geometry and encoding ===
+
+def tile_pixel_lat_lon(z: int, x: int, y: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Latitude and longitude of every pixel center of a Web Mercator tile.
+
+    Returns:
+        Tuple of (lat, lon) arrays of shape (256, 256), rows north to south
+    """
+    world = TILE_SIZE * 2 ** z
+    pixels = np.arange(TILE_SIZE) + 0.5
+    lon = (x * TILE_SIZE + pixels) / world * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y * TILE_SIZE + pixels) / world))))
+    return np.broadcast_to(lat[:, None], (TILE_SIZE, TILE_SIZE)), np.broadcast_to(lon[None, :], (TILE_SIZE, TILE_SIZE))
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Tile bounds as (min_lat, min_lon, max_lat, max_lon)."""
+    n = 2 ** z
+
+    def lat_of(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat_of(y + 1), x / n * 360.0 - 180.0, lat_of(y), (x + 1) / n * 360.0 - 180.0
+
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    """Encode an RGBA uint8 image as PNG (zlib only)."""
+    height, width = rgba.shape[:2]
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    # Filter byte 0 (None) in front of every scanline
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), rgba.reshape(height, width * 4)], axis=1)
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b"")
+
+
+EMPTY_TILE = encode_png(np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8))
+
+
+def _gradient(values: np.ndarray, stops: Tuple[Tuple[float, str], ...]) -> np.ndarray:
+    """Interpolate hex color stops at ``values`` (0-1) into an (..., 3) uint8 array."""
+    positions = [position for position, _ in stops]
+    channels = [
+        np.interp(values, positions, [int(color[1 + 2 * c:3 + 2 * c], 16) for _, color in stops])
+        for c in range(3)
+    ]
+    return np.stack(channels, axis=-1).astype(np.uint8)
+
+
+# leaflet.heat's default gradient, so raster and vector heatmaps look alike
+HEAT_GRADIENT = ((0.0, "#0000ff"), (0.4, "#0000ff"), (0.6, "#00ffff"), (0.7, "#00ff00"), (0.8, "#ffff00"), (1.0, "#ff0000"))
+# Field yield colors (same stops as the vector field layer)
+YIELD_GRADIENT = ((0.0, "#a50f15"), (0.25, "#de2d26"), (0.5, "#f0f0f0"), (0.75, "#31a354"), (1.0, "#006d2c"))
+MISSING_YIELD_COLOR = (0xBD, 0xBD, 0xBD)
+
+
+# === Renderers ===
+
+def success_surface_renderer(surface, min_support: float = 0.05) -> Renderer:
+    """
+    Render a SuccessSurface like the distribution heatmap.
+
+    The intensity is probability x support (see SuccessSurface.to_heat_points),
+    colored with the heatmap gradient; cells without nearby wells stay clear.
+    Without a surface (no wells) every tile is empty.
+    """
+    if surface is None:
+        return lambda z, x, y: None
+
+    support_lat = (surface.lat0, surface.lat0 + surface.shape[0] * surface.dlat)
+    support_lon = (surface.lon0, surface.lon0 + surface.shape[1] * surface.dlon)
+
+    def render(z: int, x: int, y: int) -> Optional[np.ndarray]:
+        min_lat, min_lon, max_lat, max_lon = tile_bounds(z, x, y)
+        if max_lat < support_lat[0] or min_lat > support_lat[1] or max_lon < support_lon[0] or min_lon > support_lon[1]:
+            return None
+
+        lat, lon = tile_pixel_lat_lon(z, x, y)
+        rows = np.floor((lat - surface.lat0) / surface.dlat).astype(np.int64)
+        cols = np.floor((lon - surface.lon0) / surface.dlon).astype(np.int64)
+        inside = (rows >= 0) & (rows < surface.shape[0]) & (cols >= 0) & (cols < surface.shape[1])
+        rows, cols = np.where(inside, rows, 0), np.where(inside, cols, 0)
+
+        support = np.where(inside, surface.support[rows, cols], 0.0)
+        intensity = surface.probability[rows, cols] * np.minimum(support, 1.0)
+        visible = support >= min_support
+        if not visible.any():
+            return None
+
+        tile = np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8)
+        tile[..., :3] = _gradient(intensity, HEAT_GRADIENT)
+        tile[..., 3] = np.where(visible, (0.3 + 0.5 * intensity) * 255, 0).astype(np.uint8)
+        return tile
+
+    return render
+
+
+def field_yield_renderer(polygons: PolygonStore, field_data_df: Optional[pd.DataFrame], fill_opacity: float = 0.35) -> Renderer:
+    """
+    Render field polygons filled by yield_probability (gray without data).
+
+    Pixels are assigned to fields with PolygonStore.locate_many; colors are
+    computed once per field.
+    """
+    fields = PolygonStore.coerce(polygons)
+    colors = np.tile(np.array(MISSING_YIELD_COLOR, dtype=np.uint8), (len(fields), 1))
+    if len(fields) and field_data_df is not None and not field_data_df.empty and "yield_probability" in field_data_df.columns:
+        yields = pd.to_numeric(field_data_df["yield_probability"], errors="coerce")
+        lookup = pd.Series(yields.to_numpy(), index=field_data_df["new_plot_code"].astype(str)).groupby(level=0).first()
+        plot_codes = pd.Series(fields.column("plot_code")).astype(str) if "plot_code" in fields.attribute_names else pd.Series([""] * len(fields))
+        field_yield = plot_codes.map(lookup).to_numpy(dtype=float)
+
+        known = ~np.isnan(field_yield)
+        if known.any():
+            low, high = np.nanmin(field_yield), np.nanmax(field_yield)
+            normalized = (field_yield[known] - low) / (high - low) if high > low else np.full(known.sum(), 0.5)
+            colors[known] = _gradient(np.clip(normalized, 0.0, 1.0), YIELD_GRADIENT)
+
+    bounds = (
+        (np.nanmin(fields.bboxes[:, 0]), np.nanmin(fields.bboxes[:, 1]), np.nanmax(fields.bboxes[:, 2]), np.nanmax(fields.bboxes[:, 3]))
+        if len(fields) else None
+    )
+
+    def render(z: int, x: int, y: int) -> Optional[np.ndarray]:
+        if bounds is None:
+            return None
+        min_lat, min_lon, max_lat, max_lon = tile_bounds(z, x, y)
+        if max_lat < bounds[0] or min_lat > bounds[2] or max_lon < bounds[1] or min_lon > bounds[3]:
+            return None
+
+        # Only fields whose bbox touches the tile take part
+        b = fields.bboxes
+        candidates = np.flatnonzero((b[:, 0] <= max_lat) & (b[:, 2] >= min_lat) & (b[:, 1] <= max_lon) & (b[:, 3] >= min_lon))
+        if len(candidates) == 0:
+            return None
+
+        lat, lon = tile_pixel_lat_lon(z, x, y)
+        located = fields.take(candidates).locate_many(lat.ravel(), lon.ravel()).reshape(TILE_SIZE, TILE_SIZE)
+        hit = located >= 0
+        if not hit.any():
+            return None
+
+        tile = np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8)
+        tile[hit, :3] = colors[candidates[located[hit]]]
+        tile[hit, 3] = int(round(fill_opacity * 255))
+        return tile
+
+    return render
+
+
+# === Cache and server ===
+
+class TileServer:
+    """
+    Renders, caches and serves PNG tiles of registered overlay layers.
+
+    Tiles are stored as ``<cache_dir>/<layer>/<version>/<z>/<x>/<y>.png``. A
+    version identifies the dataset a layer was rendered from, so cached tiles
+    never go stale: new data registers a new version and gets new URLs.
+
+    Each layer keeps its ``keep_versions`` most recently registered versions
+    (e.g. one per filter combination in use). Older renderers are dropped and
+    their tile directories deleted, along with directories left by other
+    processes that have not been registered for longer.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        public_url: Optional[str] = None,
+        keep_versions: int = KEEP_VERSIONS,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.host = host
+        self.port = port
+        self.public_url = public_url
+        self.keep_versions = max(1, keep_versions)
+        self._renderers: Dict[str, "OrderedDict[str, Renderer]"] = {}
+        self._vector_sources: Dict[Tuple[str, str], object] = {}
+        self._lock = Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self.stats = {"hits": 0, "renders": 0, "empty": 0}
+
+    def register(self, layer: str, version: str, make_renderer: Callable[[], Renderer]) -> str:
+        """
+        Register a layer version and return its XYZ URL template.
+
+        Args:
+            layer: Layer name (letters, digits, _ and -)
+            version: Dataset version (same characters)
+            make_renderer: Builds the tile renderer ``(z, x, y) -> RGBA array
+                or None``; only called when the version is not registered
+
+        Returns:
+            URL template with {z}/{x}/{y} placeholders
+        """
+        evicted = None
+        with self._lock:
+            versions = self._renderers.setdefault(layer, OrderedDict())
+            if version in versions:
+                versions.move_to_end(version)
+            else:
+                versions[version] = make_renderer()
+                evicted = []
+                while len(versions) > self.keep_versions:
+                    evicted.append(versions.popitem(last=False)[0])
+                registered = set(versions)
+        self._touch_cache(layer, version)
+        if evicted is not None:
+            self._prune_cache(layer, registered, evicted)
+        self.start()
+        base = self.public_url or f"http://{self.host}:{self.port}"
+        return f"{base.rstrip('/')}/{layer}/{version}/{{z}}/{{x}}/{{y}}.png"
+
+    def _touch_cache(self, layer: str, version: str) -> None:
+        """Mark a layer version directory as in use (its mtime is the last registration)."""
+        version_dir = self.cache_dir / layer / version
+        try:
+            version_dir.mkdir(parents=True, exist_ok=True)
+            os.utime(version_dir)
+        except OSError as e:
+            logger.warning(f"⚠️  Cannot update tile cache {version_dir}: {e}")
+
+    def _prune_cache(self, layer: str, registered: set, evicted: List[str]) -> None:
+        """
+        Delete the tile directories of evicted and stale layer versions.
+
+        Directory mtimes record the last registration in any process sharing
+        the cache, so versions other workers registered recently are kept.
+        """
+        layer_dir = self.cache_dir / layer
+        try:
+            by_age = sorted((p for p in layer_dir.iterdir() if p.is_dir()), key=lambda p: p.stat().st_mtime, reverse=True)
+        except OSError as e:
+            logger.warning(f"⚠️  Cannot prune tile cache {layer_dir}: {e}")
+            return
+        stale = {p.name for p in by_age[self.keep_versions:]} | set(evicted)
+        for old in by_age:
+            if old.name in stale and old.name not in registered:
+                shutil.rmtree(old, ignore_errors=True)
+                logger.info(f"🧹 Deleted cached tiles of {layer}/{old.name}")
+
+    def register_vector(self, layer: str, source) -> str:
+        """
+        Register prebuilt vector tiles and return their XYZ URL template.
+
+        Args:
+            layer: Layer name (letters, digits, _ and -)
+            source: MBTiles source; its revision is the URL version
+
+        Returns:
+            URL template with {z}/{x}/{y} placeholders
+        """
+        with self._lock:
+            self._vector_sources[(layer, source.revision)] = source
+        self.start()
+        base = self.public_url or f"http://{self.host}:{self.port}"
+        return f"{base.rstrip('/')}/{layer}/{source.revision}/{{z}}/{{x}}/{{y}}.pbf"
+
+    def vector_tile(self, layer: str, version: str, z: int, x: int, y: int) -> Optional[bytes]:
+        """
+        Get a gzipped vector tile.
+
+        Returns:
+            Tile bytes (empty for tiles without features), or None for an
+            unknown layer version
+        """
+        source = self._vector_sources.get((layer, version))
+        if source is None:
+            return None
+        return source.tile(z, x, y) or b""
+
+    def tile(self, layer: str, version: str, z: int, x: int, y: int) -> Optional[bytes]:
+        """
+        Get a tile as PNG bytes, rendering and caching it on a miss.
+
+        Returns:
+            PNG bytes, or None for an unknown layer version
+        """
+        path = self.cache_dir / layer / version / str(z) / str(x) / f"{y}.png"
+        if path.exists():
+            self._count("hits")
+            return path.read_bytes()
+
+        with self._lock:
+            renderer = self._renderers.get(layer, {}).get(version)
+        if renderer is None or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            return None
+
+        rgba = renderer(z, x, y)
+        png = EMPTY_TILE if rgba is None else encode_png(rgba)
+        self._count("empty" if rgba is None else "renders")
+
+        # Write to a temporary name first so readers never see partial files.
+        # The version directory may be pruned meanwhile; the tile is still served.
+        temp_path = path.with_suffix(f".{os.getpid()}.{get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(png)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️  Tile {path} not cached: {e}")
+        return png
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.stats[counter] += 1
+
+    def start(self) -> None:
+        """Start the HTTP server in a daemon thread (once)."""
+        with self._lock:
+            if self._httpd is not None:
+                return
+            handler = _make_handler(self)
+            try:
+                self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+            except OSError:
+                # Port taken (e.g. another worker process): use any free port
+                self._httpd = ThreadingHTTPServer((self.host, 0), handler)
+            self.port = self._httpd.server_address[1]
+            self._httpd.daemon_threads = True
+            Thread(target=self._httpd.serve_forever, name="geodash-tiles", daemon=True).start()
+            logger.info(f"🧱 Tile server on http://{self.host}:{self.port} (cache: {self.cache_dir})")
+
+    def stop(self) -> None:
+        """Stop the HTTP server."""
+        with self._lock:
+            if self._httpd is not None:
+                self._httpd.shutdown()
+                self._httpd.server_close()
+                self._httpd = None
+
+
+def _make_handler(server: TileServer) -> type:
+    class TileRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            match = TILE_PATH.match(self.path.split("?", 1)[0])
+            data = None
+            if match:
+                vector = match["format"] == "pbf"
+                try:
+                    get_tile = server.vector_tile if vector else server.tile
+                    data = get_tile(match["layer"], match["version"], int(match["z"]), int(match["x"]), int(match["y"]))
+                except Exception as e:
+                    logger.error(f"❌ Tile {self.path} failed: {e}")
+                    self.send_error(500)
+                    return
+            if data is None:
+                self.send_error(404)
+                return
+
+            self.send_response(200 if data else 204)
+            if data:
+                self.send_header("Content-Type", "application/x-protobuf" if vector else "image/png")
+                if vector:
+                    self.send_header("Content-Encoding", "gzip")  # Stored gzipped in MBTiles
+                self.send_header("Content-Length", str(len(data)))
+            # Versioned URLs never change content
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return TileRequestHandler
+
+
+_tile_server: Optional[TileServer] = None
+_tile_server_lock = Lock()
+
+
+def get_tile_server() -> TileServer:
+    """Get the process-wide tile server (configured from the environment)."""
+    global _tile_server
+    with _tile_server_lock:
+        if _tile_server is None:
+            _tile_server = TileServer(
+                cache_dir=Path(os.environ.get("GEODASH_TILE_CACHE") or Path(tempfile.gettempdir()) / "geodash-tiles"),
+                host=os.environ.get("GEODASH_TILE_HOST", "127.0.0.1"),
+                port=int(os.environ.get("GEODASH_TILE_PORT", DEFAULT_PORT)),
+                public_url=os.environ.get("GEODASH_TILE_URL") or None,
+                keep_versions=int(os.environ.get("GEODASH_TILE_VERSIONS", KEEP_VERSIONS)),
+            )
+        return _tile_server
+
+
+def state_version(state) -> str:
+    """
+    URL-safe layer version for a hashable in-process state key.
+
+    Args:
+        state: e.g. (data version, filters) from geodash.data.filters.filter_state
+
+    Returns:
+        16 hex characters, unique to this process
+    """
+    return blake2b(repr((_PROCESS_SALT, state)).encode(), digest_size=8).hexdigest()
+
+
+def add_tile_overlay(fmap, layer: str, version: str, make_renderer: Callable[[], Renderer], name: str, opacity: float = 1.0) -> None:
+    """
+    Add a cached raster overlay to a folium map.
+
+    Args:
+        fmap: folium.Map
+        layer: Layer name
+        version: Dataset version the renderer draws
+        make_renderer: Builds the tile renderer for this version (skipped
+            when the version is already registered)
+        name: Layer name shown in layer controls
+        opacity: Overlay opacity
+    """
+    import folium
+
+    url = get_tile_server().register(layer, version, make_renderer)
+    folium.TileLayer(tiles=url, attr="geodash", name=name, overlay=True, control=True, opacity=opacity, max_zoom=19).add_to(fmap)
+
+
+# Export the tile API
+__all__ = [
+    "raster_tiles_enabled",
+    "vector_tiles_source",
+    "TileServer",
+    "get_tile_server",
+    "add_tile_overlay",
+    "state_version",
+    "success_surface_renderer",
+    "field_yield_renderer",
+    "encode_png",
+    "tile_pixel_lat_lon",
+    "tile_bounds",
+]
@@ -23,3 +23,34 @@ def download_button(filtered_df: pd.DataFrame) -> None:
 
 
 
+
+
+def debug_panel() -> None:
+    """Performance panel: span timings, memory and cache counters (render inside the sidebar)."""
+    from geodash.data.cache import cache_stats_frame
+    from geodash.instrumentation import (
+        clear_spans, current_rss_mb, export_json, export_prometheus, peak_rss_mb, summarize_spans,
+    )
+
+    with st.expander("🧪 Performance (debug)", expanded=False):
+        rss, peak = current_rss_mb(), peak_rss_mb()
+        col1, col2 = st.columns(2)
+        col1.metric("RSS", f"{rss:.0f} MB" if rss is not None else "N/A")
+        col2.metric("Peak RSS", f"{peak:.0f} MB" if peak is not None else "N/A")
+        
+        summary = pd.DataFrame(summarize_spans())
+        if summary.empty:
+            st.caption("No spans recorded yet.")
+        else:
+            st.caption("Spans by total time (this process)")
+            st.dataframe(summary[["category", "name", "count", "total_ms", "mean_ms", "max_ms", "errors"]], hide_index=True)
+        
+        cache_stats = cache_stats_frame()
+        if not cache_stats.empty:
+            st.caption("Cache hit/miss counters")
+            st.dataframe(cache_stats, hide_index=True)
+        
+        st.download_button("Spans (JSON)", data=export_json(), file_name="geodash_spans.json", mime="application/json")
+        st.download_button("Metrics (Prometheus)", data=export_prometheus(), file_name="geodash_metrics.prom", mime="text/plain")
+        if st.button("Clear spans"):
+            clear_spans()
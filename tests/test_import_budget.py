@@ -0,0 +1,15 @@
+"""
+Import-time budget for the app entry point.
+Pages and their heavy dependencies are imported lazily on first navigation;
+this test fails when ``import app`` gets slower than the budget or eagerly
+pulls one of ``benchmarks.bench_imports.DEFERRED_MODULES`` in again.
+"""
+from benchmarks.bench_imports import IMPORT_BUDGET_S, eager_imports, import_app_profile
+
+
+def test_import_app_within_budget_and_lazy():
+    total_s, modules = import_app_profile()
+
+    eager = eager_imports(modules)
+    assert not eager, f"'import app' eagerly imports {', '.join(eager)}"
+    assert 0 < total_s <= IMPORT_BUDGET_S, f"'import app' took {total_s:.2f}s (budget {IMPORT_BUDGET_S:.1f}s)"